@@ -3,15 +3,18 @@
 #
 
 import json
-from typing import List
+from typing import Any, Callable, Dict, List, Tuple
 
 from .delete_order import DeleteOrder
+from .message_factory import MessageFactory
 from .modify import ModifyOrderLong, ModifyOrderShort
 from .time import Time
 from .add_order import AddOrderLong, AddOrderShort, AddOrderExpanded
 from .order_executed import OrderExecuted, OrderExecutedAtPriceSize
+from .pitch24 import MessageBase
 from .reduce_size import ReduceSizeLong, ReduceSizeShort
 from .seq_unit_header import SequencedUnitHeader
+from .unit_encoder import UnitEncoder
 
 #
 # LabVIEW Interface
@@ -27,262 +30,249 @@ def get_seq_unit_hdr(parameters, msgs_array: List[int]) -> List[int]:
 
     HdrSeq = json_dict["HdrSeq"]
     HdrCount = json_dict["HdrCount"]
+    Validate = json_dict.get("Validate", False)
     return list(
         SequencedUnitHeader.from_message_array(
-            msgs_array=msgs_array, hdr_count=HdrCount, hdr_sequence=HdrSeq
+            msgs_array=msgs_array,
+            hdr_count=HdrCount,
+            hdr_sequence=HdrSeq,
+            validate=Validate,
         )
     )
 
 
-def get_time(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
+def _build_time(json_dict: Dict[str, Any]) -> Time:
+    return Time.from_parms(time=json_dict["Time"])
 
-    seconds_since_midnight = json_dict["Time"]
-    return list(Time.from_parms(time=seconds_since_midnight).get_bytes())
 
+def _build_add_order(message_class) -> Callable[[Dict[str, Any]], MessageBase]:
+    def build(json_dict: Dict[str, Any]) -> MessageBase:
+        return message_class.from_parms(
+            time_offset=json_dict["Time Offset"],
+            order_id=json_dict["Order Id"],
+            side=json_dict["Side Indicator"],
+            quantity=json_dict["Quantity"],
+            symbol=json_dict["Symbol"],
+            price=json_dict["Price"],
+        )
 
-def get_add_order_long(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
-
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    side = json_dict["Side Indicator"]
-    quantity = json_dict["Quantity"]
-    symbol = json_dict["Symbol"]
-    price = json_dict["Price"]
-    msg_bytes = AddOrderLong.from_parms(
-        time_offset=time_offset,
-        order_id=order_id,
-        side=side,
-        quantity=quantity,
-        symbol=symbol,
-        price=price,
-    ).get_bytes()
-    return list(msg_bytes)
+    return build
 
 
-def get_add_order_short(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
+def _build_add_order_expanded(json_dict: Dict[str, Any]) -> AddOrderExpanded:
+    return AddOrderExpanded.from_parms(
+        time_offset=json_dict["Time Offset"],
+        order_id=json_dict["Order Id"],
+        side=json_dict["Side Indicator"],
+        quantity=json_dict["Quantity"],
+        symbol=json_dict["Symbol"],
+        price=json_dict["Price"],
+        participant_id=json_dict["Participant Id"],
+        customer_indicator=json_dict["Customer Indicator"],
+    )
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    side = json_dict["Side Indicator"]
-    quantity = json_dict["Quantity"]
-    symbol = json_dict["Symbol"]
-    price = json_dict["Price"]
-    msg_bytes = AddOrderShort.from_parms(
-        time_offset=time_offset,
-        order_id=order_id,
-        side=side,
-        quantity=quantity,
-        symbol=symbol,
-        price=price,
-    ).get_bytes()
-    return list(msg_bytes)
 
+def _build_order_executed(json_dict: Dict[str, Any]) -> OrderExecuted:
+    return OrderExecuted.from_parms(
+        time_offset=json_dict["Time Offset"],
+        order_id=json_dict["Order Id"],
+        executed_quantity=json_dict["Executed Quantity"],
+        execution_id=json_dict["Execution Id"],
+    )
 
-def get_add_order_expanded(parameters: str) -> List[int]:
-    json_dict = json.loads(parameters)
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    side = json_dict["Side Indicator"]
-    quantity = json_dict["Quantity"]
-    symbol = json_dict["Symbol"]
-    price = json_dict["Price"]
-    participant_id = json_dict["Participant Id"]
-    customer_indicator = json_dict["Customer Indicator"]
-
-    msg_bytes = AddOrderExpanded.from_parms(
-        time_offset=time_offset,
-        order_id=order_id,
-        side=side,
-        quantity=quantity,
-        symbol=symbol,
-        price=price,
-        participant_id=participant_id,
-        customer_indicator=customer_indicator,
-    ).get_bytes()
-    return list(msg_bytes)
+def _build_order_executed_at_price_size(
+    json_dict: Dict[str, Any]
+) -> OrderExecutedAtPriceSize:
+    return OrderExecutedAtPriceSize.from_parms(
+        time_offset=json_dict["Time Offset"],
+        order_id=json_dict["Order Id"],
+        executed_quantity=json_dict["Executed Quantity"],
+        remaining_quantity=json_dict["Remaining Quantity"],
+        execution_id=json_dict["Execution Id"],
+        price=json_dict["Price"],
+    )
 
 
-def get_order_executed(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
+def _build_reduce_size(message_class) -> Callable[[Dict[str, Any]], MessageBase]:
+    def build(json_dict: Dict[str, Any]) -> MessageBase:
+        return message_class.from_parms(
+            time_offset=json_dict["Time Offset"],
+            order_id=json_dict["Order Id"],
+            canceled_quantity=json_dict["Canceled Quantity"],
+        )
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    executed_quantity = json_dict["Executed Quantity"]
-    execution_id = json_dict["Execution Id"]
+    return build
 
-    msg_bytes = OrderExecuted.from_parms(
-        time_offset=time_offset,
-        order_id=order_id,
-        executed_quantity=executed_quantity,
-        execution_id=execution_id,
-    ).get_bytes()
 
-    return list(msg_bytes)
+def _build_modify_order(message_class) -> Callable[[Dict[str, Any]], MessageBase]:
+    def build(json_dict: Dict[str, Any]) -> MessageBase:
+        return message_class.from_parms(
+            time_offset=json_dict["Time Offset"],
+            order_id=json_dict["Order Id"],
+            quantity=json_dict["Quantity"],
+            price=json_dict["Price"],
+        )
 
+    return build
 
-def get_order_executed_at_price_size(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    executed_quantity = json_dict["Executed Quantity"]
-    remaining_quantity = json_dict["Remaining Quantity"]
-    execution_id = json_dict["Execution Id"]
-    price = json_dict["Price"]
+def _build_delete_order(json_dict: Dict[str, Any]) -> DeleteOrder:
+    return DeleteOrder.from_parms(
+        time_offset=json_dict["Time Offset"], order_id=json_dict["Order Id"]
+    )
 
-    msg_bytes = OrderExecutedAtPriceSize.from_parms(
-        time_offset=time_offset,
-        order_id=order_id,
-        executed_quantity=executed_quantity,
-        remaining_quantity=remaining_quantity,
-        execution_id=execution_id,
-        price=price,
-    ).get_bytes()
-    return list(msg_bytes)
 
+def _build_trade(message_class) -> Callable[[Dict[str, Any]], MessageBase]:
+    def build(json_dict: Dict[str, Any]) -> MessageBase:
+        return message_class.from_parms(
+            time_offset=json_dict["Time Offset"],
+            order_id=json_dict["Order Id"],
+            side=json_dict["Side Indicator"],
+            quantity=json_dict["Quantity"],
+            symbol=json_dict["Symbol"],
+            price=json_dict["Price"],
+            execution_id=json_dict["Execution Id"],
+        )
 
-def get_reduce_size_long(parameters) -> List[int]:
+    return build
+
+
+# Message class name => function building that message from its parameters
+_message_builders: Dict[str, Callable[[Dict[str, Any]], MessageBase]] = {
+    Time.__name__: _build_time,
+    AddOrderLong.__name__: _build_add_order(AddOrderLong),
+    AddOrderShort.__name__: _build_add_order(AddOrderShort),
+    AddOrderExpanded.__name__: _build_add_order_expanded,
+    OrderExecuted.__name__: _build_order_executed,
+    OrderExecutedAtPriceSize.__name__: _build_order_executed_at_price_size,
+    ReduceSizeLong.__name__: _build_reduce_size(ReduceSizeLong),
+    ReduceSizeShort.__name__: _build_reduce_size(ReduceSizeShort),
+    ModifyOrderLong.__name__: _build_modify_order(ModifyOrderLong),
+    ModifyOrderShort.__name__: _build_modify_order(ModifyOrderShort),
+    DeleteOrder.__name__: _build_delete_order,
+    TradeLong.__name__: _build_trade(TradeLong),
+    TradeShort.__name__: _build_trade(TradeShort),
+    TradeExpanded.__name__: _build_trade(TradeExpanded),
+}
+
+
+def _build_message(json_dict: Dict[str, Any]) -> MessageBase:
+    """
+    Build one message of any type.  "Message Type" is either the class
+    name (i.e. "AddOrderLong") or the Message Type byte (i.e. 33).
+    """
+    msg_type = json_dict["Message Type"]
+    if isinstance(msg_type, int):
+        message_class = MessageFactory.lookup(msg_type)
+        msg_type = None if message_class is None else message_class.__name__
+    builder = _message_builders.get(msg_type)
+    if builder is None:
+        raise Exception(f"Unknown Message Type {json_dict['Message Type']}")
+    return builder(json_dict)
+
+
+def _encode_messages(messages: List[MessageBase]) -> Tuple[bytearray, List[int]]:
+    msg_bytes = bytearray(sum(x.length() for x in messages))
+    offsets = []
+    offset = 0
+    for message in messages:
+        offsets.append(offset)
+        offset = message.encode_into(msg_bytes, offset)
+    return msg_bytes, offsets
+
+
+def get_messages(parameters: str) -> Tuple[List[int], List[int]]:
+    """
+    Batch variant of the get_<message> functions.
+
+    'parameters' is a JSON array with one object per message, each holding
+    a "Message Type" along with the same keys as the single message
+    functions.  All messages are encoded back to back.
+
+    Returns the bytes of every message and the offset of each message in
+    those bytes.
+    """
+    messages = [_build_message(x) for x in json.loads(parameters)]
+    msg_bytes, offsets = _encode_messages(messages)
+    return list(msg_bytes), offsets
+
+
+def get_seq_units(parameters: str) -> List[int]:
+    """
+    Batch variant of get_seq_unit_hdr, building the messages too.
+
+    'parameters' is a JSON object with "HdrSeq", an optional
+    "Max Hdr Length" (1400 by default) and "Messages", an array as taken
+    by get_messages.  Messages are split into as many Sequenced Unit
+    Headers as needed.
+    """
     json_dict = json.loads(parameters)
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    canceled_quantity = json_dict["Canceled Quantity"]
-
-    msg_bytes = ReduceSizeLong.from_parms(
-        time_offset=time_offset, order_id=order_id, canceled_quantity=canceled_quantity
-    ).get_bytes()
+    unit_encoder = UnitEncoder(
+        hdr_sequence=json_dict["HdrSeq"],
+        max_hdr_length=json_dict.get("Max Hdr Length", 1_400),
+    )
+    unit_encoder.add_all(_build_message(x) for x in json_dict["Messages"])
+    return list(unit_encoder.get_bytes())
 
-    return list(msg_bytes)
 
+def _get_bytes(message_class, parameters: str) -> List[int]:
+    builder = _message_builders[message_class.__name__]
+    return list(builder(json.loads(parameters)).get_bytes())
 
-def get_reduce_size_short(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    canceled_quantity = json_dict["Canceled Quantity"]
+def get_time(parameters) -> List[int]:
+    return _get_bytes(Time, parameters)
 
-    msg_bytes = ReduceSizeShort.from_parms(
-        time_offset=time_offset, order_id=order_id, canceled_quantity=canceled_quantity
-    ).get_bytes()
 
-    return list(msg_bytes)
+def get_add_order_long(parameters) -> List[int]:
+    return _get_bytes(AddOrderLong, parameters)
 
 
-def get_modify_order_long(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
+def get_add_order_short(parameters) -> List[int]:
+    return _get_bytes(AddOrderShort, parameters)
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    quantity = json_dict["Quantity"]
-    price = json_dict["Price"]
 
-    msg_bytes = ModifyOrderLong.from_parms(
-        time_offset=time_offset, order_id=order_id, quantity=quantity, price=price
-    ).get_bytes()
+def get_add_order_expanded(parameters: str) -> List[int]:
+    return _get_bytes(AddOrderExpanded, parameters)
 
-    return list(msg_bytes)
 
+def get_order_executed(parameters) -> List[int]:
+    return _get_bytes(OrderExecuted, parameters)
 
-def get_modify_order_short(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    quantity = json_dict["Quantity"]
-    price = json_dict["Price"]
+def get_order_executed_at_price_size(parameters) -> List[int]:
+    return _get_bytes(OrderExecutedAtPriceSize, parameters)
 
-    msg_bytes = ModifyOrderShort.from_parms(
-        time_offset=time_offset, order_id=order_id, quantity=quantity, price=price
-    ).get_bytes()
 
-    return list(msg_bytes)
+def get_reduce_size_long(parameters) -> List[int]:
+    return _get_bytes(ReduceSizeLong, parameters)
 
 
-def get_delete_order(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
+def get_reduce_size_short(parameters) -> List[int]:
+    return _get_bytes(ReduceSizeShort, parameters)
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
 
-    msg_bytes = DeleteOrder.from_parms(
-        time_offset=time_offset, order_id=order_id
-    ).get_bytes()
+def get_modify_order_long(parameters) -> List[int]:
+    return _get_bytes(ModifyOrderLong, parameters)
 
-    return list(msg_bytes)
 
+def get_modify_order_short(parameters) -> List[int]:
+    return _get_bytes(ModifyOrderShort, parameters)
 
-def get_trade_long(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
 
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    side = json_dict["Side Indicator"]
-    quantity = json_dict["Quantity"]
-    symbol = json_dict["Symbol"]
-    price = json_dict["Price"]
-    execution_id = json_dict["Execution Id"]
+def get_delete_order(parameters) -> List[int]:
+    return _get_bytes(DeleteOrder, parameters)
 
-    msg_bytes = TradeLong.from_parms(
-        time_offset=time_offset,
-        order_id=order_id,
-        side=side,
-        quantity=quantity,
-        symbol=symbol,
-        price=price,
-        execution_id=execution_id,
-    ).get_bytes()
 
-    return list(msg_bytes)
+def get_trade_long(parameters) -> List[int]:
+    return _get_bytes(TradeLong, parameters)
 
 
 def get_trade_short(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
-
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    side = json_dict["Side Indicator"]
-    quantity = json_dict["Quantity"]
-    symbol = json_dict["Symbol"]
-    price = json_dict["Price"]
-    execution_id = json_dict["Execution Id"]
-
-    msg_bytes = TradeShort.from_parms(
-        time_offset=time_offset,
-        order_id=order_id,
-        side=side,
-        quantity=quantity,
-        symbol=symbol,
-        price=price,
-        execution_id=execution_id,
-    ).get_bytes()
-
-    return list(msg_bytes)
+    return _get_bytes(TradeShort, parameters)
 
 
 def get_trade_expanded(parameters) -> List[int]:
-    json_dict = json.loads(parameters)
-
-    time_offset = json_dict["Time Offset"]
-    order_id = json_dict["Order Id"]
-    side = json_dict["Side Indicator"]
-    quantity = json_dict["Quantity"]
-    symbol = json_dict["Symbol"]
-    price = json_dict["Price"]
-    execution_id = json_dict["Execution Id"]
-
-    msg_bytes = TradeExpanded.from_parms(
-        time_offset=time_offset,
-        order_id=order_id,
-        side=side,
-        quantity=quantity,
-        symbol=symbol,
-        price=price,
-        execution_id=execution_id,
-    ).get_bytes()
-
-    return list(msg_bytes)
+    return _get_bytes(TradeExpanded, parameters)
@@ -1,3 +1,5 @@
+from typing import OrderedDict
+
 from .pitch24 import MessageBase, FieldName, FieldSpec, FieldType
 
 
@@ -6,59 +8,63 @@ class AddOrderBase(MessageBase):
     Represents a newly accepted visible order on the Cboe book.
     """
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length] = FieldSpec(
+    __slots__ = ()
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length] = FieldSpec(
             field_name=FieldName.Length, offset=0, length=1, field_type=FieldType.Binary
         )
-        self._field_specs[FieldName.MessageType] = FieldSpec(
+        field_specs[FieldName.MessageType] = FieldSpec(
             field_name=FieldName.MessageType,
             offset=1,
             length=1,
             field_type=FieldType.Value,
         )
-        self._field_specs[FieldName.TimeOffset] = FieldSpec(
+        field_specs[FieldName.TimeOffset] = FieldSpec(
             field_name=FieldName.TimeOffset,
             offset=2,
             length=4,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.OrderId] = FieldSpec(
+        field_specs[FieldName.OrderId] = FieldSpec(
             field_name=FieldName.OrderId,
             offset=6,
             length=8,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.SideIndicator] = FieldSpec(
+        field_specs[FieldName.SideIndicator] = FieldSpec(
             field_name=FieldName.SideIndicator,
             offset=14,
             length=1,
             field_type=FieldType.Alphanumeric,
         )
-        self._field_specs[FieldName.Quantity] = FieldSpec(
+        field_specs[FieldName.Quantity] = FieldSpec(
             field_name=FieldName.Quantity,
             offset=15,
             length=4,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.Symbol] = FieldSpec(
+        field_specs[FieldName.Symbol] = FieldSpec(
             field_name=FieldName.Symbol,
             offset=19,
             length=6,
             field_type=FieldType.PrintableAscii,
         )
-        self._field_specs[FieldName.Price] = FieldSpec(
+        field_specs[FieldName.Price] = FieldSpec(
             field_name=FieldName.Price,
             offset=25,
             length=8,
             field_type=FieldType.BinaryLongPrice,
         )
-        self._field_specs[FieldName.AddFlags] = FieldSpec(
+        field_specs[FieldName.AddFlags] = FieldSpec(
             field_name=FieldName.AddFlags,
             offset=33,
             length=1,
             field_type=FieldType.BitField,
         )
+        return field_specs
 
     def set_fields(
         self,
@@ -70,22 +76,25 @@ class AddOrderBase(MessageBase):
         price: float,
         displayed: bool = True,
     ):
-        self._field_specs[FieldName.TimeOffset].value(time_offset)
+        self._set(FieldName.TimeOffset, time_offset)
         self.order_id(order_id)
-        self._field_specs[FieldName.SideIndicator].value(side)
-        self._field_specs[FieldName.Quantity].value(quantity)
-        self._field_specs[FieldName.Symbol].value(symbol)
-        self._field_specs[FieldName.Price].value(price)
-        self._field_specs[FieldName.AddFlags].value(1 if displayed is True else 0)
+        self._set(FieldName.SideIndicator, side)
+        self._set(FieldName.Quantity, quantity)
+        self._set(FieldName.Symbol, symbol)
+        self.price(price)
+        self._set(FieldName.AddFlags, 1 if displayed is True else 0)
 
 
 class AddOrderLong(AddOrderBase):
     _messageType = 0x21
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(34)
-        self._field_specs[FieldName.MessageType].value(self._messageType)
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(34)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+        return field_specs
 
     @staticmethod
     def from_parms(
@@ -113,21 +122,24 @@ class AddOrderLong(AddOrderBase):
 
 class AddOrderShort(AddOrderBase):
     _messageType = 0x22
-
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(26)
-        self._field_specs[FieldName.MessageType].value(AddOrderShort._messageType)
-
-        self._field_specs[FieldName.Quantity].offset(15)
-        self._field_specs[FieldName.Quantity].length(2)
-        self._field_specs[FieldName.Symbol].offset(17)
-        self._field_specs[FieldName.Symbol].length(6)
-        self._field_specs[FieldName.Price].offset(23)
-        self._field_specs[FieldName.Price].length(2)
-        self._field_specs[FieldName.Price].field_type(FieldType.BinaryShortPrice)
-        self._field_specs[FieldName.AddFlags].offset(25)
-        self._field_specs[FieldName.AddFlags].length(1)
+    __slots__ = ()
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(26)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+
+        field_specs[FieldName.Quantity].offset(15)
+        field_specs[FieldName.Quantity].length(2)
+        field_specs[FieldName.Symbol].offset(17)
+        field_specs[FieldName.Symbol].length(6)
+        field_specs[FieldName.Price].offset(23)
+        field_specs[FieldName.Price].length(2)
+        field_specs[FieldName.Price].field_type(FieldType.BinaryShortPrice)
+        field_specs[FieldName.AddFlags].offset(25)
+        field_specs[FieldName.AddFlags].length(1)
+        return field_specs
 
     @staticmethod
     def from_parms(
@@ -154,31 +166,34 @@ class AddOrderShort(AddOrderBase):
 
 class AddOrderExpanded(AddOrderBase):
     _messageType = 0x2F
-
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(41)
-        self._field_specs[FieldName.MessageType].value(AddOrderExpanded._messageType)
-
-        self._field_specs[FieldName.Symbol].offset(19)
-        self._field_specs[FieldName.Symbol].length(8)
-        self._field_specs[FieldName.Price].offset(27)
-        self._field_specs[FieldName.Price].length(8)
-        self._field_specs[FieldName.AddFlags].offset(35)
-        self._field_specs[FieldName.AddFlags].length(1)
-
-        self._field_specs[FieldName.ParticipantId] = FieldSpec(
+    __slots__ = ()
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(41)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+
+        field_specs[FieldName.Symbol].offset(19)
+        field_specs[FieldName.Symbol].length(8)
+        field_specs[FieldName.Price].offset(27)
+        field_specs[FieldName.Price].length(8)
+        field_specs[FieldName.AddFlags].offset(35)
+        field_specs[FieldName.AddFlags].length(1)
+
+        field_specs[FieldName.ParticipantId] = FieldSpec(
             field_name=FieldName.ParticipantId,
             offset=36,
             length=4,
             field_type=FieldType.Alphanumeric,
         )
-        self._field_specs[FieldName.CustomerIndicator] = FieldSpec(
+        field_specs[FieldName.CustomerIndicator] = FieldSpec(
             field_name=FieldName.CustomerIndicator,
             offset=40,
             length=1,
             field_type=FieldType.Alphanumeric,
         )
+        return field_specs
 
     @staticmethod
     def from_parms(
@@ -202,29 +217,17 @@ class AddOrderExpanded(AddOrderBase):
             price=price,
             displayed=displayed,
         )
-        add_order_expanded._field_specs[FieldName.ParticipantId] = FieldSpec(
-            field_name=FieldName.ParticipantId,
-            offset=36,
-            length=4,
-            field_type=FieldType.Alphanumeric,
-            value=participant_id,
-        )
-        add_order_expanded._field_specs[FieldName.CustomerIndicator] = FieldSpec(
-            field_name=FieldName.CustomerIndicator,
-            offset=40,
-            length=1,
-            field_type=FieldType.Alphanumeric,
-            value=customer_indicator,
-        )
+        add_order_expanded.participant_id(participant_id)
+        add_order_expanded.customer_indicator(customer_indicator)
 
         return add_order_expanded
 
     def participant_id(self, participant_id: str = None) -> str:
         if participant_id is not None:
-            self._field_specs[FieldName.ParticipantId].value(participant_id)
-        return self._field_specs[FieldName.ParticipantId].value()
+            self._set(FieldName.ParticipantId, participant_id)
+        return self._get(FieldName.ParticipantId)
 
     def customer_indicator(self, customer_indicator: str = None) -> str:
         if customer_indicator is not None:
-            self._field_specs[FieldName.CustomerIndicator].value(customer_indicator)
-        return self._field_specs[FieldName.CustomerIndicator].value()
+            self._set(FieldName.CustomerIndicator, customer_indicator)
+        return self._get(FieldName.CustomerIndicator)
@@ -0,0 +1,344 @@
+import struct
+from typing import ByteString, Callable, Dict, Iterable, Tuple, Type, Union
+
+from .add_order import AddOrderLong, AddOrderShort, AddOrderExpanded
+from .delete_order import DeleteOrder
+from .file_parser import FileParser
+from .message_filter import MessageFilter
+from .message_view import MessageView
+from .modify import ModifyOrderLong, ModifyOrderShort
+from .order_executed import OrderExecuted, OrderExecutedAtPriceSize
+from .orderbook import OrderBook, Side
+from .pitch24 import MessageBase
+from .reduce_size import ReduceSizeLong, ReduceSizeShort
+from .seq_unit_header import SequencedUnitHeader
+from .snapshot import BookSnapshot
+from .time import Time
+
+Message = Union[MessageBase, MessageView]
+
+
+class BookBuilder:
+    """
+    Replays decoded messages into an OrderBook holding the order-level book
+    of every symbol seen.
+
+    Messages are dispatched on their class to one handler per kind of
+    message; messages that do not change the book (Trade*, ...) are
+    skipped and Time messages only set time().  Orders are found through
+    the Order Id index of the book, which also gives the symbol of the
+    order for the messages that do not carry one.
+
+    Both MessageBase objects and MessageView (i.e. FileParser.iter_views())
+    can be applied, as handlers only use accessors they have in common.
+
+    Prices in the book are integer ticks at 10_000 per dollar, whatever the
+    message, so long and short prices compare equal.
+
+    Messages for an Order Id that is not in the book (i.e. a capture started
+    during the session) are counted in missing_orders() and otherwise
+    ignored.
+
+    When whole Sequenced Unit Headers are applied (apply_unit(),
+    apply_buffer(), from_file()), the Hdr Sequence of the last message
+    applied is kept for each Hdr Unit, as every unit counts its own
+    sequence, so the book can be saved as a BookSnapshot and a replay
+    restarted from it: units already in the snapshot are skipped.
+    """
+
+    PRICE_SCALE = 10_000
+
+    _sides = {"B": Side.Buy, "S": Side.Sell}
+
+    # Hdr Length, Hdr Count, Hdr Unit, Hdr Sequence
+    _unit_header = struct.Struct("<HBBI")
+
+    def __init__(
+        self,
+        orderbook: OrderBook = None,
+        hdr_sequences: Dict[int, int] = None,
+        time: int = None,
+    ):
+        self._orderbook = orderbook or OrderBook(price_scale=BookBuilder.PRICE_SCALE)
+        # Hdr Unit => Hdr Sequence of the last message applied
+        self._hdr_sequences: Dict[int, int] = dict(hdr_sequences or {})
+        self._time = time
+        self._messages = 0
+        self._missing_orders = 0
+
+        self._handlers: Dict[Type[MessageBase], Callable[[Message], None]] = {
+            Time: self._time_message,
+            AddOrderLong: self._add_order,
+            AddOrderShort: self._add_order,
+            AddOrderExpanded: self._add_order,
+            OrderExecuted: self._order_executed,
+            OrderExecutedAtPriceSize: self._order_executed_at_price_size,
+            ReduceSizeLong: self._reduce_size,
+            ReduceSizeShort: self._reduce_size,
+            ModifyOrderLong: self._modify_order,
+            ModifyOrderShort: self._modify_order,
+            DeleteOrder: self._delete_order,
+        }
+        # Multiplier from the ticks of a message to the ticks of the book
+        self._tick_factors: Dict[Type[MessageBase], int] = {
+            x: BookBuilder.PRICE_SCALE // x._schema.price_scale
+            for x in self._handlers
+            if x._schema.price_scale is not None
+        }
+
+    def orderbook(self) -> OrderBook:
+        return self._orderbook
+
+    def messages(self) -> int:
+        """
+        Number of messages applied that changed the book.
+        """
+        return self._messages
+
+    def missing_orders(self) -> int:
+        return self._missing_orders
+
+    def hdr_sequence(self, hdr_unit: int = 1) -> int:
+        """
+        Hdr Sequence of the last message applied for a Hdr Unit, 0 before
+        any unit of it.
+        """
+        return self._hdr_sequences.get(hdr_unit, 0)
+
+    def hdr_sequences(self) -> Dict[int, int]:
+        """
+        Hdr Sequence of the last message applied for every Hdr Unit seen.
+        """
+        return dict(self._hdr_sequences)
+
+    def time(self) -> int:
+        """
+        Seconds since midnight of the last Time message, None before one.
+        """
+        return self._time
+
+    #
+    # Snapshots
+    #
+    def snapshot(self) -> BookSnapshot:
+        """
+        Snapshot of the book as of hdr_sequences() and time().  Encode it
+        with get_bytes() before applying anything else.
+        """
+        return BookSnapshot(self._orderbook, self._hdr_sequences, self._time)
+
+    @staticmethod
+    def from_snapshot(snapshot: BookSnapshot) -> "BookBuilder":
+        return BookBuilder(
+            orderbook=snapshot.orderbook(),
+            hdr_sequences=snapshot.hdr_sequences(),
+            time=snapshot.time(),
+        )
+
+    #
+    # Replay
+    #
+    def handles(self, message_class: Type[MessageBase]) -> bool:
+        """
+        True for the classes of message that are applied, Time included.
+        """
+        return message_class in self._handlers
+
+    def apply(self, message: MessageBase) -> None:
+        handler = self._handlers.get(type(message))
+        if handler is not None:
+            handler(message)
+
+    def apply_view(self, view: MessageView) -> None:
+        handler = self._handlers.get(view.message_class())
+        if handler is not None:
+            handler(view)
+
+    def apply_all(self, messages: Iterable[MessageBase]) -> None:
+        handlers = self._handlers
+        for message in messages:
+            handler = handlers.get(type(message))
+            if handler is not None:
+                handler(message)
+
+    def apply_views(self, views: Iterable[MessageView]) -> None:
+        handlers = self._handlers
+        for view in views:
+            handler = handlers.get(view.message_class())
+            if handler is not None:
+                handler(view)
+
+    def _is_applied(self, hdr_unit: int, hdr_sequence: int, hdr_count: int) -> bool:
+        # Units of Hdr Sequence 0 are unsequenced and always applied
+        if hdr_sequence == 0:
+            return False
+        return hdr_sequence + hdr_count - 1 <= self._hdr_sequences.get(hdr_unit, 0)
+
+    def _applied(self, hdr_unit: int, hdr_sequence: int, hdr_count: int) -> None:
+        if hdr_sequence != 0:
+            self._hdr_sequences[hdr_unit] = hdr_sequence + hdr_count - 1
+
+    def apply_unit(self, seq_unit_hdr: SequencedUnitHeader) -> None:
+        hdr_unit = seq_unit_hdr.hdr_unit()
+        hdr_sequence = seq_unit_hdr.hdr_sequence()
+        hdr_count = seq_unit_hdr.hdr_count()
+        if self._is_applied(hdr_unit, hdr_sequence, hdr_count):
+            return
+        self.apply_all(seq_unit_hdr.getMessages())
+        self._applied(hdr_unit, hdr_sequence, hdr_count)
+
+    def apply_buffer(
+        self,
+        msg_bytes: ByteString,
+        offset: int = 0,
+        message_filter: MessageFilter = None,
+    ) -> None:
+        """
+        Apply back to back Sequenced Unit Headers through MessageViews.
+        Units already applied are skipped from their header alone, without
+        looking at their messages.
+        """
+        while offset < len(msg_bytes):
+            offset = self.apply_unit_at(msg_bytes, offset, message_filter)
+
+    @staticmethod
+    def unit_at(msg_bytes: ByteString, offset: int) -> Tuple[int, int, int, int]:
+        """
+        (Hdr Unit, Hdr Sequence, Hdr Count, offset of the next unit) of the
+        Sequenced Unit Header at 'offset'.
+        """
+        unit_header = BookBuilder._unit_header
+        hdr_length, hdr_count, hdr_unit, hdr_sequence = unit_header.unpack_from(
+            msg_bytes, offset
+        )
+        if hdr_length < 8 or offset + hdr_length > len(msg_bytes):
+            raise Exception(f"Invalid Hdr Length {hdr_length} at offset {offset}")
+        return hdr_unit, hdr_sequence, hdr_count, offset + hdr_length
+
+    def apply_unit_at(
+        self,
+        msg_bytes: ByteString,
+        offset: int,
+        message_filter: MessageFilter = None,
+        count: int = None,
+    ) -> int:
+        """
+        Apply the Sequenced Unit Header at 'offset' of a buffer, unless it
+        was already applied.  With 'count', only its first 'count' messages
+        are applied, and hdr_sequence() stops at the last of them.
+
+        Returns the offset of the next unit.
+        """
+        hdr_unit, hdr_sequence, hdr_count, end_offset = BookBuilder.unit_at(
+            msg_bytes, offset
+        )
+        msg_end_offset = end_offset
+        if count is not None and count < hdr_count:
+            hdr_count = count
+            msg_end_offset = offset + 8
+            for _ in range(count):
+                msg_end_offset += msg_bytes[msg_end_offset]
+        if not self._is_applied(hdr_unit, hdr_sequence, hdr_count):
+            handlers = self._handlers
+            for view in MessageView.iter_unit(
+                msg_bytes, offset, msg_end_offset, message_filter=message_filter
+            ):
+                handler = handlers.get(view.message_class())
+                if handler is not None:
+                    handler(view)
+            self._applied(hdr_unit, hdr_sequence, hdr_count)
+        return end_offset
+
+    @staticmethod
+    def from_file(
+        file_path: str,
+        message_filter: MessageFilter = None,
+        snapshot: BookSnapshot = None,
+    ) -> "BookBuilder":
+        """
+        Books as of the end of a file of Sequenced Unit Headers, starting
+        from 'snapshot' when given rather than from an empty book.
+        """
+        if snapshot is None:
+            book_builder = BookBuilder()
+        else:
+            book_builder = BookBuilder.from_snapshot(snapshot)
+        if message_filter is not None:
+            message_filter.reset()
+        with FileParser.map_file(file_path) as in_bytes:
+            book_builder.apply_buffer(in_bytes, message_filter=message_filter)
+        return book_builder
+
+    #
+    # Handlers
+    #
+    def _price_ticks(self, message: Message, message_class: Type[MessageBase]) -> int:
+        return message.price_ticks() * self._tick_factors[message_class]
+
+    def _message_class(self, message: Message) -> Type[MessageBase]:
+        if type(message) is MessageView:
+            return message.message_class()
+        return type(message)
+
+    def _time_message(self, message: Message) -> None:
+        self._time = message.time()
+
+    def _add_order(self, message: Message) -> None:
+        ticker = message.symbol()
+        if self._orderbook.has_ticker(ticker) is False:
+            self._orderbook.add_ticker(ticker)
+        self._orderbook.add_order(
+            ticker=ticker,
+            side=BookBuilder._sides[message.side()],
+            price=self._price_ticks(message, self._message_class(message)),
+            quantity=message.quantity(),
+            order_id=message.order_id(),
+        )
+        self._messages += 1
+
+    def _order_executed(self, message: Message) -> None:
+        order = self._orderbook.get_order(message.order_id())
+        if order is None:
+            self._missing_orders += 1
+            return
+        self._orderbook.execute_order(order.order_id, message.executed_quantity())
+        self._messages += 1
+
+    def _order_executed_at_price_size(self, message: Message) -> None:
+        # The order keeps its price, what is left of it is given outright
+        order = self._orderbook.get_order(message.order_id())
+        if order is None:
+            self._missing_orders += 1
+            return
+        self._orderbook.execute_order(
+            order.order_id, order.quantity - message.remaining_quantity()
+        )
+        self._messages += 1
+
+    def _reduce_size(self, message: Message) -> None:
+        order = self._orderbook.get_order(message.order_id())
+        if order is None:
+            self._missing_orders += 1
+            return
+        self._orderbook.reduce_order(order.order_id, message.canceled_quantity())
+        self._messages += 1
+
+    def _modify_order(self, message: Message) -> None:
+        order = self._orderbook.get_order(message.order_id())
+        if order is None:
+            self._missing_orders += 1
+            return
+        self._orderbook.modify_order(
+            order.order_id,
+            price=self._price_ticks(message, self._message_class(message)),
+            quantity=message.quantity(),
+        )
+        self._messages += 1
+
+    def _delete_order(self, message: Message) -> None:
+        order = self._orderbook.get_order(message.order_id())
+        if order is None:
+            self._missing_orders += 1
+            return
+        self._orderbook.delete_order(order.ticker, order.side, order.order_id)
+        self._messages += 1
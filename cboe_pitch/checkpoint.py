@@ -0,0 +1,337 @@
+import struct
+from contextlib import ExitStack
+from typing import ByteString, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .book_builder import BookBuilder
+from .file_parser import FileParser
+from .message_view import MessageView
+from .snapshot import BookSnapshot
+from .time import Time
+
+
+class Checkpoint(NamedTuple):
+    # Hdr Unit => Hdr Sequence of its last message in the snapshot
+    hdr_sequences: Dict[int, int]
+    # Seconds since midnight of the last Time message before the snapshot
+    time: int
+    # Offset in the capture of the first unit not in the snapshot
+    capture_offset: int
+    # Offset of the snapshot in the checkpoint file
+    snapshot_offset: int
+
+
+class Checkpointer:
+    """
+    Replays a capture of Sequenced Unit Headers into a BookBuilder and
+    saves a BookSnapshot of the books every 'every_messages' messages
+    applied (all Hdr Units together) and/or every 'every_seconds' seconds
+    of PITCH Time, so the books at any point of the capture can be rebuilt
+    from the nearest earlier checkpoint (see CheckpointIndex) instead of
+    from the open.
+
+    Checkpoints are only taken between units.
+
+    The checkpoint file is the snapshots back to back, followed by the
+    index, the Hdr Sequence of each Hdr Unit at each checkpoint and a
+    footer:
+
+    Offset   Length   Description
+       0        ?     Snapshots
+       I      20*C    Index: Time, capture offset and snapshot offset of
+                      each checkpoint
+     I+20*C   16*S    Sequences: checkpoint number, Hdr Unit and Hdr
+                      Sequence, checkpoint by checkpoint
+       ...     20     Footer: Magic b"PCKI", number of checkpoints (C),
+                      number of sequences (S), offset of the index (I)
+    """
+
+    MAGIC = b"PCKI"
+
+    _footer = struct.Struct("<4sIIQ")
+
+    _index_dtype = np.dtype(
+        [
+            ("time", "<u4"),
+            ("capture_offset", "<u8"),
+            ("snapshot_offset", "<u8"),
+        ]
+    )
+
+    _sequence_dtype = np.dtype(
+        [
+            ("checkpoint", "<u4"),
+            ("hdr_unit", "<u4"),
+            ("hdr_sequence", "<u8"),
+        ]
+    )
+
+    def __init__(self, every_messages: int = None, every_seconds: int = None):
+        if every_messages is None and every_seconds is None:
+            raise Exception("Either every_messages or every_seconds is needed")
+        self._every_messages = every_messages
+        self._every_seconds = every_seconds
+
+    def _is_due(self, messages: int, seconds: Optional[int]) -> bool:
+        if self._every_messages is not None and messages >= self._every_messages:
+            return True
+        if self._every_seconds is not None and seconds is not None:
+            return seconds >= self._every_seconds
+        return False
+
+    def write(self, capture_path: str, checkpoint_path: str) -> List[Checkpoint]:
+        """
+        Replay the capture at 'capture_path' and write its checkpoints to
+        'checkpoint_path'.  Returns the checkpoints written.
+        """
+        book_builder = BookBuilder()
+        checkpoints = []
+        with FileParser.map_file(capture_path) as in_bytes, open(
+            checkpoint_path, "wb"
+        ) as f_out:
+            # Messages applied since the last checkpoint, and Time counted
+            # from the first Time message of the capture
+            messages = 0
+            last_time = None
+            snapshot_offset = 0
+            offset = 0
+            while offset < len(in_bytes):
+                hdr_unit, hdr_sequence, hdr_count, _ = BookBuilder.unit_at(
+                    in_bytes, offset
+                )
+                last_sequence = book_builder.hdr_sequence(hdr_unit)
+                offset = book_builder.apply_unit_at(in_bytes, offset)
+                # Units sent again, and so skipped, are not counted
+                applied = book_builder.hdr_sequence(hdr_unit) != last_sequence
+                if applied or hdr_sequence == 0:
+                    messages += hdr_count
+                time = book_builder.time()
+                if last_time is None:
+                    last_time = time
+                seconds = None if time is None else time - last_time
+                if self._is_due(messages, seconds):
+                    checkpoints.append(
+                        Checkpoint(
+                            book_builder.hdr_sequences(),
+                            time or 0,
+                            offset,
+                            snapshot_offset,
+                        )
+                    )
+                    snapshot_offset += book_builder.snapshot().write_to(f_out)
+                    messages = 0
+                    last_time = time
+
+            index = np.array(
+                [x[1:] for x in checkpoints], dtype=Checkpointer._index_dtype
+            )
+            sequences = np.array(
+                [
+                    (idx, hdr_unit, hdr_sequence)
+                    for idx, checkpoint in enumerate(checkpoints)
+                    for hdr_unit, hdr_sequence in sorted(
+                        checkpoint.hdr_sequences.items()
+                    )
+                ],
+                dtype=Checkpointer._sequence_dtype,
+            )
+            f_out.write(index.tobytes())
+            f_out.write(sequences.tobytes())
+            f_out.write(
+                Checkpointer._footer.pack(
+                    Checkpointer.MAGIC, len(index), len(sequences), snapshot_offset
+                )
+            )
+        return checkpoints
+
+
+class CheckpointIndex:
+    """
+    Books at any Hdr Sequence of a Hdr Unit or any time of a capture,
+    rebuilt from the nearest earlier checkpoint written by Checkpointer:
+    the snapshot is restored and only the messages between it and the
+    point asked for are replayed.
+
+    Both files stay memory-mapped until close(), so that many queries only
+    cost a restore and a short replay each.
+    """
+
+    def __init__(self, capture_path: str, checkpoint_path: str):
+        with ExitStack() as files:
+            self._capture = files.enter_context(FileParser.map_file(capture_path))
+            self._checkpoints = files.enter_context(
+                FileParser.map_file(checkpoint_path)
+            )
+            self._index, self._sequences = CheckpointIndex._read_index(
+                self._checkpoints, checkpoint_path
+            )
+            self._files = files.pop_all()
+
+        # Hdr Unit => checkpoint numbers and Hdr Sequences, which only grow
+        # from one checkpoint to the next
+        sequences = self._sequences
+        self._units: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        for hdr_unit in np.unique(sequences["hdr_unit"]).tolist():
+            rows = sequences[sequences["hdr_unit"] == hdr_unit]
+            self._units[hdr_unit] = (rows["checkpoint"], rows["hdr_sequence"])
+
+    @staticmethod
+    def _read_index(
+        checkpoints: ByteString, checkpoint_path: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        footer = Checkpointer._footer
+        if len(checkpoints) < footer.size:
+            raise Exception(f"File {checkpoint_path} is not a checkpoint file")
+        magic, count, sequence_count, index_offset = footer.unpack_from(
+            checkpoints, len(checkpoints) - footer.size
+        )
+        if magic != Checkpointer.MAGIC:
+            raise Exception(f"File {checkpoint_path} is not a checkpoint file")
+        # Copied, so the mapping can be closed
+        index = np.frombuffer(
+            checkpoints,
+            dtype=Checkpointer._index_dtype,
+            count=count,
+            offset=index_offset,
+        )
+        sequences = np.frombuffer(
+            checkpoints,
+            dtype=Checkpointer._sequence_dtype,
+            count=sequence_count,
+            offset=index_offset + index.nbytes,
+        )
+        return index.copy(), sequences.copy()
+
+    def close(self) -> None:
+        self._index = None
+        self._sequences = None
+        self._units = None
+        self._files.close()
+
+    def __enter__(self) -> "CheckpointIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def checkpoints(self) -> List[Checkpoint]:
+        return [self._checkpoint(idx) for idx in range(len(self._index))]
+
+    def _checkpoint(self, idx: int) -> Optional[Checkpoint]:
+        if idx < 0:
+            return None
+        rows = self._sequences[self._sequences["checkpoint"] == idx]
+        hdr_sequences = dict(
+            zip(rows["hdr_unit"].tolist(), rows["hdr_sequence"].tolist())
+        )
+        return Checkpoint(hdr_sequences, *self._index[idx].tolist())
+
+    def find_sequence(
+        self, hdr_sequence: int, hdr_unit: int = 1
+    ) -> Optional[Checkpoint]:
+        """
+        Last checkpoint taken before the message of 'hdr_sequence' of
+        'hdr_unit', None when there is none.
+        """
+        rows = self._units.get(hdr_unit)
+        if rows is None:
+            # The unit only starts after the last checkpoint
+            return self._checkpoint(len(self._index) - 1)
+        checkpoint_numbers, hdr_sequences = rows
+        # A checkpoint holding the message itself may also hold later
+        # messages of other units, so only one short of it will do
+        pos = np.searchsorted(hdr_sequences, hdr_sequence, "left") - 1
+        if pos < 0:
+            return self._checkpoint(int(checkpoint_numbers[0]) - 1)
+        return self._checkpoint(int(checkpoint_numbers[pos]))
+
+    def find_time(self, time_ns: int) -> Optional[Checkpoint]:
+        """
+        Last checkpoint holding no message after 'time_ns' nanoseconds since
+        midnight, None when there is none.  A checkpoint may hold messages
+        up to the end of the second of its Time, so it is only used from
+        the next second on.
+        """
+        column = self._index["time"]
+        last_second = time_ns // 1_000_000_000 - 1
+        return self._checkpoint(np.searchsorted(column, last_second, "right") - 1)
+
+    def _restore(self, checkpoint: Optional[Checkpoint]) -> BookBuilder:
+        if checkpoint is None:
+            return BookBuilder()
+        snapshot, _ = BookSnapshot.from_buffer(
+            self._checkpoints, checkpoint.snapshot_offset
+        )
+        return BookBuilder.from_snapshot(snapshot)
+
+    @staticmethod
+    def _capture_offset(checkpoint: Optional[Checkpoint]) -> int:
+        return 0 if checkpoint is None else checkpoint.capture_offset
+
+    def at_sequence(self, hdr_sequence: int, hdr_unit: int = 1) -> BookBuilder:
+        """
+        Books once the message of 'hdr_sequence' of 'hdr_unit' has been
+        applied, along with the messages of other units before it.
+        """
+        checkpoint = self.find_sequence(hdr_sequence, hdr_unit)
+        book_builder = self._restore(checkpoint)
+        capture = self._capture
+        offset = CheckpointIndex._capture_offset(checkpoint)
+        while offset < len(capture):
+            unit, unit_sequence, hdr_count, end_offset = BookBuilder.unit_at(
+                capture, offset
+            )
+            if unit == hdr_unit and unit_sequence != 0:
+                if unit_sequence > hdr_sequence:
+                    break
+                if unit_sequence + hdr_count - 1 >= hdr_sequence:
+                    # Only the first messages of the unit, up to 'hdr_sequence'
+                    count = hdr_sequence - unit_sequence + 1
+                    book_builder.apply_unit_at(capture, offset, count=count)
+                    break
+            book_builder.apply_unit_at(capture, offset)
+            offset = end_offset
+        return book_builder
+
+    def at_time(self, time_ns: int) -> BookBuilder:
+        """
+        Books once every message up to 'time_ns' nanoseconds since midnight
+        (Time seconds plus Time Offset) has been applied.
+        """
+        checkpoint = self.find_time(time_ns)
+        book_builder = self._restore(checkpoint)
+        capture = self._capture
+        offset = CheckpointIndex._capture_offset(checkpoint)
+        seconds = book_builder.time() or 0
+        while offset < len(capture):
+            end_offset = BookBuilder.unit_at(capture, offset)[3]
+            # Messages of the unit up to 'time_ns'
+            count = 0
+            for view in MessageView.iter_unit(capture, offset, end_offset):
+                message_class = view.message_class()
+                if message_class is Time:
+                    if view.time() * 1_000_000_000 > time_ns:
+                        break
+                    seconds = view.time()
+                elif book_builder.handles(message_class):
+                    if seconds * 1_000_000_000 + view.time_offset() > time_ns:
+                        break
+                count += 1
+            else:
+                book_builder.apply_unit_at(capture, offset)
+                offset = end_offset
+                continue
+            if count > 0:
+                book_builder.apply_unit_at(capture, offset, count=count)
+            break
+        return book_builder
+
+    @staticmethod
+    def time_ns(hours: int, minutes: int, seconds: float) -> int:
+        """
+        Nanoseconds since midnight of a time of day, i.e. (10, 31, 7.123).
+        """
+        return (hours * 3_600 + minutes * 60) * 1_000_000_000 + round(
+            seconds * 1_000_000_000
+        )
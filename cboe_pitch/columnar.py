@@ -0,0 +1,182 @@
+import re
+from typing import ByteString, Dict, Type
+
+import numpy as np
+
+from .file_parser import FileParser
+from .message_factory import MessageFactory, UnknownMessageType
+from .message_filter import MessageFilter
+from .pitch24 import MessageBase, FieldName, FieldType
+
+
+class ColumnarDecoder:
+    """
+    Bulk decoder that turns whole captures into one NumPy structured
+    array per message type, instead of one MessageBase object per message.
+
+    Column names are the snake_case form of the FieldName of each field
+    (time_offset, order_id, symbol, price, ...).  Prices are kept as the
+    raw wire integers; use float_prices() to scale them.  Every array has
+    two extra columns:
+
+        hdr_sequence    Hdr Sequence of the unit the message was in
+        msg_index       Index of the message within that unit
+
+    so the sequence number of a message is hdr_sequence + msg_index.
+    """
+
+    _binary_formats = {1: "<u1", 2: "<u2", 4: "<u4", 8: "<u8"}
+    _wire_dtypes: Dict[Type[MessageBase], np.dtype] = {}
+    _dtypes: Dict[Type[MessageBase], np.dtype] = {}
+
+    @staticmethod
+    def column_name(field_name: FieldName) -> str:
+        return re.sub(r"(?<!^)(?=[A-Z])", "_", field_name.name).lower()
+
+    @staticmethod
+    def wire_dtype(message_class: Type[MessageBase]) -> np.dtype:
+        """
+        dtype laid out exactly like the message on the wire, built from the
+        field table of the message class.
+        """
+        wire_dtype = ColumnarDecoder._wire_dtypes.get(message_class)
+        if wire_dtype is None:
+            field_specs = message_class._schema.field_specs.values()
+            names = []
+            formats = []
+            offsets = []
+            for field_spec in field_specs:
+                names.append(ColumnarDecoder.column_name(field_spec._name))
+                if field_spec.field_type() in (
+                    FieldType.Alphanumeric,
+                    FieldType.PrintableAscii,
+                ):
+                    formats.append(f"S{field_spec.length()}")
+                else:
+                    formats.append(ColumnarDecoder._binary_formats[field_spec.length()])
+                offsets.append(field_spec.offset())
+            wire_dtype = np.dtype(
+                {
+                    "names": names,
+                    "formats": formats,
+                    "offsets": offsets,
+                    "itemsize": message_class._schema.codec.size,
+                }
+            )
+            ColumnarDecoder._wire_dtypes[message_class] = wire_dtype
+        return wire_dtype
+
+    @staticmethod
+    def dtype(message_class: Type[MessageBase]) -> np.dtype:
+        """
+        Packed dtype of the arrays returned for a message class.
+        """
+        out_dtype = ColumnarDecoder._dtypes.get(message_class)
+        if out_dtype is None:
+            wire_dtype = ColumnarDecoder.wire_dtype(message_class)
+            out_dtype = np.dtype(
+                [(name, wire_dtype.fields[name][0]) for name in wire_dtype.names]
+                + [("hdr_sequence", "<u4"), ("msg_index", "<u1")]
+            )
+            ColumnarDecoder._dtypes[message_class] = out_dtype
+        return out_dtype
+
+    @staticmethod
+    def float_prices(
+        message_class: Type[MessageBase], messages: np.ndarray
+    ) -> np.ndarray:
+        return messages["price"] / message_class._schema.price_scale
+
+    @staticmethod
+    def from_buffer(
+        msg_bytes: ByteString, message_filter: MessageFilter = None
+    ) -> Dict[Type[MessageBase], np.ndarray]:
+        """
+        Decode a buffer of back to back Sequenced Unit Headers.  Messages
+        rejected by 'message_filter' are left out.
+
+        Returns a dictionary of message class to structured array.
+        """
+        if message_filter is not None:
+            message_filter.reset()
+        buf = memoryview(msg_bytes)
+        raw = None
+        try:
+            # Pass 1 - Find where each message starts, by message type
+            positions = {}
+            offset = 0
+            while offset < len(buf):
+                hdr_length = buf[offset] | (buf[offset + 1] << 8)
+                hdr_sequence = int.from_bytes(buf[offset + 4 : offset + 8], "little")
+                if hdr_length < 8 or offset + hdr_length > len(buf):
+                    raise Exception(
+                        f"Invalid Hdr Length {hdr_length} at offset {offset}"
+                    )
+                end_offset = offset + hdr_length
+
+                msg_offset = offset + 8
+                msg_index = 0
+                while msg_offset < end_offset:
+                    if message_filter is None or message_filter.accepts(
+                        buf, msg_offset
+                    ):
+                        msg_type = buf[msg_offset + 1]
+                        position = positions.get(msg_type)
+                        if position is None:
+                            position = positions[msg_type] = ([], [], [])
+                        position[0].append(msg_offset)
+                        position[1].append(hdr_sequence)
+                        position[2].append(msg_index)
+
+                    msg_index += 1
+                    next_msg_len = buf[msg_offset]
+                    if next_msg_len == 0:
+                        raise Exception(
+                            f"Invalid message length 0 at offset {msg_offset}"
+                        )
+                    msg_offset += next_msg_len
+                offset = end_offset
+
+            # Pass 2 - Gather the bytes of each message type and view them as
+            # records
+            raw = np.frombuffer(buf, dtype=np.uint8)
+            out_arrays = {}
+            for msg_type, position in positions.items():
+                msg_offsets, hdr_sequences, msg_indexes = position
+                message_class = MessageFactory.lookup(msg_type)
+                if message_class is None:
+                    raise UnknownMessageType(msg_type)
+                wire_dtype = ColumnarDecoder.wire_dtype(message_class)
+
+                rows = raw[
+                    np.asarray(msg_offsets, dtype=np.int64)[:, None]
+                    + np.arange(wire_dtype.itemsize)
+                ]
+                wire_msgs = rows.view(wire_dtype)[:, 0]
+                bad_lengths = np.nonzero(wire_msgs["length"] != wire_dtype.itemsize)
+                if len(bad_lengths[0]) > 0:
+                    bad_offset = msg_offsets[bad_lengths[0][0]]
+                    raise Exception(f"Invalid message length at offset {bad_offset}")
+
+                messages = np.empty(
+                    len(msg_offsets), dtype=ColumnarDecoder.dtype(message_class)
+                )
+                for name in wire_dtype.names:
+                    messages[name] = wire_msgs[name]
+                messages["hdr_sequence"] = hdr_sequences
+                messages["msg_index"] = msg_indexes
+                out_arrays[message_class] = messages
+        finally:
+            # Let go of 'msg_bytes' even on a parse error, so that a
+            # memory-mapped file under it can be closed
+            del raw
+            buf.release()
+
+        return out_arrays
+
+    @staticmethod
+    def from_file(
+        file_path: str, message_filter: MessageFilter = None
+    ) -> Dict[Type[MessageBase], np.ndarray]:
+        with FileParser.map_file(file_path) as in_bytes:
+            return ColumnarDecoder.from_buffer(in_bytes, message_filter)
@@ -1,39 +1,44 @@
+from typing import OrderedDict
+
 from .pitch24 import MessageBase, FieldName, FieldSpec, FieldType
 
 
 class DeleteOrder(MessageBase):
     _messageType = 0x29
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length] = FieldSpec(
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length] = FieldSpec(
             field_name=FieldName.Length, offset=0, length=1, field_type=FieldType.Binary,
             value=14
         )
-        self._field_specs[FieldName.MessageType] = FieldSpec(
+        field_specs[FieldName.MessageType] = FieldSpec(
             field_name=FieldName.MessageType,
             offset=1,
             length=1,
             field_type=FieldType.Value,
-            value=self._messageType
+            value=cls._messageType
         )
-        self._field_specs[FieldName.TimeOffset] = FieldSpec(
+        field_specs[FieldName.TimeOffset] = FieldSpec(
             field_name=FieldName.TimeOffset,
             offset=2,
             length=4,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.OrderId] = FieldSpec(
+        field_specs[FieldName.OrderId] = FieldSpec(
             field_name=FieldName.OrderId,
             offset=6,
             length=8,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.Length].value(14)
-        self._field_specs[FieldName.MessageType].value(self._messageType)
+        field_specs[FieldName.Length].value(14)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+        return field_specs
 
     def set_fields(self, time_offset: int, order_id: str):
-        self._field_specs[FieldName.TimeOffset].value(time_offset)
+        self._set(FieldName.TimeOffset, time_offset)
         self.order_id(order_id)
 
     @staticmethod
@@ -1,28 +1,82 @@
+import mmap
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import ByteString, Iterator, List
 
+from .message_filter import MessageFilter
+from .message_view import MessageView
+from .pitch24 import MessageBase
 from .seq_unit_header import SequencedUnitHeader
 
 
 class FileParser:
     @staticmethod
-    def parse_file(file_path: str) -> List[SequencedUnitHeader]:
+    @contextmanager
+    def map_file(file_path: str) -> Iterator[ByteString]:
+        """
+        Memory-map a file for reading, for as long as the with block lasts.
+        An empty file gives b"" as it cannot be mapped.
+        """
         f_in = Path(file_path)
         if f_in.exists() is False:
             raise Exception(f"File {file_path} does not exist")
+        if f_in.stat().st_size == 0:
+            yield b""
+            return
 
-        rem_bytes = Path(file_path).read_bytes()
+        with open(f_in, "rb") as f_bin:
+            with mmap.mmap(f_bin.fileno(), 0, access=mmap.ACCESS_READ) as in_bytes:
+                yield in_bytes
 
-        out_arr = []
+    @staticmethod
+    def iter_units(
+        file_path: str, message_filter: MessageFilter = None
+    ) -> Iterator[SequencedUnitHeader]:
+        """
+        Yield the Sequenced Unit Headers of a file one at a time.
+
+        The file is memory-mapped rather than read, so memory use does not
+        grow with the size of the file and the first units are available
+        before the rest of the file has been touched.
+
+        Messages rejected by 'message_filter' are skipped before decoding.
+        """
+        if message_filter is not None:
+            message_filter.reset()
+        with FileParser.map_file(file_path) as in_bytes:
+            offset = 0
+            while offset < len(in_bytes):
+                [seq_unit_hdr, offset] = SequencedUnitHeader.from_buffer(
+                    msg_bytes=in_bytes, offset=offset, message_filter=message_filter
+                )
+                yield seq_unit_hdr
 
-        more_seq = True
-        while more_seq:
-            [seq_unit_hdr, rem_bytes] = SequencedUnitHeader.from_bytestream(
-                msg_bytes=rem_bytes
-            )
-            out_arr.append(seq_unit_hdr)
+    @staticmethod
+    def iter_messages(
+        file_path: str, message_filter: MessageFilter = None
+    ) -> Iterator[MessageBase]:
+        """
+        Yield every message of a file, in sequence order.
+        """
+        for seq_unit_hdr in FileParser.iter_units(file_path, message_filter):
+            yield from seq_unit_hdr.getMessages()
 
-            if rem_bytes is None:
-                break
+    @staticmethod
+    def iter_views(
+        file_path: str, message_filter: MessageFilter = None
+    ) -> Iterator[MessageView]:
+        """
+        Yield a lazily decoded MessageView of every message of a file.
+        The views point into the memory-mapped file, so they can only be
+        used until the iteration is over.
+        """
+        if message_filter is not None:
+            message_filter.reset()
+        with FileParser.map_file(file_path) as in_bytes:
+            yield from MessageView.iter_buffer(in_bytes, message_filter=message_filter)
 
-        return out_arr
+    @staticmethod
+    def parse_file(
+        file_path: str, message_filter: MessageFilter = None
+    ) -> List[SequencedUnitHeader]:
+        return list(FileParser.iter_units(file_path, message_filter))
@@ -10,6 +10,7 @@ from .delete_order import DeleteOrder
 from .modify import ModifyOrderShort, ModifyOrderLong
 from .order_executed import OrderExecuted, OrderExecutedAtPriceSize
 from .orderbook import OrderBook, Side
+from .pitch24 import FieldConverter
 from .reduce_size import ReduceSizeLong, ReduceSizeShort
 from .time import Time
 from .trade import TradeLong, TradeShort, TradeExpanded
@@ -101,6 +102,7 @@ class Generator(object):
         start_time: datetime = None,
         total_time_s: int = 60,
         seed=None,
+        price_ticks: bool = False,
     ):
         """
         parameters:
@@ -143,6 +145,12 @@ class Generator(object):
             price_range: Tuple[float, float]
                 Price, one standard deviation
                 Target price, and the size of one standard deviation
+
+            price_ticks
+                Keep prices as integer ticks (10_000 per dollar) in the order
+                book instead of floats.  New prices are then picked on a one
+                cent grid, and the book of each ticker is a ladder over the
+                price_range of its WatchListItem (see LadderSide).
         """
         if len(watch_list) == 0:
             raise Exception("WatchList size == 0")
@@ -172,9 +180,23 @@ class Generator(object):
         self._rng = np.random.default_rng(seed)
 
         # Initialize OrderBook for each ticker in watch_list
-        self._orderbook = OrderBook()
+        self._price_scale = 10_000 if price_ticks else None
+        self._orderbook = OrderBook(price_scale=self._price_scale)
         for ticker, watch_list_item in self._watch_list.items():
-            self._orderbook.add_ticker(ticker=ticker)
+            if self._price_scale is None:
+                self._orderbook.add_ticker(ticker=ticker)
+            else:
+                # The one cent grid of _pickNewPriceTicks()
+                price_range = watch_list_item[Side.Buy].price_range
+                tick_size = self._price_scale // 100
+                self._orderbook.add_ticker(
+                    ticker=ticker,
+                    price_range=(
+                        FieldConverter.price_to_ticks(price_range[0], 100) * tick_size,
+                        FieldConverter.price_to_ticks(price_range[1], 100) * tick_size,
+                    ),
+                    tick_size=tick_size,
+                )
 
         # Set 1st Order Id
         self._nextOrderNum = 0
@@ -291,8 +313,21 @@ class Generator(object):
         self._time_offset += self._time_interval_ns
         return next_time_offset
 
+    def clock_ns(self) -> int:
+        """
+        Current time of the generator, in nanoseconds since the epoch,
+        i.e. the time of the last 'Time' message plus the time offset.
+        """
+        return (
+            int(self._time.timestamp()) * 1_000_000_000
+            + self._time.microsecond * 1_000
+            + self._time_offset
+        )
+
     def _pickRandomOrder(self, ticker: str, side: Side) -> Order:
-        return self._pickRandom(self._orderbook.get_orders(ticker=ticker, side=side))
+        order_count = self._orderbook.order_count(ticker=ticker, side=side)
+        rand_idx = self._rng.integers(low=0, high=order_count)
+        return self._orderbook.get_order_at(ticker=ticker, side=side, index=rand_idx)
 
     def _pickRandom(self, in_list) -> Any:
         list_len = len(in_list)
@@ -306,7 +341,7 @@ class Generator(object):
         logger.debug(f"MsgType.Add")
         # Is book too small?
         if (
-            len(self._orderbook.get_orders(ticker=ticker, side=side))
+            self._orderbook.order_count(ticker=ticker, side=side)
             < self._watch_list[ticker][side].book_size_range[0]
         ):
             # We want an Add
@@ -314,7 +349,7 @@ class Generator(object):
             return Generator.MsgType.Add
         # Is book too big?
         elif (
-            len(self._orderbook.get_orders(ticker=ticker, side=side))
+            self._orderbook.order_count(ticker=ticker, side=side)
             > self._watch_list[ticker][side].book_size_range[1]
         ):
             # We want a Delete
@@ -340,6 +375,9 @@ class Generator(object):
     def _pickNewPrice(
         self, price_range: Tuple[float, float], old_price: float = None
     ) -> float:
+        if self._price_scale is not None:
+            return self._pickNewPriceTicks(price_range=price_range, old_price=old_price)
+
         if old_price is None:
             new_price = price_range[0] + (
                 self._rng.random() * (price_range[1] - price_range[0])
@@ -354,6 +392,25 @@ class Generator(object):
         new_price = float(np.around(new_price, decimals=2))
         return new_price
 
+    def _pickNewPriceTicks(
+        self, price_range: Tuple[float, float], old_price: int = None
+    ) -> int:
+        low_cents = FieldConverter.price_to_ticks(price_range[0], 100)
+        high_cents = FieldConverter.price_to_ticks(price_range[1], 100)
+        new_price = old_price
+        while new_price == old_price:
+            new_cents = int(self._rng.integers(low=low_cents, high=high_cents + 1))
+            new_price = new_cents * (self._price_scale // 100)
+        return new_price
+
+    def _messagePrice(self, price) -> float:
+        """
+        Price to put in a message for a price held by the order book.
+        """
+        if self._price_scale is None:
+            return price
+        return FieldConverter.ticks_to_price(price, self._price_scale)
+
     def _pickNewSize(self, size_range: Tuple[int, int], old_size: int = None) -> int:
         if old_size is None:
             r_1 = self._rng.random()
@@ -405,7 +462,7 @@ class Generator(object):
                     side=new_side,
                     quantity=new_size,
                     symbol=ticker,
-                    price=new_price,
+                    price=self._messagePrice(new_price),
                 )
             elif new_msg_type == AddOrderShort:
                 message = AddOrderShort.from_parms(
@@ -414,7 +471,7 @@ class Generator(object):
                     side=new_side,
                     quantity=new_size,
                     symbol=ticker,
-                    price=new_price,
+                    price=self._messagePrice(new_price),
                 )
             elif new_msg_type == AddOrderExpanded:
                 message = AddOrderExpanded.from_parms(
@@ -423,7 +480,7 @@ class Generator(object):
                     side=new_side,
                     quantity=new_size,
                     symbol=ticker,
-                    price=new_price,
+                    price=self._messagePrice(new_price),
                     displayed=True,
                     participant_id="MPID",
                     customer_indicator="C",
@@ -432,7 +489,7 @@ class Generator(object):
             self._orderbook.add_order(
                 ticker=ticker,
                 side=side,
-                price=message.price(),
+                price=message.price() if self._price_scale is None else new_price,
                 quantity=message.quantity(),
                 order_id=message.order_id(),
             )
@@ -464,8 +521,9 @@ class Generator(object):
                 )
                 #                print(f'new_size: {new_size}')
 
-                random_order._price = new_price
-                random_order._quantity = new_size
+                self._orderbook.modify_order(
+                    order_id=random_order.order_id, price=new_price, quantity=new_size
+                )
                 #                print('-' * 50)
                 #                print(f'Modified Order: {random_order}')
 
@@ -475,14 +533,14 @@ class Generator(object):
                 if new_msg_type == ModifyOrderLong:
                     return ModifyOrderLong.from_parms(
                         time_offset=new_timestamp,
-                        price=new_price,
+                        price=self._messagePrice(new_price),
                         quantity=new_size,
                         order_id=random_order._order_id,
                     )
                 elif new_msg_type == ModifyOrderShort:
                     return ModifyOrderShort.from_parms(
                         time_offset=new_timestamp,
-                        price=new_price,
+                        price=self._messagePrice(new_price),
                         quantity=new_size,
                         order_id=random_order._order_id,
                     )
@@ -504,10 +562,14 @@ class Generator(object):
                     size_range=new_size_range, old_size=old_size
                 )
                 # print(f'New size: {new_size}')
+                self._orderbook.execute_order(
+                    order_id=random_order.order_id,
+                    executed_quantity=old_size - new_size,
+                )
                 return OrderExecutedAtPriceSize.from_parms(
                     time_offset=new_timestamp,
                     order_id=random_order._order_id,
-                    price=random_order._price,
+                    price=self._messagePrice(random_order._price),
                     executed_quantity=old_size - new_size,
                     remaining_quantity=new_size,
                     execution_id=self._getNextExecutionId(),
@@ -531,7 +593,9 @@ class Generator(object):
                 )
                 # print(f'New size: {new_size}')
                 canceled_quantity = old_size - new_size
-                random_order._quantity = old_size - canceled_quantity
+                self._orderbook.reduce_order(
+                    order_id=random_order.order_id, canceled_quantity=canceled_quantity
+                )
 
                 if new_msg_type == ReduceSizeLong:
                     return ReduceSizeLong.from_parms(
@@ -574,7 +638,7 @@ class Generator(object):
                     executed_quantity=random_order._quantity,
                     remaining_quantity=0,
                     execution_id=self._getNextExecutionId(),
-                    price=random_order._price,
+                    price=self._messagePrice(random_order._price),
                 )
             elif new_msg_type == TradeShort:
                 return TradeShort.from_parms(
@@ -583,7 +647,7 @@ class Generator(object):
                     side=random_order_side,
                     quantity=random_order._quantity,
                     symbol=random_order._ticker,
-                    price=random_order._price,
+                    price=self._messagePrice(random_order._price),
                     execution_id=self._getNextExecutionId(),
                 )
             elif new_msg_type == TradeLong:
@@ -593,7 +657,7 @@ class Generator(object):
                     side=random_order_side,
                     quantity=random_order._quantity,
                     symbol=random_order._ticker,
-                    price=random_order._price,
+                    price=self._messagePrice(random_order._price),
                     execution_id=self._getNextExecutionId(),
                 )
             elif new_msg_type == TradeExpanded:
@@ -603,7 +667,7 @@ class Generator(object):
                     side=random_order_side,
                     quantity=random_order._quantity,
                     symbol=random_order._ticker,
-                    price=random_order._price,
+                    price=self._messagePrice(random_order._price),
                     execution_id=self._getNextExecutionId(),
                 )
             else:
@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import Any
 
 from .generator import Generator, WatchListItem
+from .pcap import PcapWriter
+from .ring_buffer import RingBuffer
 from .seq_unit_header import SequencedUnitHeader
 from .config import Config
 from .util import get_line, get_form
@@ -39,6 +41,25 @@ def parse_args() -> Any:
     parser.add_argument(
         "-o", "--output-file", default="pitch24.bin", help="Specify output file"
     )
+    parser.add_argument(
+        "-p",
+        "--pcap",
+        default=False,
+        action="store_true",
+        help="Write a pcap capture of UDP datagrams instead of bare units",
+    )
+    parser.add_argument(
+        "--group", default="239.1.1.1", help="Multicast group of the pcap capture"
+    )
+    parser.add_argument(
+        "--port", default=8000, type=int, help="UDP port of the pcap capture"
+    )
+    parser.add_argument(
+        "-s",
+        "--shared-memory",
+        default=None,
+        help="Write units to the shared memory ring buffer with this name",
+    )
 
     return parser.parse_args()
 
@@ -139,6 +160,7 @@ def main():
     # Generate Messages
     msg_count = 0
     seq_unit_array = []
+    seq_unit_times = []
     seq_unit_hdr = SequencedUnitHeader(hdr_sequence=1)
     while msg_count < num_of_msgs:
         new_msg = generator.getNextMsg()
@@ -151,41 +173,54 @@ def main():
             seq_unit_hdr.addMessage(new_msg)
         else:
             seq_unit_array.append(seq_unit_hdr)
+            seq_unit_times.append(generator.clock_ns())
             seq_unit_hdr = SequencedUnitHeader(
                 hdr_sequence=seq_unit_hdr.getNextSequence()
             )
             seq_unit_hdr.addMessage(new_msg)
     if seq_unit_hdr.hdr_count() > 0:
         seq_unit_array.append(seq_unit_hdr)
+        seq_unit_times.append(generator.clock_ns())
+
+    if args.pcap:
+        with PcapWriter(
+            config.output_file(), dst_ip=args.group, dst_port=args.port
+        ) as pcap_writer:
+            for seq_unit_hdr, seq_unit_time in zip(seq_unit_array, seq_unit_times):
+                print(f"Time={seq_unit_time}: {seq_unit_hdr}")
+                pcap_writer.write_unit(seq_unit_hdr.get_bytes(), seq_unit_time)
+        return
+
+    if args.shared_memory is not None:
+        # The reader creates the ring buffer and frees it once it is done
+        ring_buffer = RingBuffer.attach(args.shared_memory)
+        for seq_unit_hdr in seq_unit_array:
+            ring_buffer.write_unit(seq_unit_hdr)
+        ring_buffer.close_writer()
+        ring_buffer.close()
+        return
 
     # Write Generated Messages
-    # TODO: Write out messages in binary format
-    #       and echo to screen
-    #       and for trace show orderbook
-    f_bin = open(config.output_file(), "wb")
-
+    # The units are encoded as framed above into one buffer, which is
+    # written with a single write
+    out_bytes = bytearray(sum(x.getLength() for x in seq_unit_array))
+    file_offset = 0
     for seq_unit_hdr in seq_unit_array:
         logger.info(get_line(" ", " "))
         logger.info(get_line(" ", " "))
 
         # Print Sequenced Unit Header info
-        file_offset = f_bin.tell()
         print(f"Offset={str(hex(file_offset))}: {seq_unit_hdr}")
-
-        # Write Sequenced Unit Header to file
-        new_msg_bytes = seq_unit_hdr.get_bytes()
-        new_msg_bytes_str = ", ".join([str(hex(x)) for x in new_msg_bytes])
-        print(f"DEBUG: bytes: {new_msg_bytes_str}")
-        f_bin.write(new_msg_bytes)
+        seq_unit_hdr.encode_into(out_bytes, file_offset)
+        file_offset += 8
 
         for message in seq_unit_hdr.getMessages():
             # Print one-liner for each message in Sequenced Unit Header, including file offset
-            file_offset = f_bin.tell()
             logger.warn(f"\t - Offset={str(hex(file_offset))}: {message}")
-            # Print each message to file
-            f_bin.write(message.get_bytes())
+            file_offset += message.length()
 
-    f_bin.close()
+    with open(config.output_file(), "wb") as f_bin:
+        f_bin.write(out_bytes)
 
 
 #    for i in range(num_of_msgs):
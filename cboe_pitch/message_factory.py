@@ -1,16 +1,41 @@
-from typing import ByteString, List, Union
+from typing import ByteString, List, Optional, Type, Union
 
+from .pitch24 import MessageBase
 from .time import Time
 from .add_order import AddOrderLong, AddOrderShort, AddOrderExpanded
 from .delete_order import DeleteOrder
 from .modify import ModifyOrderLong, ModifyOrderShort
 from .order_executed import OrderExecuted, OrderExecutedAtPriceSize
 from .reduce_size import ReduceSizeLong, ReduceSizeShort
-from .modify import ModifyOrderLong, ModifyOrderShort
-from .delete_order import DeleteOrder
 from .trade import TradeLong, TradeShort, TradeExpanded
 
+
+class UnknownMessageType(Exception):
+    def __init__(self, msg_type: int):
+        super().__init__(f"Unknown type {hex(msg_type)}")
+        self.msg_type = msg_type
+
+
 class MessageFactory:
+    # Message class for every possible value of the Message Type byte
+    _dispatch: List[Optional[Type[MessageBase]]] = [None] * 256
+
+    @staticmethod
+    def register(message_class: Type[MessageBase]) -> Type[MessageBase]:
+        """
+        Make a message class known to the factory, keyed on its
+        _messageType.  Returns the class so it can be used as a decorator.
+        """
+        msg_type = message_class._messageType
+        if msg_type is None or not 0 <= msg_type <= 0xFF:
+            raise Exception(f"Invalid message type {msg_type} for {message_class}")
+        MessageFactory._dispatch[msg_type] = message_class
+        return message_class
+
+    @staticmethod
+    def lookup(msg_type: int) -> Optional[Type[MessageBase]]:
+        return MessageFactory._dispatch[msg_type]
+
     @staticmethod
     def from_list(
         msg_bytes: List[int],
@@ -21,43 +46,28 @@ class MessageFactory:
     def from_bytes(
         msg_bytes: ByteString,
     ) -> Union[Time, AddOrderLong, AddOrderShort, AddOrderExpanded]:
-        message = None
-        if msg_bytes[1] == Time._messageType:
-            message = Time()
-
-        elif msg_bytes[1] == AddOrderLong._messageType:
-            message = AddOrderLong()
-        elif msg_bytes[1] == AddOrderShort._messageType:
-            message = AddOrderShort()
-        elif msg_bytes[1] == AddOrderExpanded._messageType:
-            message = AddOrderExpanded()
-
-        elif msg_bytes[1] == OrderExecuted._messageType:
-            message = OrderExecuted()
-        elif msg_bytes[1] == OrderExecutedAtPriceSize._messageType:
-            message = OrderExecutedAtPriceSize()
-
-        elif msg_bytes[1] == ReduceSizeLong._messageType:
-            message = ReduceSizeLong()
-        elif msg_bytes[1] == ReduceSizeShort._messageType:
-            message = ReduceSizeShort()
-
-        elif msg_bytes[1] == ModifyOrderLong._messageType:
-            message = ModifyOrderLong()
-        elif msg_bytes[1] == ModifyOrderShort._messageType:
-            message = ModifyOrderShort()
-
-        elif msg_bytes[1] == DeleteOrder._messageType:
-            message = DeleteOrder()
-
-        elif msg_bytes[1] == TradeLong._messageType:
-            message = TradeLong()
-        elif msg_bytes[1] == TradeShort._messageType:
-            message = TradeShort()
-        elif msg_bytes[1] == TradeExpanded._messageType:
-            message = TradeExpanded()
-
-        if message is None:
-            raise Exception("Unknown type")
+        message_class = MessageFactory._dispatch[msg_bytes[1]]
+        if message_class is None:
+            raise UnknownMessageType(msg_bytes[1])
+        message = message_class()
         message.from_bytes(msg_bytes)
         return message
+
+
+for _message_class in (
+    Time,
+    AddOrderLong,
+    AddOrderShort,
+    AddOrderExpanded,
+    OrderExecuted,
+    OrderExecutedAtPriceSize,
+    ReduceSizeLong,
+    ReduceSizeShort,
+    ModifyOrderLong,
+    ModifyOrderShort,
+    DeleteOrder,
+    TradeLong,
+    TradeShort,
+    TradeExpanded,
+):
+    MessageFactory.register(_message_class)
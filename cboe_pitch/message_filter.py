@@ -0,0 +1,149 @@
+from typing import ByteString, Iterable, Optional
+
+from .delete_order import DeleteOrder
+from .message_factory import MessageFactory
+from .pitch24 import FieldName
+
+
+class MessageFilter:
+    """
+    Decides whether a message is wanted by looking at its raw bytes only,
+    so that unwanted messages can be skipped without being decoded.
+
+    msg_types
+        Message Type bytes to keep (i.e. {AddOrderLong._messageType}).
+        None keeps every type.
+
+    symbols
+        Symbols to keep.  None keeps every symbol.  Messages that carry a
+        Symbol are compared at the fixed offset of that field for their
+        type.  Messages that only carry an Order Id (executions, reduces,
+        modifies and deletes) are kept when the order was added by a kept
+        Add Order message and is still on the book, so the filter has to
+        see messages in sequence order.  Messages with neither field, such
+        as Time, are always kept.
+
+    The orders on the book are forgotten by reset(), which every parse of
+    a new capture starts with, so a filter can be used on several files.
+    """
+
+    def __init__(
+        self,
+        msg_types: Optional[Iterable[int]] = None,
+        symbols: Optional[Iterable[str]] = None,
+    ):
+        self._msg_types = None
+        if msg_types is not None:
+            self._msg_types = bytearray(256)
+            for msg_type in msg_types:
+                self._msg_types[msg_type] = 1
+
+        self._symbols = None if symbols is None else set(symbols)
+        # Order Id => quantity left, of the kept orders still on the book
+        self._quantities = {}
+
+        # Per Message Type: (symbol offset, symbol end, wanted symbols)
+        self._symbol_fields = [None] * 256
+        # Per Message Type: (order id offset, order id end)
+        self._order_id_fields = [None] * 256
+        # Per Message Type: 1 if it only refers to an order by Order Id
+        self._order_id_types = bytearray(256)
+        # Per Message Type: 1 if it adds a new order to the book
+        self._add_types = bytearray(256)
+        # Per Message Type: (quantity offset, quantity end, 1 if the quantity
+        # is taken off the order rather than what is left of it)
+        self._quantity_fields = [None] * 256
+
+        for msg_type in range(256):
+            message_class = MessageFactory.lookup(msg_type)
+            if message_class is None:
+                continue
+            field_specs = message_class._schema.field_specs
+            order_id_spec = field_specs.get(FieldName.OrderId)
+            if order_id_spec is not None:
+                self._order_id_fields[msg_type] = (
+                    order_id_spec.offset(),
+                    order_id_spec.offset() + order_id_spec.length(),
+                )
+            for field_name, taken_off in (
+                (FieldName.RemainingQuantity, 0),
+                (FieldName.Quantity, 0),
+                (FieldName.ExecutedQuantity, 1),
+                (FieldName.CanceledQuantity, 1),
+            ):
+                quantity_spec = field_specs.get(field_name)
+                if quantity_spec is not None:
+                    self._quantity_fields[msg_type] = (
+                        quantity_spec.offset(),
+                        quantity_spec.offset() + quantity_spec.length(),
+                        taken_off,
+                    )
+                    break
+            symbol_spec = field_specs.get(FieldName.Symbol)
+            if symbol_spec is not None:
+                wanted = None
+                if self._symbols is not None:
+                    wanted = {
+                        symbol.ljust(symbol_spec.length()).encode()
+                        for symbol in self._symbols
+                    }
+                self._symbol_fields[msg_type] = (
+                    symbol_spec.offset(),
+                    symbol_spec.offset() + symbol_spec.length(),
+                    wanted,
+                )
+                if FieldName.AddFlags in field_specs:
+                    self._add_types[msg_type] = 1
+            elif order_id_spec is not None:
+                self._order_id_types[msg_type] = 1
+
+    def reset(self) -> None:
+        """
+        Forget the orders seen so far, before the messages of a new capture.
+        """
+        self._quantities.clear()
+
+    def _order_id(self, msg_bytes: ByteString, offset: int, msg_type: int) -> bytes:
+        order_id_field = self._order_id_fields[msg_type]
+        return bytes(msg_bytes[offset + order_id_field[0] : offset + order_id_field[1]])
+
+    def _quantity(self, msg_bytes: ByteString, offset: int, msg_type: int) -> int:
+        quantity_field = self._quantity_fields[msg_type]
+        return int.from_bytes(
+            msg_bytes[offset + quantity_field[0] : offset + quantity_field[1]],
+            "little",
+        )
+
+    def accepts(self, msg_bytes: ByteString, offset: int = 0) -> bool:
+        msg_type = msg_bytes[offset + 1]
+
+        if self._symbols is not None:
+            symbol_field = self._symbol_fields[msg_type]
+            if symbol_field is not None:
+                symbol = bytes(msg_bytes[offset + symbol_field[0] : offset + symbol_field[1]])
+                if symbol not in symbol_field[2]:
+                    return False
+                if self._add_types[msg_type]:
+                    order_id = self._order_id(msg_bytes, offset, msg_type)
+                    self._quantities[order_id] = self._quantity(
+                        msg_bytes, offset, msg_type
+                    )
+            elif self._order_id_types[msg_type]:
+                order_id = self._order_id(msg_bytes, offset, msg_type)
+                quantity = self._quantities.get(order_id)
+                if quantity is None:
+                    return False
+                if msg_type == DeleteOrder._messageType:
+                    del self._quantities[order_id]
+                elif self._quantity_fields[msg_type] is not None:
+                    if self._quantity_fields[msg_type][2]:
+                        quantity -= self._quantity(msg_bytes, offset, msg_type)
+                    else:
+                        quantity = self._quantity(msg_bytes, offset, msg_type)
+                    # Filled or canceled in full, the Order Id may be used again
+                    if quantity <= 0:
+                        del self._quantities[order_id]
+                    else:
+                        self._quantities[order_id] = quantity
+
+        return self._msg_types is None or self._msg_types[msg_type] == 1
@@ -0,0 +1,200 @@
+import struct
+from typing import Any, ByteString, Dict, Iterator, Type
+
+from .message_factory import MessageFactory, UnknownMessageType
+from .message_filter import MessageFilter
+from .pitch24 import MessageBase, FieldConverter, FieldName, FieldSpec, FieldType
+
+
+class FieldReader:
+    """
+    Decodes a single field of a message straight out of a buffer.
+    """
+
+    __slots__ = ("_offset", "_length", "_read", "_read_int")
+
+    _binary_formats = {1: "<B", 2: "<H", 4: "<I", 8: "<Q"}
+
+    def __init__(self, field_spec: FieldSpec):
+        self._offset = field_spec.offset()
+        self._length = field_spec.length()
+
+        field_type = field_spec.field_type()
+        if field_type in (FieldType.Alphanumeric, FieldType.PrintableAscii):
+            self._read = self._read_ascii
+            self._read_int = None
+        else:
+            unpack_from = struct.Struct(
+                FieldReader._binary_formats[self._length]
+            ).unpack_from
+            self._read_int = lambda buf, off: unpack_from(buf, off)[0]
+            price_scale = FieldConverter.price_scales.get(field_type)
+            if price_scale is None:
+                self._read = self._read_int
+            else:
+                self._read = lambda buf, off: unpack_from(buf, off)[0] / price_scale
+
+    def _read_ascii(self, buf: ByteString, offset: int) -> str:
+        return bytes(buf[offset : offset + self._length]).decode()
+
+    def read(self, buf: ByteString, msg_offset: int) -> Any:
+        return self._read(buf, msg_offset + self._offset)
+
+    def read_int(self, buf: ByteString, msg_offset: int) -> int:
+        """
+        Integer found on the wire, i.e. a price in ticks rather than dollars.
+        """
+        return self._read_int(buf, msg_offset + self._offset)
+
+    def read_bytes(self, buf: ByteString, msg_offset: int) -> bytes:
+        offset = msg_offset + self._offset
+        return bytes(buf[offset : offset + self._length])
+
+
+class MessageView:
+    """
+    Read-only, lazily decoded view of one message inside a buffer.
+
+    A view only holds (buffer, offset) and the field layout shared by every
+    view of the same message class; a field is decoded when its accessor is
+    called.  The accessors have the same names as on MessageBase.
+
+    The view does not copy the message, so it is only valid for as long as
+    the underlying buffer is.
+    """
+
+    __slots__ = ("_buf", "_offset", "_message_class", "_readers")
+
+    _layouts: Dict[Type[MessageBase], Dict[FieldName, FieldReader]] = {}
+
+    def __init__(self, buf: ByteString, offset: int = 0):
+        message_class = MessageFactory.lookup(buf[offset + 1])
+        if message_class is None:
+            raise UnknownMessageType(buf[offset + 1])
+        self._buf = buf
+        self._offset = offset
+        self._message_class = message_class
+        self._readers = MessageView.layout(message_class)
+
+    @staticmethod
+    def layout(message_class: Type[MessageBase]) -> Dict[FieldName, FieldReader]:
+        readers = MessageView._layouts.get(message_class)
+        if readers is None:
+            readers = {
+                field_name: FieldReader(field_spec)
+                for field_name, field_spec in message_class._schema.field_specs.items()
+            }
+            MessageView._layouts[message_class] = readers
+        return readers
+
+    @staticmethod
+    def iter_buffer(
+        msg_bytes: ByteString, offset: int = 0, message_filter: MessageFilter = None
+    ) -> Iterator["MessageView"]:
+        """
+        Yield a view of every message in a buffer of back to back
+        Sequenced Unit Headers that passes 'message_filter'.
+        """
+        while offset < len(msg_bytes):
+            hdr_length = msg_bytes[offset] | (msg_bytes[offset + 1] << 8)
+            if hdr_length < 8 or offset + hdr_length > len(msg_bytes):
+                raise Exception(f"Invalid Hdr Length {hdr_length} at offset {offset}")
+            end_offset = offset + hdr_length
+            yield from MessageView.iter_unit(
+                msg_bytes, offset, end_offset, message_filter=message_filter
+            )
+            offset = end_offset
+
+    @staticmethod
+    def iter_unit(
+        msg_bytes: ByteString,
+        offset: int,
+        end_offset: int,
+        message_filter: MessageFilter = None,
+    ) -> Iterator["MessageView"]:
+        """
+        Yield a view of every message of the Sequenced Unit Header found at
+        'offset' and ending at 'end_offset' that passes 'message_filter'.
+        """
+        msg_offset = offset + 8
+        while msg_offset < end_offset:
+            next_msg_len = msg_bytes[msg_offset]
+            if next_msg_len == 0:
+                raise Exception(f"Invalid message length 0 at offset {msg_offset}")
+            if message_filter is None or message_filter.accepts(msg_bytes, msg_offset):
+                yield MessageView(msg_bytes, msg_offset)
+            msg_offset += next_msg_len
+
+    def _field(self, field_name: FieldName) -> Any:
+        return self._readers[field_name].read(self._buf, self._offset)
+
+    def message_class(self) -> Type[MessageBase]:
+        return self._message_class
+
+    def offset(self) -> int:
+        return self._offset
+
+    def get_bytes(self) -> bytes:
+        return bytes(self._buf[self._offset : self._offset + self.length()])
+
+    def to_message(self) -> MessageBase:
+        """
+        Fully decode the message this view points at.
+        """
+        return MessageFactory.from_bytes(self.get_bytes())
+
+    def length(self) -> int:
+        return self._buf[self._offset]
+
+    def messageType(self) -> int:
+        return self._buf[self._offset + 1]
+
+    def time(self) -> int:
+        return self._field(FieldName.Time)
+
+    def time_offset(self) -> int:
+        return self._field(FieldName.TimeOffset)
+
+    def order_id(self) -> str:
+        return (
+            self._readers[FieldName.OrderId].read_bytes(self._buf, self._offset).decode()
+        )
+
+    def side(self) -> str:
+        return self._field(FieldName.SideIndicator)
+
+    def quantity(self) -> int:
+        return self._field(FieldName.Quantity)
+
+    def symbol(self) -> str:
+        return self._field(FieldName.Symbol).strip()
+
+    def price(self) -> float:
+        return self._field(FieldName.Price)
+
+    def price_ticks(self) -> int:
+        return self._readers[FieldName.Price].read_int(self._buf, self._offset)
+
+    def displayed(self) -> bool:
+        return self._field(FieldName.AddFlags) == 0x1
+
+    def executed_quantity(self) -> int:
+        return self._field(FieldName.ExecutedQuantity)
+
+    def remaining_quantity(self) -> int:
+        return self._field(FieldName.RemainingQuantity)
+
+    def canceled_quantity(self) -> int:
+        return self._field(FieldName.CanceledQuantity)
+
+    def execution_id(self) -> str:
+        return self._field(FieldName.ExecutionId).strip()
+
+    def participant_id(self) -> str:
+        return self._field(FieldName.ParticipantId)
+
+    def customer_indicator(self) -> str:
+        return self._field(FieldName.CustomerIndicator)
+
+    def __str__(self) -> str:
+        return str(self.to_message())
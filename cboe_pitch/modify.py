@@ -1,48 +1,54 @@
+from typing import OrderedDict
+
 from .pitch24 import MessageBase, FieldName, FieldSpec, FieldType
 
 
 class ModifyBase(MessageBase):
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length] = FieldSpec(
+    __slots__ = ()
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length] = FieldSpec(
             field_name=FieldName.Length, offset=0, length=1, field_type=FieldType.Binary
         )
-        self._field_specs[FieldName.MessageType] = FieldSpec(
+        field_specs[FieldName.MessageType] = FieldSpec(
             field_name=FieldName.MessageType,
             offset=1,
             length=1,
             field_type=FieldType.Value,
         )
-        self._field_specs[FieldName.TimeOffset] = FieldSpec(
+        field_specs[FieldName.TimeOffset] = FieldSpec(
             field_name=FieldName.TimeOffset,
             offset=2,
             length=4,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.OrderId] = FieldSpec(
+        field_specs[FieldName.OrderId] = FieldSpec(
             field_name=FieldName.OrderId,
             offset=6,
             length=8,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.Quantity] = FieldSpec(
+        field_specs[FieldName.Quantity] = FieldSpec(
             field_name=FieldName.Quantity,
             offset=14,
             length=4,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.Price] = FieldSpec(
+        field_specs[FieldName.Price] = FieldSpec(
             field_name=FieldName.Price,
             offset=18,
             length=8,
             field_type=FieldType.BinaryLongPrice,
         )
-        self._field_specs[FieldName.ModifyFlags] = FieldSpec(
+        field_specs[FieldName.ModifyFlags] = FieldSpec(
             field_name=FieldName.ModifyFlags,
             offset=26,
             length=1,
             field_type=FieldType.BitField,
         )
+        return field_specs
 
     def set_fields(
         self,
@@ -52,20 +58,23 @@ class ModifyBase(MessageBase):
         price: float,
         displayed: bool = True,
     ):
-        self._field_specs[FieldName.TimeOffset].value(time_offset)
+        self._set(FieldName.TimeOffset, time_offset)
         self.order_id(order_id)
-        self._field_specs[FieldName.Quantity].value(quantity)
-        self._field_specs[FieldName.Price].value(price)
-        self._field_specs[FieldName.ModifyFlags].value(1 if displayed is True else 0)
+        self._set(FieldName.Quantity, quantity)
+        self.price(price)
+        self._set(FieldName.ModifyFlags, 1 if displayed is True else 0)
 
 
 class ModifyOrderLong(ModifyBase):
     _messageType = 0x27
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(27)
-        self._field_specs[FieldName.MessageType].value(self._messageType)
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(27)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+        return field_specs
 
     @staticmethod
     def from_parms(
@@ -88,16 +97,19 @@ class ModifyOrderLong(ModifyBase):
 
 class ModifyOrderShort(ModifyBase):
     _messageType = 0x28
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(19)
-        self._field_specs[FieldName.MessageType].value(self._messageType)
-        self._field_specs[FieldName.Quantity].length(2)
-        self._field_specs[FieldName.Price].offset(16)
-        self._field_specs[FieldName.Price].length(2)
-        self._field_specs[FieldName.Price].field_type(FieldType.BinaryShortPrice)
-        self._field_specs[FieldName.ModifyFlags].offset(18)
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(19)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+        field_specs[FieldName.Quantity].length(2)
+        field_specs[FieldName.Price].offset(16)
+        field_specs[FieldName.Price].length(2)
+        field_specs[FieldName.Price].field_type(FieldType.BinaryShortPrice)
+        field_specs[FieldName.ModifyFlags].offset(18)
+        return field_specs
 
     @staticmethod
     def from_parms(
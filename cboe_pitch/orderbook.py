@@ -1,5 +1,19 @@
+import bisect
+import itertools
+from array import array
 from enum import Enum
-from typing import List
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
 
 from .util import get_line_ln, get_form_ln
 
@@ -10,12 +24,13 @@ class Side(Enum):
 
 
 class Order:
-    def __init__(self, ticker, side, price, quantity, order_id):
+    def __init__(self, ticker, side, price, quantity, order_id, price_scale=None):
         self._ticker = ticker
         self._side = side
         self._price = price
         self._quantity = quantity
         self._order_id = order_id
+        self._price_scale = price_scale
 
     @property
     def ticker(self):
@@ -25,6 +40,12 @@ class Order:
     def price(self):
         return self._price
 
+    @property
+    def display_price(self):
+        if self._price_scale is None:
+            return self._price
+        return self._price / self._price_scale
+
     @property
     def side(self):
         return self._side
@@ -38,78 +59,586 @@ class Order:
         return self._order_id
 
     def __str__(self):
-        return f"{self._ticker}, [{self._order_id}] {self._price} X {self._quantity}"
+        return f"{self._ticker}, [{self._order_id}] {self.display_price} X {self._quantity}"
+
+
+class TopOfBook(NamedTuple):
+    """
+    Best price of one side of a book, with the total size and number of
+    orders at that price.
+    """
+
+    price: float
+    quantity: int
+    orders: int
+
+
+# callback(ticker, best bid, best offer), either of which may be None
+BboCallback = Callable[[str, Optional[TopOfBook], Optional[TopOfBook]], None]
+
+
+class PriceLevel:
+    """
+    Orders resting at one price on one side of the book, in time priority,
+    along with their total size.
+    """
+
+    __slots__ = ("_price", "_orders", "_quantity")
+
+    def __init__(self, price):
+        self._price = price
+        # dicts keep insertion order, which is the time priority
+        self._orders: Dict[str, Order] = {}
+        self._quantity = 0
+
+    @property
+    def price(self):
+        return self._price
+
+    @property
+    def quantity(self) -> int:
+        return self._quantity
+
+    def orders(self) -> List[Order]:
+        return list(self._orders.values())
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def order_at(self, index: int) -> Order:
+        return next(itertools.islice(self._orders.values(), index, None))
+
+    def append(self, order: Order) -> None:
+        self._orders[order.order_id] = order
+        self._quantity += order.quantity
+
+    def remove(self, order: Order) -> None:
+        del self._orders[order.order_id]
+        self._quantity -= order.quantity
+
+    def resize(self, order: Order, quantity: int) -> None:
+        self._quantity += quantity - order.quantity
+        order._quantity = quantity
+
+
+class BookSide:
+    """
+    One side of the book of a ticker: a PriceLevel per price, with the
+    prices kept sorted with bisect so levels are added and removed without
+    sorting the side again.
+    """
+
+    __slots__ = ("_side", "_prices", "_levels", "_count")
+
+    def __init__(self, side: Side):
+        self._side = side
+        # Ascending, so the best buy is the last price and the best sell the first
+        self._prices = []
+        self._levels: Dict[float, PriceLevel] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, order: Order) -> None:
+        level = self._levels.get(order.price)
+        if level is None:
+            level = self._levels[order.price] = PriceLevel(order.price)
+            bisect.insort(self._prices, order.price)
+        level.append(order)
+        self._count += 1
+
+    def remove(self, order: Order) -> None:
+        level = self._levels[order.price]
+        level.remove(order)
+        if len(level) == 0:
+            del self._levels[order.price]
+            del self._prices[bisect.bisect_left(self._prices, order.price)]
+        self._count -= 1
+
+    def resize(self, order: Order, quantity: int) -> None:
+        self._levels[order.price].resize(order, quantity)
+
+    def level(self, price) -> PriceLevel:
+        return self._levels.get(price)
+
+    def _best_first(self) -> List[float]:
+        if self._side == Side.Buy:
+            return self._prices[::-1]
+        return self._prices
+
+    def levels(self) -> List[PriceLevel]:
+        """
+        Levels from the best price to the worst.
+        """
+        return [self._levels[x] for x in self._best_first()]
+
+    def best(self) -> PriceLevel:
+        if len(self._prices) == 0:
+            return None
+        return self._levels[self._prices[-1 if self._side == Side.Buy else 0]]
+
+    def orders(self) -> List[Order]:
+        """
+        Orders in priority order: best price first, then time.
+        """
+        orders = []
+        for price in self._best_first():
+            orders.extend(self._levels[price].orders())
+        return orders
+
+    def order_at(self, index: int) -> Order:
+        """
+        Order at 'index' in priority order, without listing every order.
+        """
+        for price in self._best_first():
+            level = self._levels[price]
+            if index < len(level):
+                return level.order_at(index)
+            index -= len(level)
+        raise Exception(f"No order at index {index}")
+
+
+class LadderSide:
+    """
+    One side of the book of a ticker whose prices are integer ticks within
+    a known range: a preallocated ladder with one slot per price step.
+
+    The size and order count of every step are kept in arrays, so a level
+    is found with an index computation rather than a search, and the index
+    of the best occupied step is only moved when the best level is
+    emptied or beaten.  Orders are kept in a PriceLevel per occupied step
+    for time priority.
+
+    Prices outside of 'price_range' or off the 'tick_size' grid raise.
+    """
+
+    __slots__ = (
+        "_side",
+        "_buy",
+        "_min_price",
+        "_tick_size",
+        "_levels",
+        "_quantities",
+        "_counts",
+        "_best",
+        "_count",
+    )
+
+    def __init__(self, side: Side, price_range: Tuple[int, int], tick_size: int = 1):
+        min_price, max_price = price_range
+        if max_price < min_price or (max_price - min_price) % tick_size != 0:
+            raise Exception(
+                f"Invalid price range {price_range} for tick size {tick_size}"
+            )
+        steps = (max_price - min_price) // tick_size + 1
+
+        self._side = side
+        self._buy = side == Side.Buy
+        self._min_price = min_price
+        self._tick_size = tick_size
+        self._levels: List[Optional[PriceLevel]] = [None] * steps
+        self._quantities = array("q", bytes(8 * steps))
+        self._counts = array("q", bytes(8 * steps))
+        # Index of the best occupied step, None when the side is empty
+        self._best = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def price_range(self) -> Tuple[int, int]:
+        return (
+            self._min_price,
+            self._min_price + (len(self._levels) - 1) * self._tick_size,
+        )
+
+    def tick_size(self) -> int:
+        return self._tick_size
+
+    def _index(self, price: int) -> int:
+        index, rest = divmod(price - self._min_price, self._tick_size)
+        if rest != 0 or not 0 <= index < len(self._levels):
+            raise Exception(f"Price {price} is not on the ladder")
+        return index
+
+    def add(self, order: Order) -> None:
+        index = self._index(order.price)
+        level = self._levels[index]
+        if level is None:
+            level = self._levels[index] = PriceLevel(order.price)
+        level.append(order)
+        self._quantities[index] += order.quantity
+        self._counts[index] += 1
+        self._count += 1
+
+        best = self._best
+        if best is None or (index > best if self._buy else index < best):
+            self._best = index
+
+    def remove(self, order: Order) -> None:
+        index = self._index(order.price)
+        self._levels[index].remove(order)
+        self._quantities[index] -= order.quantity
+        self._counts[index] -= 1
+        self._count -= 1
+
+        if self._counts[index] == 0:
+            self._levels[index] = None
+            if index == self._best:
+                self._best = self._next_best(index)
+
+    def _next_best(self, index: int) -> Optional[int]:
+        # Walk away from the emptied best step to the next occupied one
+        levels = self._levels
+        if self._buy:
+            for next_index in range(index - 1, -1, -1):
+                if levels[next_index] is not None:
+                    return next_index
+        else:
+            for next_index in range(index + 1, len(levels)):
+                if levels[next_index] is not None:
+                    return next_index
+        return None
+
+    def resize(self, order: Order, quantity: int) -> None:
+        index = self._index(order.price)
+        self._quantities[index] += quantity - order.quantity
+        self._levels[index].resize(order, quantity)
+
+    def level(self, price: int) -> PriceLevel:
+        return self._levels[self._index(price)]
+
+    def _best_first(self) -> List[int]:
+        if self._best is None:
+            return []
+        levels = self._levels
+        if self._buy:
+            indexes = range(self._best, -1, -1)
+        else:
+            indexes = range(self._best, len(levels))
+        return [x for x in indexes if levels[x] is not None]
+
+    def levels(self) -> List[PriceLevel]:
+        """
+        Levels from the best price to the worst.
+        """
+        return [self._levels[x] for x in self._best_first()]
+
+    def best(self) -> PriceLevel:
+        if self._best is None:
+            return None
+        return self._levels[self._best]
+
+    def orders(self) -> List[Order]:
+        """
+        Orders in priority order: best price first, then time.
+        """
+        orders = []
+        for index in self._best_first():
+            orders.extend(self._levels[index].orders())
+        return orders
+
+    def order_at(self, index: int) -> Order:
+        """
+        Order at 'index' in priority order, without listing every order.
+        """
+        for level_index in self._best_first():
+            level = self._levels[level_index]
+            if index < len(level):
+                return level.order_at(index)
+            index -= len(level)
+        raise Exception(f"No order at index {index}")
+
+    def depth(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (prices, sizes, order counts) of every step of the ladder, lowest
+        price first.  Sizes and counts are views of the ladder, not copies.
+        """
+        steps = len(self._levels)
+        prices = self._min_price + np.arange(steps, dtype=np.int64) * self._tick_size
+        return (
+            prices,
+            np.frombuffer(self._quantities, dtype=np.int64),
+            np.frombuffer(self._counts, dtype=np.int64),
+        )
 
 
 class OrderBook:
     """
     Order Book abstraction to track buy and sell orders
     by Ticker/Symbol.
+
+    price_scale
+        When set, prices are integer ticks (i.e. 10_000 ticks per dollar,
+        as on the wire for long prices) and are only turned into dollars
+        for display.  When None, prices are used as given.
+
+    Each side of a ticker is a BookSide of price levels.  Orders are also
+    indexed by Order Id, which is unique across the whole feed, so looking
+    up, changing or removing an order does not have to search the book.
+
+    Orders are owned by the book: change them through modify_order(),
+    reduce_order() and execute_order() so the levels stay in step.
+
+    The best bid and offer of every ticker are kept up to date as orders
+    change, see bbo(), and callbacks registered with subscribe() are called
+    whenever they do change.  Changes away from the top of the book do not
+    cost a look at the best level.
     """
 
-    def __init__(self):
-        self._orderbook = {}
+    def __init__(self, price_scale: int = None):
+        self._orderbook: Dict[str, Dict[Side, Union[BookSide, LadderSide]]] = {}
+        self._orders: Dict[str, Order] = {}
+        self._price_scale = price_scale
+        self._tops: Dict[str, Dict[Side, Optional[TopOfBook]]] = {}
+        self._callbacks: List[BboCallback] = []
+
+    def price_scale(self) -> int:
+        return self._price_scale
 
     def tickers(self) -> List[str]:
         return list(self._orderbook.keys())
 
-    def add_ticker(self, ticker: str) -> None:
+    def add_ticker(
+        self, ticker: str, price_range: Tuple[int, int] = None, tick_size: int = 1
+    ) -> None:
+        """
+        Start tracking a ticker.  With a 'price_range' of integer prices,
+        both sides are a LadderSide over that range instead of a BookSide.
+        """
         if ticker not in self._orderbook:
-            self._orderbook[ticker] = {Side.Buy: [], Side.Sell: []}
+            if price_range is None:
+                self._orderbook[ticker] = {
+                    Side.Buy: BookSide(Side.Buy),
+                    Side.Sell: BookSide(Side.Sell),
+                }
+            else:
+                self._orderbook[ticker] = {
+                    Side.Buy: LadderSide(Side.Buy, price_range, tick_size),
+                    Side.Sell: LadderSide(Side.Sell, price_range, tick_size),
+                }
+            self._tops[ticker] = {Side.Buy: None, Side.Sell: None}
 
     def has_ticker(self, ticker: str) -> bool:
         return ticker in self._orderbook
 
+    def ladder(self, ticker: str) -> Optional[Tuple[Tuple[int, int], int]]:
+        """
+        (price_range, tick_size) given to add_ticker(), None for a ticker
+        whose sides are not a LadderSide.
+        """
+        book_side = self._orderbook[ticker][Side.Buy]
+        if isinstance(book_side, LadderSide):
+            return book_side.price_range(), book_side.tick_size()
+        return None
+
     def add_order(
         self, ticker: str, side: Side, price: float, quantity: int, order_id: str
     ):
-        order_list = self._orderbook[ticker][side]
+        book_side = self._orderbook[ticker][side]
         # Check if order already exists
-        if self.has_order_id(ticker=ticker, side=side, order_id=order_id):
+        if order_id in self._orders:
             raise Exception(
                 f"Order with ID {order_id} for {ticker}-{side} already exists"
             )
 
         # Add Order
-        order_list.append(
-            Order(
-                ticker=ticker,
-                side=side,
-                price=price,
-                quantity=quantity,
-                order_id=order_id,
-            )
+        order = Order(
+            ticker=ticker,
+            side=side,
+            price=price,
+            quantity=quantity,
+            order_id=order_id,
+            price_scale=self._price_scale,
         )
-        # Sort Orders
-        self._sort_orders(ticker=ticker, side=side)
+        book_side.add(order)
+        self._orders[order_id] = order
+        self._update_top(ticker, side, price)
+
+    def add_orders(
+        self, ticker: str, side: Side, orders: Iterable[Tuple[str, float, int]]
+    ) -> None:
+        """
+        Bulk variant of add_order() for (order_id, price, quantity) given in
+        priority order, i.e. from get_orders().  The top of the side is only
+        refreshed, and subscribers told, once at the end.
+        """
+        book_side = self._orderbook[ticker][side]
+        book_orders = self._orders
+        price_scale = self._price_scale
+        for order_id, price, quantity in orders:
+            if order_id in book_orders:
+                raise Exception(
+                    f"Order with ID {order_id} for {ticker}-{side} already exists"
+                )
+            order = Order(ticker, side, price, quantity, order_id, price_scale)
+            book_side.add(order)
+            book_orders[order_id] = order
+        self._update_top(ticker, side, None)
+
+    def get_order(self, order_id: str) -> Order:
+        """
+        Order with this Order Id, None when it is not in the book.
+        """
+        return self._orders.get(order_id)
 
     def has_order_id(self, ticker: str, side: Side, order_id: str) -> bool:
-        order_list = self._orderbook[ticker][side]
-        for order in order_list:
-            if order.order_id == order_id:
-                return True
-        return False
+        order = self._orders.get(order_id)
+        return order is not None and order.ticker == ticker and order.side == side
 
     def delete_order(self, ticker: str, side: Side, order_id: str):
-        for order in self._orderbook[ticker][side]:
-            if order.order_id == order_id:
-                self._orderbook[ticker][side].remove(order)
-                break
+        if self.has_order_id(ticker=ticker, side=side, order_id=order_id):
+            self._remove_order(self._orders[order_id])
+
+    def _remove_order(self, order: Order) -> None:
+        del self._orders[order.order_id]
+        self._orderbook[order.ticker][order.side].remove(order)
+        self._update_top(order.ticker, order.side, order.price)
+
+    def _lookup(self, order_id: str) -> Order:
+        order = self._orders.get(order_id)
+        if order is None:
+            raise Exception(f"Order with ID {order_id} does not exist")
+        return order
+
+    def modify_order(self, order_id: str, price: float, quantity: int) -> Order:
+        """
+        Change the price and size of an order.  As on the exchange, the
+        order keeps its place in the queue only when the price is unchanged
+        and the size does not go up.  A size of 0 takes the order off the
+        book.
+        """
+        order = self._lookup(order_id)
+        if quantity == 0:
+            self._decrease(order, order.quantity)
+            return order
+        book_side = self._orderbook[order.ticker][order.side]
+        if price == order.price and quantity <= order.quantity:
+            book_side.resize(order, quantity)
+            self._update_top(order.ticker, order.side, price)
+        else:
+            book_side.remove(order)
+            order._price = price
+            order._quantity = quantity
+            book_side.add(order)
+            # Both the old and new price may be at the top, look at it once
+            self._update_top(order.ticker, order.side, None)
+        return order
+
+    def reduce_order(self, order_id: str, canceled_quantity: int) -> int:
+        """
+        Cancel part of an order, removing it once nothing is left.
+
+        Returns the remaining quantity.
+        """
+        return self._decrease(self._lookup(order_id), canceled_quantity)
+
+    def execute_order(self, order_id: str, executed_quantity: int) -> int:
+        """
+        Fill part or all of an order, removing it once nothing is left.
+
+        Returns the remaining quantity.
+        """
+        return self._decrease(self._lookup(order_id), executed_quantity)
+
+    def _decrease(self, order: Order, quantity: int) -> int:
+        if quantity > order.quantity:
+            raise Exception(
+                f"Order with ID {order.order_id} has {order.quantity} left, "
+                f"not {quantity}"
+            )
+        if quantity == order.quantity:
+            self._remove_order(order)
+            order._quantity = 0
+        else:
+            book_side = self._orderbook[order.ticker][order.side]
+            book_side.resize(order, order.quantity - quantity)
+            self._update_top(order.ticker, order.side, order.price)
+        return order.quantity
+
+    #
+    # Top of book
+    #
+    def _update_top(self, ticker: str, side: Side, price) -> None:
+        """
+        Refresh the cached top of one side after a change at 'price'
+        (None when the change may be anywhere), and tell subscribers when
+        it moved.
+        """
+        top = self._tops[ticker][side]
+        if price is not None and top is not None and price != top.price:
+            # Only a new level better than the top can change it
+            if (price < top.price) if side == Side.Buy else (price > top.price):
+                return
+
+        level = self._orderbook[ticker][side].best()
+        new_top = None
+        if level is not None:
+            new_top = TopOfBook(
+                price=level.price, quantity=level.quantity, orders=len(level)
+            )
+        if new_top == top:
+            return
+
+        self._tops[ticker][side] = new_top
+        if self._callbacks:
+            tops = self._tops[ticker]
+            for callback in self._callbacks:
+                callback(ticker, tops[Side.Buy], tops[Side.Sell])
+
+    def bbo(self, ticker: str) -> Tuple[Optional[TopOfBook], Optional[TopOfBook]]:
+        """
+        (best bid, best offer) of a ticker, None for an empty side.
+        """
+        tops = self._tops[ticker]
+        return tops[Side.Buy], tops[Side.Sell]
 
-    def _sort_orders(self, ticker: str, side: Side) -> None:
-        if side == Side.Buy:
-            self._orderbook[ticker][Side.Buy].sort(key=lambda x: x.price, reverse=True)
-        elif side == Side.Sell:
-            self._orderbook[ticker][Side.Sell].sort(key=lambda x: x.price)
+    def best_bid(self, ticker: str) -> Optional[TopOfBook]:
+        return self._tops[ticker][Side.Buy]
+
+    def best_offer(self, ticker: str) -> Optional[TopOfBook]:
+        return self._tops[ticker][Side.Sell]
+
+    def subscribe(self, callback: BboCallback) -> None:
+        """
+        Call 'callback(ticker, best bid, best offer)' every time the best
+        bid or offer of a ticker changes in price, size or order count.
+        """
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: BboCallback) -> None:
+        self._callbacks.remove(callback)
 
     def get_orders(self, ticker: str, side: Side) -> List[Order]:
-        # Sort Orders
-        self._sort_orders(ticker=ticker, side=Side.Buy)
-        # Return Orders
-        return self._orderbook[ticker][side]
+        """
+        Orders of one side in priority order: best price first, then time.
+        """
+        return self._orderbook[ticker][side].orders()
+
+    def get_levels(self, ticker: str, side: Side) -> List[PriceLevel]:
+        """
+        Price levels of one side, best price first.
+        """
+        return self._orderbook[ticker][side].levels()
+
+    def best_level(self, ticker: str, side: Side) -> PriceLevel:
+        """
+        Best price level of one side, None when the side is empty.
+        """
+        return self._orderbook[ticker][side].best()
+
+    def order_count(self, ticker: str, side: Side) -> int:
+        return len(self._orderbook[ticker][side])
+
+    def get_order_at(self, ticker: str, side: Side, index: int) -> Order:
+        """
+        Order at 'index' of get_orders(), without building the list.
+        """
+        return self._orderbook[ticker][side].order_at(index)
 
     def print_order_book(self, ticker: str):
-        print(get_order_book(ticker))
+        print(self.get_order_book(ticker))
 
     def get_order_book(self, ticker: str) -> str:
         ss = ""
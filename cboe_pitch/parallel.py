@@ -0,0 +1,177 @@
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Type
+
+import numpy as np
+
+from .columnar import ColumnarDecoder
+from .file_parser import FileParser
+from .pitch24 import MessageBase
+
+
+class ParseStatistics:
+    """
+    Summary of a parsed capture that can be merged across chunks.
+    """
+
+    def __init__(self):
+        self.units = 0
+        self.messages = 0
+        self.msg_counts: Counter = Counter()
+        self.first_sequence = None
+        self.next_sequence = None
+
+    @staticmethod
+    def from_arrays(
+        units: int, messages: Dict[Type[MessageBase], np.ndarray]
+    ) -> "ParseStatistics":
+        stats = ParseStatistics()
+        stats.units = units
+        for message_class, msg_array in messages.items():
+            if len(msg_array) == 0:
+                continue
+            stats.messages += len(msg_array)
+            stats.msg_counts[message_class.__name__] += len(msg_array)
+
+            sequences = msg_array["hdr_sequence"].astype(np.int64) + msg_array["msg_index"]
+            first_sequence = int(sequences.min())
+            next_sequence = int(sequences.max()) + 1
+            if stats.first_sequence is None or first_sequence < stats.first_sequence:
+                stats.first_sequence = first_sequence
+            if stats.next_sequence is None or next_sequence > stats.next_sequence:
+                stats.next_sequence = next_sequence
+        return stats
+
+    def merge(self, other: "ParseStatistics") -> "ParseStatistics":
+        self.units += other.units
+        self.messages += other.messages
+        self.msg_counts.update(other.msg_counts)
+        if other.first_sequence is not None:
+            if self.first_sequence is None or other.first_sequence < self.first_sequence:
+                self.first_sequence = other.first_sequence
+            if self.next_sequence is None or other.next_sequence > self.next_sequence:
+                self.next_sequence = other.next_sequence
+        return self
+
+    def __str__(self) -> str:
+        return (
+            f"(ParseStatistics, Units={self.units}, Messages={self.messages}, "
+            + f"Sequence=[{self.first_sequence}, {self.next_sequence}))"
+        )
+
+
+def _decode_chunk(
+    file_path: str, start: int, end: int
+) -> Tuple[int, Dict[Type[MessageBase], np.ndarray]]:
+    with FileParser.map_file(file_path) as in_bytes:
+        # ColumnarDecoder lets go of the chunk even on a parse error, so it
+        # can always be released here and the file closed
+        with memoryview(in_bytes)[start:end] as chunk:
+            messages = ColumnarDecoder.from_buffer(chunk)
+            units = len(ParallelParser.unit_offsets(chunk))
+    return units, messages
+
+
+def _chunk_statistics(file_path: str, start: int, end: int) -> ParseStatistics:
+    return ParseStatistics.from_arrays(*_decode_chunk(file_path, start, end))
+
+
+class ParallelParser:
+    """
+    Parses a capture on several processes.
+
+    The file is scanned once for Sequenced Unit Header boundaries using
+    Hdr Length, split into chunks of roughly equal size on those
+    boundaries, and each chunk is decoded by ColumnarDecoder in a
+    ProcessPoolExecutor.  Results are combined in sequence order.
+    """
+
+    @staticmethod
+    def unit_offsets(msg_bytes) -> List[int]:
+        offsets = []
+        offset = 0
+        while offset < len(msg_bytes):
+            hdr_length = msg_bytes[offset] | (msg_bytes[offset + 1] << 8)
+            if hdr_length < 8 or offset + hdr_length > len(msg_bytes):
+                raise Exception(f"Invalid Hdr Length {hdr_length} at offset {offset}")
+            offsets.append(offset)
+            offset += hdr_length
+        return offsets
+
+    @staticmethod
+    def split(file_path: str, num_chunks: int) -> List[Tuple[int, int]]:
+        """
+        Split a file into at most 'num_chunks' (start, end) byte ranges of
+        roughly equal size, each starting on a unit boundary.
+        """
+        with FileParser.map_file(file_path) as in_bytes:
+            file_size = len(in_bytes)
+            unit_offsets = ParallelParser.unit_offsets(in_bytes)
+        if file_size == 0:
+            return []
+
+        chunk_size = max(1, file_size // max(1, num_chunks))
+        chunks = []
+        start = 0
+        for offset in unit_offsets[1:]:
+            if offset - start >= chunk_size and len(chunks) < num_chunks - 1:
+                chunks.append((start, offset))
+                start = offset
+        chunks.append((start, file_size))
+        return chunks
+
+    @staticmethod
+    def parse_columnar(
+        file_path: str, max_workers: int = None
+    ) -> Dict[Type[MessageBase], np.ndarray]:
+        """
+        Decode a file into one structured array per message class, the same
+        as ColumnarDecoder.from_file, using 'max_workers' processes.
+        """
+        max_workers = max_workers or os.cpu_count()
+        chunks = ParallelParser.split(file_path, max_workers)
+        if len(chunks) == 0:
+            return {}
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    _decode_chunk,
+                    [str(file_path)] * len(chunks),
+                    [x[0] for x in chunks],
+                    [x[1] for x in chunks],
+                )
+            )
+
+        # Chunks come back in file order, so concatenating keeps sequence order
+        parts: Dict[Type[MessageBase], List[np.ndarray]] = {}
+        for _, messages in results:
+            for message_class, msg_array in messages.items():
+                parts.setdefault(message_class, []).append(msg_array)
+        return {
+            message_class: np.concatenate(msg_arrays)
+            for message_class, msg_arrays in parts.items()
+        }
+
+    @staticmethod
+    def parse_statistics(file_path: str, max_workers: int = None) -> ParseStatistics:
+        """
+        Decode a file using 'max_workers' processes, only returning the
+        merged statistics so that no per message data crosses processes.
+        """
+        max_workers = max_workers or os.cpu_count()
+        chunks = ParallelParser.split(file_path, max_workers)
+
+        stats = ParseStatistics()
+        if len(chunks) == 0:
+            return stats
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for chunk_stats in executor.map(
+                _chunk_statistics,
+                [str(file_path)] * len(chunks),
+                [x[0] for x in chunks],
+                [x[1] for x in chunks],
+            ):
+                stats.merge(chunk_stats)
+        return stats
@@ -2,7 +2,10 @@ import argparse
 import logging
 from typing import Any
 
+from .book_builder import BookBuilder
 from .file_parser import FileParser
+from .parallel import ParallelParser
+from .pcap import PcapReader
 from .util import get_line, get_form
 
 sep_len = 89
@@ -28,6 +31,20 @@ def parse_args() -> Any:
         type=str,
         help="Config File",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default=1,
+        action="store",
+        type=int,
+        help="Number of processes, more than 1 only prints statistics",
+    )
+    parser.add_argument(
+        "--books",
+        default=False,
+        action="store_true",
+        help="Only print the order book of every symbol at the end of the file",
+    )
     return parser.parse_args()
 
 
@@ -61,9 +78,36 @@ def main():
     logger.warn(get_line("-", "+"))
     logger.warn(get_line(" ", "|"))
 
-    seq_array = FileParser.parse_file(file_path=args.binary_file)
-    for seq_idx, seq in enumerate(seq_array):
+    if args.jobs > 1:
+        stats = ParallelParser.parse_statistics(
+            file_path=args.binary_file, max_workers=args.jobs
+        )
+        logger.warn(get_form(f"{stats}"))
+        for msg_name, msg_count in sorted(stats.msg_counts.items()):
+            logger.warn(get_form(f"    - {msg_name}: {msg_count}"))
+        logger.warn(get_line("-", "+"))
+        return
+
+    if args.binary_file.endswith(".pcap"):
+        seq_units = PcapReader.iter_units(file_path=args.binary_file)
+    else:
+        seq_units = ((None, x) for x in FileParser.iter_units(file_path=args.binary_file))
+
+    if args.books:
+        if args.binary_file.endswith(".pcap"):
+            book_builder = BookBuilder()
+            for _, seq in seq_units:
+                book_builder.apply_unit(seq)
+        else:
+            book_builder = BookBuilder.from_file(file_path=args.binary_file)
+        for ticker in book_builder.orderbook().tickers():
+            logger.warn(book_builder.orderbook().get_order_book(ticker))
+        return
+
+    for seq_idx, (timestamp, seq) in enumerate(seq_units):
         logger.warn(get_line("-", "+"))
+        if timestamp is not None:
+            logger.warn(get_form(f"[{seq_idx}] Captured: {timestamp:,} ns"))
         logger.warn(get_form(f"[{seq_idx}] SeqUnitHdr: {seq}"))
         for msg_idx, msg in enumerate(seq.getMessages()):
             logger.warn(get_form(f"    - [{msg_idx}] {msg}"))
@@ -0,0 +1,324 @@
+import ipaddress
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import ByteString, Iterable, Iterator, Tuple
+
+from .message_filter import MessageFilter
+from .seq_unit_header import SequencedUnitHeader
+
+
+class PcapReader:
+    """
+    Streaming reader for classic libpcap captures of PITCH over UDP.
+
+    The file is memory-mapped and Ethernet (with optional VLAN tags), IPv4
+    and UDP headers are skipped by offset, so UDP payloads are returned as
+    memoryviews into the capture without being copied.  Those views keep
+    the mapping alive for as long as they are referenced.
+
+    Timestamps are integer nanoseconds since the epoch, for both microsecond
+    and nanosecond resolution captures.  Packets that are not IPv4/UDP,
+    IP fragments and truncated packets are skipped.
+    """
+
+    # Magic number as read little-endian: (byte order, nanoseconds per tick)
+    _magics = {
+        0xA1B2C3D4: ("<", 1_000),
+        0xA1B23C4D: ("<", 1),
+        0xD4C3B2A1: (">", 1_000),
+        0x4D3CB2A1: (">", 1),
+    }
+
+    LINKTYPE_ETHERNET = 1
+    LINKTYPE_RAW = 101
+    LINKTYPE_IPV4 = 228
+
+    ETHERTYPE_IPV4 = 0x0800
+    ETHERTYPE_VLAN = (0x8100, 0x88A8)
+    IPPROTO_UDP = 17
+
+    @staticmethod
+    def iter_frames(file_path: str) -> Iterator[Tuple[int, int, memoryview]]:
+        """
+        Yield (timestamp, link type, frame) for every packet in a capture.
+        """
+        f_in = Path(file_path)
+        if f_in.exists() is False:
+            raise Exception(f"File {file_path} does not exist")
+        if f_in.stat().st_size == 0:
+            return
+
+        # The mapping is not closed explicitly: the frames handed out point
+        # into it, and it is unmapped once the last of them is released.
+        with open(f_in, "rb") as f_bin:
+            in_bytes = mmap.mmap(f_bin.fileno(), 0, access=mmap.ACCESS_READ)
+        yield from PcapReader.iter_buffer_frames(memoryview(in_bytes))
+
+    @staticmethod
+    def iter_buffer_frames(buf: memoryview) -> Iterator[Tuple[int, int, memoryview]]:
+        if len(buf) < 24:
+            raise Exception(f"Invalid pcap file, only {len(buf)} bytes")
+        magic = struct.unpack_from("<I", buf, 0)[0]
+        if magic not in PcapReader._magics:
+            raise Exception(f"Invalid pcap magic number 0x{magic:08x}")
+        byte_order, ns_per_tick = PcapReader._magics[magic]
+        link_type = struct.unpack_from(f"{byte_order}I", buf, 20)[0] & 0x0FFF_FFFF
+
+        record_header = struct.Struct(f"{byte_order}IIII")
+        offset = 24
+        while offset + record_header.size <= len(buf):
+            ts_sec, ts_frac, incl_len, _ = record_header.unpack_from(buf, offset)
+            offset += record_header.size
+            if offset + incl_len > len(buf):
+                raise Exception(f"Truncated pcap record at offset {offset}")
+            timestamp = ts_sec * 1_000_000_000 + ts_frac * ns_per_tick
+            yield timestamp, link_type, buf[offset : offset + incl_len]
+            offset += incl_len
+
+    @staticmethod
+    def udp_payload(link_type: int, frame: memoryview, udp_port: int = None):
+        """
+        Return the UDP payload of a frame, or None when the frame is not an
+        unfragmented IPv4/UDP packet (to 'udp_port', when given).
+        """
+        offset = 0
+        if link_type == PcapReader.LINKTYPE_ETHERNET:
+            if len(frame) < 14:
+                return None
+            ether_type = (frame[12] << 8) | frame[13]
+            offset = 14
+            while ether_type in PcapReader.ETHERTYPE_VLAN and offset + 4 <= len(frame):
+                ether_type = (frame[offset + 2] << 8) | frame[offset + 3]
+                offset += 4
+            if ether_type != PcapReader.ETHERTYPE_IPV4:
+                return None
+        elif link_type not in (PcapReader.LINKTYPE_RAW, PcapReader.LINKTYPE_IPV4):
+            raise Exception(f"Unsupported pcap link type {link_type}")
+
+        # IPv4
+        if offset + 20 > len(frame) or (frame[offset] >> 4) != 4:
+            return None
+        ihl = (frame[offset] & 0x0F) * 4
+        if frame[offset + 9] != PcapReader.IPPROTO_UDP:
+            return None
+        # More Fragments flag or a fragment offset
+        if ((frame[offset + 6] << 8) | frame[offset + 7]) & 0x3FFF:
+            return None
+        offset += ihl
+
+        # UDP
+        if offset + 8 > len(frame):
+            return None
+        if udp_port is not None and ((frame[offset + 2] << 8) | frame[offset + 3]) != udp_port:
+            return None
+        udp_length = (frame[offset + 4] << 8) | frame[offset + 5]
+        if udp_length < 8 or offset + udp_length > len(frame):
+            return None
+        return frame[offset + 8 : offset + udp_length]
+
+    @staticmethod
+    def iter_payloads(
+        file_path: str, udp_port: int = None
+    ) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Yield (capture timestamp, UDP payload) for every UDP datagram of a
+        capture, optionally only those sent to 'udp_port'.
+        """
+        for timestamp, link_type, frame in PcapReader.iter_frames(file_path):
+            payload = PcapReader.udp_payload(link_type, frame, udp_port)
+            if payload is not None:
+                yield timestamp, payload
+
+    @staticmethod
+    def iter_units(
+        file_path: str, udp_port: int = None, message_filter: MessageFilter = None
+    ) -> Iterator[Tuple[int, SequencedUnitHeader]]:
+        """
+        Yield (capture timestamp, Sequenced Unit Header) for every unit
+        carried in the UDP payloads of a capture.
+        """
+        if message_filter is not None:
+            message_filter.reset()
+        for timestamp, payload in PcapReader.iter_payloads(file_path, udp_port):
+            offset = 0
+            while offset < len(payload):
+                [seq_unit_hdr, offset] = SequencedUnitHeader.from_buffer(
+                    msg_bytes=payload, offset=offset, message_filter=message_filter
+                )
+                yield timestamp, seq_unit_hdr
+
+
+def _ones_complement_sum(data: ByteString) -> int:
+    """
+    16 bit one's complement sum of 'data' as big-endian words, folded.
+    """
+    if len(data) % 2 == 1:
+        data = bytes(data) + b"\x00"
+    total = sum(memoryview(data).cast("B").cast("H"))
+    while total > 0xFFFF:
+        total = (total & 0xFFFF) + (total >> 16)
+    if sys.byteorder == "little":
+        total = ((total & 0xFF) << 8) | (total >> 8)
+    return total
+
+
+def _fold(total: int) -> int:
+    while total > 0xFFFF:
+        total = (total & 0xFFFF) + (total >> 16)
+    return total
+
+
+class PcapWriter:
+    """
+    Writes Sequenced Unit Headers to a libpcap capture, one unit per
+    Ethernet/IPv4/UDP frame, as they would appear on a multicast feed.
+
+    src_mac, dst_mac
+        Ethernet addresses as 'aa:bb:cc:dd:ee:ff'.  When 'dst_ip' is a
+        multicast group, the destination address is derived from the group
+        (01:00:5e + low 23 bits) and 'dst_mac' is ignored.
+
+    src_ip, dst_ip, src_port, dst_port, ttl
+        IPv4/UDP addressing.  IPv4 and UDP checksums are always filled in.
+
+    nanosecond
+        Write a nanosecond resolution capture (the default), otherwise
+        timestamps are truncated to microseconds.
+
+    batch_size
+        Frames are collected in memory and written to the file once this
+        many bytes are pending, so the file sees few large writes.
+    """
+
+    MAX_UDP_PAYLOAD = 65_507
+
+    _record_header = struct.Struct("<IIII")
+    _ip_udp_header = struct.Struct("!BBHHHBBH4s4sHHHH")
+
+    def __init__(
+        self,
+        file_path: str,
+        src_mac: str = "00:15:5d:30:c1:9f",
+        dst_mac: str = "00:0a:35:18:3c:1f",
+        src_ip: str = "172.21.216.20",
+        dst_ip: str = "239.1.1.1",
+        src_port: int = 53,
+        dst_port: int = 8000,
+        ttl: int = 64,
+        nanosecond: bool = True,
+        batch_size: int = 4 * 1024 * 1024,
+    ):
+        src_addr = ipaddress.IPv4Address(src_ip)
+        dst_addr = ipaddress.IPv4Address(dst_ip)
+        if dst_addr.is_multicast:
+            dst_mac_bytes = b"\x01\x00\x5e" + (int(dst_addr) & 0x7F_FFFF).to_bytes(3, "big")
+        else:
+            dst_mac_bytes = PcapWriter.mac_bytes(dst_mac)
+        self._ether_header = dst_mac_bytes + PcapWriter.mac_bytes(src_mac) + b"\x08\x00"
+
+        self._src_ip = src_addr.packed
+        self._dst_ip = dst_addr.packed
+        self._src_port = src_port
+        self._dst_port = dst_port
+        self._ttl = ttl
+        self._ip_id = 0
+
+        # Checksum contributions of the header words that never change
+        self._ip_sum = _ones_complement_sum(
+            bytes([0x45, 0, 0, 0, 0, 0, 0, 0, ttl, 17, 0, 0]) + self._src_ip + self._dst_ip
+        )
+        self._udp_sum = _ones_complement_sum(
+            self._src_ip + self._dst_ip + struct.pack("!HHH", 17, src_port, dst_port)
+        )
+
+        self._nanosecond = nanosecond
+        self._batch_size = batch_size
+        self._buffer = bytearray()
+        self._f_out = open(file_path, "wb")
+        self._f_out.write(
+            struct.pack(
+                "<IHHiIII", 0xA1B23C4D if nanosecond else 0xA1B2C3D4, 2, 4, 0, 0, 65_535, 1
+            )
+        )
+
+    @staticmethod
+    def mac_bytes(mac: str) -> bytes:
+        mac_bytes = bytes.fromhex(mac.replace(":", "").replace("-", ""))
+        if len(mac_bytes) != 6:
+            raise Exception(f"Invalid MAC address {mac}")
+        return mac_bytes
+
+    def write_unit(self, payload: ByteString, timestamp: int) -> None:
+        """
+        Append one UDP datagram carrying 'payload' (i.e. the bytes of a
+        Sequenced Unit Header), captured at 'timestamp' nanoseconds since
+        the epoch.
+        """
+        payload_len = len(payload)
+        if payload_len > PcapWriter.MAX_UDP_PAYLOAD:
+            raise Exception(f"Payload of {payload_len} bytes does not fit in a datagram")
+
+        ip_length = 28 + payload_len
+        udp_length = 8 + payload_len
+        ip_id = self._ip_id
+        self._ip_id = (ip_id + 1) & 0xFFFF
+
+        ip_checksum = ~_fold(self._ip_sum + ip_length + ip_id) & 0xFFFF
+        udp_checksum = ~_fold(
+            self._udp_sum + 2 * udp_length + _ones_complement_sum(payload)
+        ) & 0xFFFF
+        if udp_checksum == 0:
+            udp_checksum = 0xFFFF
+
+        ts_sec, ts_frac = divmod(timestamp, 1_000_000_000)
+        if self._nanosecond is False:
+            ts_frac //= 1_000
+        frame_len = 14 + ip_length
+
+        buffer = self._buffer
+        buffer += PcapWriter._record_header.pack(ts_sec, ts_frac, frame_len, frame_len)
+        buffer += self._ether_header
+        buffer += PcapWriter._ip_udp_header.pack(
+            0x45,
+            0,
+            ip_length,
+            ip_id,
+            0,
+            self._ttl,
+            17,
+            ip_checksum,
+            self._src_ip,
+            self._dst_ip,
+            self._src_port,
+            self._dst_port,
+            udp_length,
+            udp_checksum,
+        )
+        buffer += payload
+        if len(buffer) >= self._batch_size:
+            self.flush()
+
+    def write_units(self, units: Iterable[Tuple[int, ByteString]]) -> None:
+        """
+        Append a datagram for every (timestamp, payload) pair.
+        """
+        for timestamp, payload in units:
+            self.write_unit(payload, timestamp)
+
+    def flush(self) -> None:
+        if len(self._buffer) > 0:
+            self._f_out.write(self._buffer)
+            self._buffer = bytearray()
+
+    def close(self) -> None:
+        if self._f_out.closed is False:
+            self.flush()
+            self._f_out.close()
+
+    def __enter__(self) -> "PcapWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
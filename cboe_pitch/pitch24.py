@@ -1,5 +1,6 @@
 import collections
 import logging
+import struct
 import time
 from datetime import datetime
 from enum import Enum
@@ -92,11 +93,10 @@ class FieldSpec:
                 print(f"Type is time")
             # print(f'Value is: {self._value} - Type is: {type(self._value)} ')
             return self._value.to_bytes(self._length, byteorder="little")
-        elif self._field_type == FieldType.BinaryLongPrice:
-            tmp_val = int(self._value * 10_000)
-            return tmp_val.to_bytes(self._length, byteorder="little")
-        elif self._field_type == FieldType.BinaryShortPrice:
-            tmp_val = int(self._value * 100)
+        elif self._field_type in FieldConverter.price_scales:
+            tmp_val = FieldConverter.price_to_ticks(
+                self._value, FieldConverter.price_scales[self._field_type]
+            )
             return tmp_val.to_bytes(self._length, byteorder="little")
         elif self._field_type == FieldType.BitField:
             return self._value.to_bytes(self._length, byteorder="little")
@@ -107,38 +107,19 @@ class FieldSpec:
             return self._value.to_bytes(self._length, byteorder="little")
         return bytearray([])
 
-    def fill_value(self, msg_bytes: ByteString) -> None:
-        start_idx = self.offset()
-        length = self.length()
-        if self._field_type == FieldType.Alphanumeric:
-            value = msg_bytes[start_idx : start_idx + length].decode()
-            # print(f'Alphanumeric - value: {value}')
-            self.value(value)
-        elif self._field_type == FieldType.Binary:
-            subset = msg_bytes[self.offset() : self.offset() + self.length()]
-            value = int.from_bytes(subset, "little")
-            self.value(value)
-            # print(f"value: {value} ({hex(value)})")
-        elif self._field_type == FieldType.BinaryLongPrice:
-            subset = msg_bytes[self.offset() : self.offset() + self.length()]
-            value = int.from_bytes(subset, "little")
-            value = value / 10_000
-            self.value(value)
-        elif self._field_type == FieldType.BinaryShortPrice:
-            subset = msg_bytes[self.offset() : self.offset() + self.length()]
-            value = int.from_bytes(subset, "little")
-            value = value / 100
-            self.value(value)
-        elif self._field_type == FieldType.BitField:
-            subset = msg_bytes[self.offset() : self.offset() + 1]
-            self.value(subset[0])
-        elif self._field_type == FieldType.PrintableAscii:
-            value = msg_bytes[start_idx : start_idx + length].decode()
-            self.value(value)
-        elif self._field_type == FieldType.Value:
-            raise Exception("Not Implemented")
-
 class FieldConverter:
+    # Number of ticks per dollar of each price type
+    price_scales = {FieldType.BinaryLongPrice: 10_000, FieldType.BinaryShortPrice: 100}
+
+    @staticmethod
+    def price_to_ticks(price: float, scale: int) -> int:
+        # round() rather than int(), int(0.29 * 100) is 28
+        return round(price * scale)
+
+    @staticmethod
+    def ticks_to_price(ticks: int, scale: int) -> float:
+        return ticks / scale
+
     @staticmethod
     def orderid_to_u64(order_id: str) -> int:
         return int.from_bytes(order_id.encode(), 'little')
@@ -157,28 +138,241 @@ class FieldConverter:
     def u64_to_symbol(symbol_u64: int) -> str:
         return symbol_u64.to_bytes(8, "big").decode("utf-8").strip()
 
+class MessageCodec:
+    """
+    Precompiled struct layout for a message class.
+
+    Built once from the field table of a message class, so that a whole
+    message is decoded with a single unpack_from and encoded with a
+    single pack instead of converting one FieldSpec at a time.
+
+    Prices are left as the integer number of ticks found on the wire.
+    """
+
+    _binary_formats = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+    def __init__(self, field_specs: OrderedDict[FieldName, FieldSpec]):
+        ordered_field_specs = sorted(field_specs.values(), key=lambda x: x.offset())
+
+        fmt = "<"
+        next_offset = 0
+        decoders = []
+        encoders = []
+        binary_encoders = []
+        for idx, field_spec in enumerate(ordered_field_specs):
+            if field_spec.offset() < next_offset:
+                raise Exception(f"Overlapping field {field_spec._name}")
+            if field_spec.offset() > next_offset:
+                fmt += f"{field_spec.offset() - next_offset}x"
+            fmt += MessageCodec._field_format(field_spec)
+            next_offset = field_spec.offset() + field_spec.length()
+
+            field_type = field_spec.field_type()
+            if field_type in (FieldType.Alphanumeric, FieldType.PrintableAscii):
+                decoders.append((idx, bytes.decode))
+                encoders.append(
+                    (idx, MessageCodec._ascii_encoder(field_spec.length()))
+                )
+            elif field_type == FieldType.Binary:
+                binary_encoders.append((idx, MessageCodec._binary_encoder))
+
+        self._struct = struct.Struct(fmt)
+        self._names = tuple(x._name for x in ordered_field_specs)
+        self._decoders = tuple(decoders)
+        # Binary fields only need converting when given as a str, which is
+        # rare, so they are only converted when packing fails.
+        self._encoders = tuple(encoders)
+        self._binary_encoders = tuple(binary_encoders)
+
+    @staticmethod
+    def _field_format(field_spec: FieldSpec) -> str:
+        field_type = field_spec.field_type()
+        length = field_spec.length()
+        if field_type in (FieldType.Alphanumeric, FieldType.PrintableAscii):
+            return f"{length}s"
+        if length not in MessageCodec._binary_formats:
+            raise Exception(f"Unsupported length {length} for {field_spec._name}")
+        return MessageCodec._binary_formats[length]
+
+    @staticmethod
+    def _ascii_encoder(length: int):
+        return lambda x: x.ljust(length).encode()
+
+    @staticmethod
+    def _binary_encoder(value: Any) -> int:
+        if type(value) is str:
+            return int.from_bytes(value.encode(), "little")
+        return value
+
+    @property
+    def size(self) -> int:
+        return self._struct.size
+
+    @property
+    def names(self):
+        return self._names
+
+    def decode(self, msg_bytes: ByteString, offset: int = 0) -> list:
+        values = list(self._struct.unpack_from(msg_bytes, offset))
+        for idx, decoder in self._decoders:
+            values[idx] = decoder(values[idx])
+        return values
+
+    def _encode_values(self, values: list, binary: bool = False) -> list:
+        values = list(values)
+        for idx, encoder in self._encoders:
+            values[idx] = encoder(values[idx])
+        if binary:
+            for idx, encoder in self._binary_encoders:
+                values[idx] = encoder(values[idx])
+        return values
+
+    def encode(self, values: list) -> bytes:
+        try:
+            return self._struct.pack(*self._encode_values(values))
+        except struct.error:
+            return self._struct.pack(*self._encode_values(values, binary=True))
+
+    def encode_into(self, buf: bytearray, offset: int, values: list) -> int:
+        """
+        Pack 'values' straight into 'buf' at 'offset'.
+
+        Returns the offset just past the message.
+        """
+        try:
+            self._struct.pack_into(buf, offset, *self._encode_values(values))
+        except struct.error:
+            self._struct.pack_into(
+                buf, offset, *self._encode_values(values, binary=True)
+            )
+        return offset + self._struct.size
+
+
+class MessageSchema:
+    """
+    Field table of a message class (offsets, lengths, types and default
+    values), stored once per class and shared by all of its instances.
+
+    Fields are kept in offset order, which is also the order of the values
+    held by each message instance.
+    """
+
+    def __init__(self, field_specs: OrderedDict[FieldName, FieldSpec]):
+        self._codec = MessageCodec(field_specs)
+        self._field_specs: OrderedDict[FieldName, FieldSpec] = collections.OrderedDict(
+            (field_name, field_specs[field_name]) for field_name in self._codec.names
+        )
+        self._index = {
+            field_name: idx for idx, field_name in enumerate(self._codec.names)
+        }
+        self._defaults = tuple(x.value() for x in self._field_specs.values())
+        self._price_scale = None
+        if FieldName.Price in self._field_specs:
+            self._price_scale = FieldConverter.price_scales[
+                self._field_specs[FieldName.Price].field_type()
+            ]
+
+    @property
+    def codec(self) -> MessageCodec:
+        return self._codec
+
+    @property
+    def field_specs(self) -> OrderedDict[FieldName, FieldSpec]:
+        return self._field_specs
+
+    @property
+    def defaults(self) -> tuple:
+        return self._defaults
+
+    @property
+    def price_scale(self) -> int:
+        """
+        Ticks per dollar of the Price field, None without a Price field.
+        """
+        return self._price_scale
+
+    def index(self, field_name: FieldName) -> int:
+        return self._index[field_name]
+
+
 class MessageBase(object):
+    """
+    Base of every PITCH message.
+
+    The layout of a message lives in the MessageSchema of its class, built
+    once from _field_table().  Instances only hold the list of field values.
+
+    Prices are held as integer ticks, price() is a float view of them.
+    """
+
+    __slots__ = ("_values",)
+
     _messageType = None
-    _field_specs: OrderedDict[FieldName, FieldSpec] = None
+    _schema: MessageSchema = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._schema = MessageSchema(cls._field_table())
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        return collections.OrderedDict()
 
     def __init__(self):
-        self._field_specs: OrderedDict[FieldName, FieldSpec] = collections.OrderedDict()
+        self._values = list(self._schema.defaults)
 
-    def get_bytes(self):
-        final_msg = bytearray()
+    def _get(self, field_name: FieldName) -> Any:
+        return self._values[self._schema._index[field_name]]
 
-        ordered_field_specs: OrderedDict[FieldName, FieldSpec] = OrderedDict(
-            sorted(self._field_specs.items(), key=lambda x: x[1].offset())
-        )
-        for field_name, field_spec in ordered_field_specs.items():
-            #logger.debug(f"{field_name}")
+    def _set(self, field_name: FieldName, value: Any) -> None:
+        if value is not None:
+            self._values[self._schema._index[field_name]] = value
+
+    def _codec(self) -> MessageCodec:
+        return self._schema.codec
+
+    def _fill_values(self, msg_bytes: ByteString, offset: int = 0) -> None:
+        self._values = self._schema.codec.decode(msg_bytes, offset)
+
+    def encode_into(self, buf: bytearray, offset: int = 0) -> int:
+        """
+        Write the message into 'buf' at 'offset', without allocating.
+
+        Returns the offset just past the message.
+        """
+        if None not in self._values:
+            return self._schema.codec.encode_into(buf, offset, self._values)
+
+        msg_bytes = self._partial_bytes()
+        buf[offset : offset + len(msg_bytes)] = msg_bytes
+        return offset + len(msg_bytes)
 
-            if field_spec.value() is not None:
-                tmp_val = field_spec.get_bytes()
-                tmp_val_str = [f'0x{format(x, "02x")}' for x in tmp_val]
-                #logger.debug(f"\tAppending: {list(tmp_val_str)}")
+    def get_bytes(self):
+        if None in self._values:
+            return self._partial_bytes()
+
+        final_msg = bytearray(self._schema.codec.size)
+        self._schema.codec.encode_into(final_msg, 0, self._values)
+        return final_msg
 
-                final_msg.extend(tmp_val)
+    def _partial_bytes(self) -> bytearray:
+        # Fields without a value are left out of the message
+        final_msg = bytearray()
+        for field_spec, value in zip(self._schema.field_specs.values(), self._values):
+            if value is not None:
+                field_type = field_spec.field_type()
+                if field_type in FieldConverter.price_scales:
+                    # Already in ticks
+                    field_type = FieldType.Binary
+                final_msg.extend(
+                    FieldSpec(
+                        field_name=field_spec._name,
+                        offset=field_spec.offset(),
+                        length=field_spec.length(),
+                        field_type=field_type,
+                        value=value,
+                    ).get_bytes()
+                )
         return final_msg
 
     def from_bytes(self, msg_bytes: ByteString):
@@ -187,78 +381,80 @@ class MessageBase(object):
         if msg_bytes[1] != self._messageType:
             raise Exception("Invalid message type in ByteString")
 
-        for idx, field_spec in enumerate(self._field_specs.values()):
-            if idx == 0:
-                if field_spec.value() != len(msg_bytes):
-                    raise Exception(f"Invalid message length {str(field_spec)}")
-            elif idx == 1:
-                if field_spec.value() != self._messageType:
-                    raise Exception("Invalid message type")
-            else:
-                field_spec.fill_value(msg_bytes)
+        if self._get(FieldName.Length) != len(msg_bytes):
+            raise Exception(f"Invalid message length {len(msg_bytes)}")
+
+        self._fill_values(msg_bytes)
 
     def length(self) -> int:
-        return self._field_specs[FieldName.Length].value()
+        return self._get(FieldName.Length)
 
     def messageType(self) -> int:
-        return self._field_specs[FieldName.MessageType].value()
+        return self._get(FieldName.MessageType)
 
     def time(self) -> int:
-        return self._field_specs[FieldName.Time].value()
+        return self._get(FieldName.Time)
 
     def time_offset(self, time_offset: int = None) -> int:
         if time_offset is not None:
-            self._field_specs[FieldName.TimeOffset].value(time_offset)
-        return self._field_specs[FieldName.TimeOffset].value()
+            self._set(FieldName.TimeOffset, time_offset)
+        return self._get(FieldName.TimeOffset)
 
     def order_id(self, order_id: str = None) -> str:
         if order_id is not None:
-            self._field_specs[FieldName.OrderId].value(
+            self._set(
+                FieldName.OrderId,
                 # 'ORID0001' => 0x313030304449524f
-                FieldConverter.orderid_to_u64(order_id)
+                FieldConverter.orderid_to_u64(order_id),
             )
-        order_id_ba = self._field_specs[FieldName.OrderId].value().to_bytes(8, "little")
+        order_id_ba = self._get(FieldName.OrderId).to_bytes(8, "little")
         return order_id_ba.decode("utf-8")
 
     def side(self, side: str = None) -> str:
         if side is not None:
-            self._field_specs[FieldName.SideIndicator].value(side)
-        return self._field_specs[FieldName.SideIndicator].value()
+            self._set(FieldName.SideIndicator, side)
+        return self._get(FieldName.SideIndicator)
 
     def quantity(self, quantity: int = None) -> int:
         if quantity is not None:
-            self._field_specs[FieldName.Quantity].value(quantity)
-        return self._field_specs[FieldName.Quantity].value()
+            self._set(FieldName.Quantity, quantity)
+        return self._get(FieldName.Quantity)
 
     def symbol(self, symbol: str = None) -> str:
         if symbol is not None:
-            self._field_specs[FieldName.Symbol].value(symbol)
-        return self._field_specs[FieldName.Symbol].value().strip()
+            self._set(FieldName.Symbol, symbol)
+        return self._get(FieldName.Symbol).strip()
 
     def price(self, price: float = None) -> float:
+        price_scale = self._schema.price_scale
         if price is not None:
-            self._field_specs[FieldName.Price].value(price)
-        return self._field_specs[FieldName.Price].value()
+            self._set(FieldName.Price, FieldConverter.price_to_ticks(price, price_scale))
+        return FieldConverter.ticks_to_price(self._get(FieldName.Price), price_scale)
+
+    def price_ticks(self, price_ticks: int = None) -> int:
+        if price_ticks is not None:
+            self._set(FieldName.Price, price_ticks)
+        return self._get(FieldName.Price)
 
     def displayed(self, displayed: bool = None) -> bool:
         if displayed is not None:
-            self._field_specs[FieldName.AddFlags].value(1 if displayed is True else 0)
-        return True if self._field_specs[FieldName.AddFlags].value() == 0x1 else False
+            self._set(FieldName.AddFlags, 1 if displayed is True else 0)
+        return True if self._get(FieldName.AddFlags) == 0x1 else False
 
     def executed_quantity(self, executed_quantity: int = None) -> int:
         if executed_quantity is not None:
-            self._field_specs[FieldName.ExecutedQuantity].value(executed_quantity)
-        return self._field_specs[FieldName.ExecutedQuantity].value()
+            self._set(FieldName.ExecutedQuantity, executed_quantity)
+        return self._get(FieldName.ExecutedQuantity)
 
     def remaining_quantity(self, remaining_quantity: int = None) -> int:
         if remaining_quantity is not None:
-            self._field_specs[FieldName.RemainingQuantity].value(remaining_quantity)
-        return self._field_specs[FieldName.RemainingQuantity].value()
+            self._set(FieldName.RemainingQuantity, remaining_quantity)
+        return self._get(FieldName.RemainingQuantity)
 
     def execution_id(self, execution_id: str = None) -> str:
         if execution_id is not None:
-            self._field_specs[FieldName.ExecutionId].value(execution_id)
-        return self._field_specs[FieldName.ExecutionId].value().strip()
+            self._set(FieldName.ExecutionId, execution_id)
+        return self._get(FieldName.ExecutionId).strip()
         # TODO: Need clarification and examples of 'base 36 numbers'
 #        if execution_id is not None:
 #            self._field_specs[FieldName.ExecutionId].value(
@@ -283,7 +479,7 @@ class MessageBase(object):
         # execution_id
         pretty_msg_type = str(type(self)).split(".")[-1][:-2]
         msg_str = f"({pretty_msg_type}, "
-        for field_spec in self._field_specs.items():
+        for field_spec in self._schema.field_specs.items():
             if field_spec[0] == FieldName.Symbol:
                 msg_str += f"{self.symbol()}, "
             elif field_spec[0] == FieldName.Price:
@@ -1,55 +1,64 @@
+from typing import OrderedDict
+
 from .pitch24 import MessageBase, FieldName, FieldSpec, FieldType
 
 
 class ReduceSizeBase(MessageBase):
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length] = FieldSpec(
+    __slots__ = ()
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length] = FieldSpec(
             field_name=FieldName.Length, offset=0, length=1, field_type=FieldType.Binary
         )
-        self._field_specs[FieldName.MessageType] = FieldSpec(
+        field_specs[FieldName.MessageType] = FieldSpec(
             field_name=FieldName.MessageType,
             offset=1,
             length=1,
             field_type=FieldType.Value,
         )
-        self._field_specs[FieldName.TimeOffset] = FieldSpec(
+        field_specs[FieldName.TimeOffset] = FieldSpec(
             field_name=FieldName.TimeOffset,
             offset=2,
             length=4,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.OrderId] = FieldSpec(
+        field_specs[FieldName.OrderId] = FieldSpec(
             field_name=FieldName.OrderId,
             offset=6,
             length=8,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.CanceledQuantity] = FieldSpec(
+        field_specs[FieldName.CanceledQuantity] = FieldSpec(
             field_name=FieldName.CanceledQuantity,
             offset=14,
             length=4,
             field_type=FieldType.Binary,
         )
+        return field_specs
 
     def set_fields(self, time_offset: int, order_id: str, canceled_quantity: int):
-        self._field_specs[FieldName.TimeOffset].value(time_offset)
+        self._set(FieldName.TimeOffset, time_offset)
         self.order_id(order_id)
-        self._field_specs[FieldName.CanceledQuantity].value(canceled_quantity)
+        self._set(FieldName.CanceledQuantity, canceled_quantity)
 
     def canceled_quantity(self, canceled_quantity: int = None) -> int:
         if canceled_quantity is not None:
-            self._field_specs[FieldName.CanceledQuantity].value(canceled_quantity)
-        return self._field_specs[FieldName.CanceledQuantity].value()
+            self._set(FieldName.CanceledQuantity, canceled_quantity)
+        return self._get(FieldName.CanceledQuantity)
 
 
 class ReduceSizeLong(ReduceSizeBase):
     _messageType = 0x25
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(18)
-        self._field_specs[FieldName.MessageType].value(self._messageType)
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(18)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+        return field_specs
 
     @staticmethod
     def from_parms(
@@ -66,12 +75,15 @@ class ReduceSizeLong(ReduceSizeBase):
 
 class ReduceSizeShort(ReduceSizeBase):
     _messageType = 0x26
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(16)
-        self._field_specs[FieldName.MessageType].value(self._messageType)
-        self._field_specs[FieldName.CanceledQuantity].length(2)
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(16)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+        field_specs[FieldName.CanceledQuantity].length(2)
+        return field_specs
 
     @staticmethod
     def from_parms(
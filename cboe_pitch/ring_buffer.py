@@ -0,0 +1,277 @@
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterator, Optional
+
+from .seq_unit_header import SequencedUnitHeader
+
+
+class RingBuffer:
+    """
+    Single producer/single consumer ring buffer in shared memory, used to
+    hand encoded Sequenced Unit Headers from a long-lived encoder process
+    to a reader (i.e. LabVIEW) without a call or a copy per message.
+
+    Layout of the shared memory block:
+
+    Offset   Length   Description
+       0        8     Write position, only written by the producer
+      64        8     Read position, only written by the consumer
+     128        8     Capacity of the data area
+     136        8     Closed flag, set by the producer when it is done
+     192     capacity Data area
+
+    Positions only ever grow, the offset into the data area is the position
+    modulo the capacity.  Each record is a 4 byte length followed by its
+    payload, padded to 8 bytes so a record never straddles the end of the
+    data area: when it would, a wrap marker is written and the record starts
+    over at offset 0.  A record holds one or more whole units.
+
+    The producer publishes a record by storing the write position after the
+    payload, and the consumer releases it by storing the read position, so
+    neither side ever waits on a lock.
+
+    One side creates the ring and frees it on close(), the other attaches to
+    it by name.  The attaching side is meant to be a separate program, not
+    a multiprocessing child of the creator.
+    """
+
+    HEADER_SIZE = 192
+
+    _WRITE_POS = 0
+    _READ_POS = 64
+    _CAPACITY = 128
+    _CLOSED = 136
+
+    _WRAP = 0xFFFF_FFFF
+
+    _position = struct.Struct("<Q")
+    _record_length = struct.Struct("<I")
+
+    def __init__(
+        self, name: str = None, capacity: int = 4 * 1024 * 1024, create: bool = True
+    ):
+        if create:
+            # Rounded up, so the end of the data area always has room for a length
+            capacity = (capacity + 7) & ~7
+            if capacity < 16 or capacity > 0xFFFF_FFF8:
+                raise Exception(f"Invalid ring buffer capacity {capacity}")
+            self._shm = shared_memory.SharedMemory(
+                name=name, create=True, size=RingBuffer.HEADER_SIZE + capacity
+            )
+            self._buf = self._shm.buf
+            self._buf[: RingBuffer.HEADER_SIZE] = bytes(RingBuffer.HEADER_SIZE)
+            self._store(RingBuffer._CAPACITY, capacity)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            # Otherwise this process would unlink the block when it exits,
+            # from under the side that created it.  Only POSIX blocks are
+            # tracked, under their name with the leading "/" put back
+            if os.name == "posix":
+                resource_tracker.unregister("/" + self._shm.name, "shared_memory")
+            self._buf = self._shm.buf
+        self._capacity = self._load(RingBuffer._CAPACITY)
+        self._data = self._buf[
+            RingBuffer.HEADER_SIZE : RingBuffer.HEADER_SIZE + self._capacity
+        ]
+        self._owner = create
+
+        # Record reserved by the producer or peeked at by the consumer:
+        # position of its length and position just past its payload
+        self._pending = None
+
+    @staticmethod
+    def attach(name: str) -> "RingBuffer":
+        return RingBuffer(name=name, create=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def capacity(self) -> int:
+        return self._capacity
+
+    def _load(self, offset: int) -> int:
+        return RingBuffer._position.unpack_from(self._buf, offset)[0]
+
+    def _store(self, offset: int, value: int) -> None:
+        RingBuffer._position.pack_into(self._buf, offset, value)
+
+    def __len__(self) -> int:
+        """
+        Number of bytes written and not yet released by the consumer.
+        """
+        return self._load(RingBuffer._WRITE_POS) - self._load(RingBuffer._READ_POS)
+
+    #
+    # Producer
+    #
+    def try_reserve(self, length: int) -> Optional[memoryview]:
+        """
+        Reserve room for a record of 'length' bytes and return a view to
+        encode it into, or None when the ring is too full right now.
+        The record is only visible to the consumer after commit().
+        """
+        record_length = (RingBuffer._record_length.size + length + 7) & ~7
+        if record_length > self._capacity:
+            raise Exception(
+                f"Record of {length} bytes does not fit in {self._capacity} bytes"
+            )
+
+        write_pos = self._load(RingBuffer._WRITE_POS)
+        offset = write_pos % self._capacity
+        padding = 0
+        if offset + record_length > self._capacity:
+            padding = self._capacity - offset
+        read_pos = self._load(RingBuffer._READ_POS)
+        if write_pos + padding + record_length - read_pos > self._capacity:
+            return None
+
+        if padding != 0:
+            RingBuffer._record_length.pack_into(self._data, offset, RingBuffer._WRAP)
+            write_pos += padding
+            offset = 0
+        RingBuffer._record_length.pack_into(self._data, offset, length)
+        self._pending = (write_pos, write_pos + record_length)
+        start = offset + RingBuffer._record_length.size
+        return self._data[start : start + length]
+
+    def reserve(self, length: int, timeout: float = None) -> memoryview:
+        """
+        Like try_reserve(), waiting up to 'timeout' seconds (forever when
+        None) for the consumer to make room.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            view = self.try_reserve(length)
+            if view is not None:
+                return view
+            if deadline is not None and time.monotonic() > deadline:
+                raise Exception(f"Timed out waiting for {length} bytes in ring buffer")
+            time.sleep(0)
+
+    def commit(self) -> None:
+        """
+        Publish the record handed out by the last reserve().
+        """
+        if self._pending is None:
+            raise Exception("No record reserved")
+        self._store(RingBuffer._WRITE_POS, self._pending[1])
+        self._pending = None
+
+    def write(self, data, timeout: float = None) -> int:
+        """
+        Copy 'data' into the ring as one record.  Having the same signature
+        as a file's write() lets UnitEncoder.write_to() target the ring.
+
+        Returns the number of bytes written.
+        """
+        length = len(data)
+        self.reserve(length, timeout=timeout)[:] = data
+        self.commit()
+        return length
+
+    def write_unit(
+        self, seq_unit_hdr: SequencedUnitHeader, timeout: float = None
+    ) -> int:
+        """
+        Encode a Sequenced Unit Header directly into the ring.
+        """
+        length = seq_unit_hdr.getLength()
+        with self.reserve(length, timeout=timeout) as view:
+            seq_unit_hdr.encode_into(view, 0)
+        self.commit()
+        return length
+
+    def close_writer(self) -> None:
+        """
+        Tell the consumer no more records will be written.
+        """
+        self._store(RingBuffer._CLOSED, 1)
+
+    #
+    # Consumer
+    #
+    def closed(self) -> bool:
+        """
+        True once the producer is done and every record has been read.
+        """
+        return self._load(RingBuffer._CLOSED) != 0 and len(self) == 0
+
+    def peek(self) -> Optional[memoryview]:
+        """
+        Return a view of the next record without copying it, or None when
+        the ring is empty.  The view is only valid until release().
+        """
+        read_pos = self._load(RingBuffer._READ_POS)
+        if read_pos == self._load(RingBuffer._WRITE_POS):
+            return None
+
+        offset = read_pos % self._capacity
+        length = RingBuffer._record_length.unpack_from(self._data, offset)[0]
+        if length == RingBuffer._WRAP:
+            read_pos += self._capacity - offset
+            offset = 0
+            length = RingBuffer._record_length.unpack_from(self._data, offset)[0]
+        record_length = (RingBuffer._record_length.size + length + 7) & ~7
+        self._pending = (read_pos, read_pos + record_length)
+        start = offset + RingBuffer._record_length.size
+        return self._data[start : start + length]
+
+    def release(self) -> None:
+        """
+        Hand the record returned by the last peek() back to the producer.
+        """
+        if self._pending is None:
+            raise Exception("No record peeked at")
+        self._store(RingBuffer._READ_POS, self._pending[1])
+        self._pending = None
+
+    def read(self, timeout: float = None) -> Optional[bytes]:
+        """
+        Copy out the next record, waiting up to 'timeout' seconds (forever
+        when None) for one.  Returns None once the producer is closed and
+        the ring is drained, or on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            closed = self._load(RingBuffer._CLOSED) != 0
+            view = self.peek()
+            if view is not None:
+                record = bytes(view)
+                view.release()
+                self.release()
+                return record
+            if closed or (deadline is not None and time.monotonic() > deadline):
+                return None
+            time.sleep(0)
+
+    def iter_units(self, timeout: float = None) -> Iterator[SequencedUnitHeader]:
+        """
+        Decode every unit written until the producer closes the ring.
+        """
+        while True:
+            record = self.read(timeout=timeout)
+            if record is None:
+                return
+            offset = 0
+            while offset < len(record):
+                seq_unit_hdr, offset = SequencedUnitHeader.from_buffer(record, offset)
+                yield seq_unit_hdr
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory, and free it when this side created it.
+        """
+        self._data.release()
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "RingBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
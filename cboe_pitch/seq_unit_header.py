@@ -1,7 +1,7 @@
-import collections
-from typing import ByteString, List, OrderedDict
+from typing import ByteString, List, OrderedDict, Tuple
 
 from .message_factory import MessageFactory
+from .message_filter import MessageFilter
 from .pitch24 import MessageBase, FieldName, FieldSpec, FieldType
 
 
@@ -18,124 +18,229 @@ class SequencedUnitHeader(MessageBase):
                                                   header.
     """
 
-    def __init__(self, hdr_sequence: int = 1):
-        self._field_specs: OrderedDict[FieldName, FieldSpec] = collections.OrderedDict()
-        self._field_specs[FieldName.HdrLength] = FieldSpec(
+    __slots__ = ("_messages",)
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.HdrLength] = FieldSpec(
             field_name=FieldName.HdrLength,
             offset=0,
             length=2,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.HdrCount] = FieldSpec(
+        field_specs[FieldName.HdrCount] = FieldSpec(
             field_name=FieldName.HdrCount,
             offset=2,
             length=1,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.HdrUnit] = FieldSpec(
+        field_specs[FieldName.HdrUnit] = FieldSpec(
             field_name=FieldName.HdrUnit,
             offset=3,
             length=1,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.HdrSequence] = FieldSpec(
+        field_specs[FieldName.HdrSequence] = FieldSpec(
             field_name=FieldName.HdrSequence,
             offset=4,
             length=4,
             field_type=FieldType.Binary,
         )
 
-        self._field_specs[FieldName.HdrLength].value(8)
-        self._field_specs[FieldName.HdrCount].value(0)
-        self._field_specs[FieldName.HdrUnit].value(1)
-        self._field_specs[FieldName.HdrSequence].value(hdr_sequence)
+        field_specs[FieldName.HdrLength].value(8)
+        field_specs[FieldName.HdrCount].value(0)
+        field_specs[FieldName.HdrUnit].value(1)
+        field_specs[FieldName.HdrSequence].value(1)
+        return field_specs
+
+    def __init__(self, hdr_sequence: int = 1):
+        super().__init__()
+        self._set(FieldName.HdrSequence, hdr_sequence)
 
         self._messages = []
 
     @staticmethod
     def from_message_array(
-        msgs_array: List[int], hdr_sequence: int = 0, hdr_count: int = 0
-    ) -> "SequencedUnitHeader":
-        # Pass an array in with all
-        seq_unit_hdr = SequencedUnitHeader()
-        seq_unit_hdr.hdr_sequence(hdr_sequence)
-        seq_unit_hdr.hdr_count(hdr_count)
-
-        SequencedUnitHeader.parse_bytestream(
-            seq_unit_hdr=seq_unit_hdr, rem_bytes=msgs_array, old_hdr_length=0
-        )
+        msgs_array: List[int],
+        hdr_sequence: int = 0,
+        hdr_count: int = 0,
+        validate: bool = False,
+    ) -> ByteString:
+        """
+        Put a Sequenced Unit Header in front of already encoded messages.
+
+        Message boundaries are only checked using the length byte of each
+        message, and the message bytes are copied as they are.  With
+        'validate', every message is fully decoded and encoded again
+        instead, which also rejects unknown message types and bad lengths.
+
+        'hdr_count' is added to the number of messages found.
+        """
+        if validate:
+            seq_unit_hdr = SequencedUnitHeader()
+            seq_unit_hdr.hdr_sequence(hdr_sequence)
+            seq_unit_hdr.hdr_count(hdr_count)
 
-        return seq_unit_hdr.get_bytes()
+            SequencedUnitHeader.parse_bytestream(
+                seq_unit_hdr=seq_unit_hdr, rem_bytes=bytes(msgs_array), old_hdr_length=0
+            )
+
+            return seq_unit_hdr.get_bytes()
+
+        msg_bytes = bytes(msgs_array)
+        msg_count = SequencedUnitHeader.count_messages(msg_bytes)
+        hdr_length = 8 + len(msg_bytes)
+        if hdr_length > 0xFFFF:
+            raise Exception(f"Invalid Hdr Length {hdr_length}")
+        if hdr_count + msg_count > 0xFF:
+            raise Exception(f"Invalid Hdr Count {hdr_count + msg_count}")
+
+        schema = SequencedUnitHeader._schema
+        hdr_values = list(schema.defaults)
+        hdr_values[schema.index(FieldName.HdrLength)] = hdr_length
+        hdr_values[schema.index(FieldName.HdrCount)] = hdr_count + msg_count
+        hdr_values[schema.index(FieldName.HdrSequence)] = hdr_sequence
+
+        seq_unit_bytes = bytearray(hdr_length)
+        schema.codec.encode_into(seq_unit_bytes, 0, hdr_values)
+        seq_unit_bytes[8:] = msg_bytes
+        return seq_unit_bytes
+
+    @staticmethod
+    def count_messages(msg_bytes: ByteString) -> int:
+        """
+        Count back to back messages using only their length bytes.
+        """
+        msg_count = 0
+        offset = 0
+        while offset < len(msg_bytes):
+            next_msg_len = msg_bytes[offset]
+            if next_msg_len < 2 or offset + next_msg_len > len(msg_bytes):
+                raise Exception(f"Invalid message length {next_msg_len} at offset {offset}")
+            offset += next_msg_len
+            msg_count += 1
+        return msg_count
 
     @staticmethod
     def parse_bytestream(
-        seq_unit_hdr: "SequencedUnitHeader", rem_bytes: ByteString, old_hdr_length: int
-    ) -> None:
-        while True:
-            # Chop off a single message
-            next_msg_len = rem_bytes[0]
-            next_msg_bytes = rem_bytes[:next_msg_len]
-            next_msg = MessageFactory.from_bytes(next_msg_bytes)
-            seq_unit_hdr.addMessage(next_msg)
-
-            # Is final message?
-            if (
-                len(next_msg_bytes) == len(rem_bytes)
-                or old_hdr_length == seq_unit_hdr.hdr_length()
-            ):
-                break
-            else:
-                # Chop off message that was just parsed
-                rem_bytes = rem_bytes[next_msg_len:]
+        seq_unit_hdr: "SequencedUnitHeader",
+        rem_bytes: ByteString,
+        old_hdr_length: int,
+        offset: int = 0,
+        message_filter: MessageFilter = None,
+    ) -> int:
+        """
+        Decode the messages that follow a Sequenced Unit Header, starting
+        at 'offset'.  The buffer is walked through a memoryview with an
+        integer cursor, so no part of it is copied.  An 'old_hdr_length'
+        of 0 means every remaining byte belongs to this unit.
+
+        Messages rejected by 'message_filter' are skipped without being
+        decoded.
+
+        Returns the offset just past the last message.
+        """
+        # Released on the way out, even on a parse error, so that a
+        # memory-mapped file under 'rem_bytes' can be closed
+        with memoryview(rem_bytes) as buf:
+            end_offset = len(buf)
+            if old_hdr_length != 0:
+                end_offset = min(end_offset, offset + old_hdr_length - 8)
+
+            while offset < end_offset:
+                next_msg_len = buf[offset]
+                if next_msg_len == 0:
+                    raise Exception(f"Invalid message length 0 at offset {offset}")
+                if message_filter is None or message_filter.accepts(buf, offset):
+                    with buf[offset : offset + next_msg_len] as msg_buf:
+                        next_msg = MessageFactory.from_bytes(msg_buf)
+                    seq_unit_hdr.addMessage(next_msg)
+                offset += next_msg_len
+
+        return offset
 
     @staticmethod
-    def from_bytestream(msg_bytes: ByteString) -> "SequencedUnitHeader":
-        # Read in Sequenced Unit Header
-        seq_unit_hdr_bytes = msg_bytes[:8]
+    def from_buffer(
+        msg_bytes: ByteString, offset: int = 0, message_filter: MessageFilter = None
+    ) -> Tuple["SequencedUnitHeader", int]:
+        """
+        Decode the Sequenced Unit Header found at 'offset' along with
+        all of its messages.
+
+        Messages rejected by 'message_filter' are left out, but Hdr Count
+        stays the one on the wire so that the Hdr Sequence of the unit
+        that follows is still known; message_count() is the number kept.
 
-        seq_unit_hdr = SequencedUnitHeader()
-        for idx, field_spec in enumerate(seq_unit_hdr._field_specs.values()):
-            field_spec.fill_value(seq_unit_hdr_bytes)
+        Returns the header and the offset of the next one.
+        """
+        with memoryview(msg_bytes) as buf:
+            # Read in Sequenced Unit Header
+            seq_unit_hdr = SequencedUnitHeader()
+            seq_unit_hdr._fill_values(buf, offset)
 
-        # Save Header Values
-        old_hdr_count = seq_unit_hdr.hdr_count()
-        old_hdr_length = seq_unit_hdr.hdr_length()
-        seq_unit_hdr.hdr_count(0)
-        seq_unit_hdr.hdr_length(8)
+            # Save Header Values
+            old_hdr_length = seq_unit_hdr.hdr_length()
+            old_hdr_count = seq_unit_hdr.hdr_count()
+            if old_hdr_length < 8 or offset + old_hdr_length > len(buf):
+                raise Exception(
+                    f"Invalid Hdr Length {old_hdr_length} at offset {offset}"
+                )
+            seq_unit_hdr.hdr_count(0)
+            seq_unit_hdr.hdr_length(8)
 
-        # Remaining Bytes
-        rem_bytes = msg_bytes[8:]
+            SequencedUnitHeader.parse_bytestream(
+                seq_unit_hdr,
+                buf,
+                old_hdr_length,
+                offset=offset + 8,
+                message_filter=message_filter,
+            )
+            if message_filter is not None:
+                seq_unit_hdr.hdr_count(old_hdr_count)
 
-        SequencedUnitHeader.parse_bytestream(seq_unit_hdr, rem_bytes, old_hdr_length)
+        return seq_unit_hdr, offset + old_hdr_length
 
+    @staticmethod
+    def from_bytestream(msg_bytes: ByteString) -> "SequencedUnitHeader":
+        [seq_unit_hdr, next_offset] = SequencedUnitHeader.from_buffer(msg_bytes)
+
+        # Remaining Bytes, as a view into msg_bytes
         rem_data = None
-        if seq_unit_hdr.hdr_length() < len(msg_bytes):
-            rem_data = msg_bytes[seq_unit_hdr.hdr_length() :]
+        if next_offset < len(msg_bytes):
+            rem_data = memoryview(msg_bytes)[next_offset:]
 
         return [seq_unit_hdr, rem_data]
 
     def hdr_length(self, hdr_length: int = None) -> int:
         if hdr_length is not None:
-            self._field_specs[FieldName.HdrLength].value(hdr_length)
-        return self._field_specs[FieldName.HdrLength].value()
+            self._set(FieldName.HdrLength, hdr_length)
+        return self._get(FieldName.HdrLength)
 
     def hdr_count(self, hdr_count: int = None) -> int:
         if hdr_count is not None:
-            self._field_specs[FieldName.HdrCount].value(hdr_count)
-        return self._field_specs[FieldName.HdrCount].value()
+            self._set(FieldName.HdrCount, hdr_count)
+        return self._get(FieldName.HdrCount)
 
     def hdr_unit(self, hdr_unit: int = None) -> int:
         if hdr_unit is not None:
-            self._field_specs[FieldName.HdrUnit].value(hdr_unit)
-        return self._field_specs[FieldName.HdrUnit].value()
+            self._set(FieldName.HdrUnit, hdr_unit)
+        return self._get(FieldName.HdrUnit)
 
     def hdr_sequence(self, hdr_sequence: int = None) -> int:
         if hdr_sequence is not None:
-            self._field_specs[FieldName.HdrSequence].value(hdr_sequence)
-        return self._field_specs[FieldName.HdrSequence].value()
+            self._set(FieldName.HdrSequence, hdr_sequence)
+        return self._get(FieldName.HdrSequence)
 
     def getNextSequence(self) -> int:
-        return self._field_specs[FieldName.HdrSequence].value() + len(self._messages)
+        return self._get(FieldName.HdrSequence) + self._get(FieldName.HdrCount)
+
+    def message_count(self) -> int:
+        """
+        Number of messages held, fewer than hdr_count() when some were
+        left out by a MessageFilter.
+        """
+        return len(self._messages)
 
     def addMessage(self, new_msg: MessageBase) -> None:
         self._messages.append(new_msg)
@@ -151,19 +256,24 @@ class SequencedUnitHeader(MessageBase):
             total_length += msg.length()
         return total_length
 
-    def get_bytes(self) -> ByteString:
-        tot_len = self.getLength()
-        self.hdr_length(tot_len)
-        hdr_bytes = super().get_bytes()
-        tmp_val_str = [f'0x{format(x, "02x")}' for x in hdr_bytes]
+    def encode_into(self, buf: bytearray, offset: int = 0) -> int:
+        """
+        Write the header followed by all of its messages into 'buf' at
+        'offset'.  'buf' must have room for getLength() bytes.
 
+        Returns the offset just past the last message.
+        """
+        self.hdr_length(self.getLength())
+        offset = super().encode_into(buf, offset)
         for msg in self._messages:
-            # print(f'msg: {msg}')
-            # msg_bytes = msg.get_bytes()
-            # print(f'len(msg_bytes): {len(msg_bytes)}')
-            # msg_bytes_str = [f'0x{format(x, "02x")}' for x in msg_bytes]
-            # print(f'msg_bytes_str: {msg_bytes_str}')
-            hdr_bytes.extend(msg.get_bytes())
+            offset = msg.encode_into(buf, offset)
+        return offset
+
+    def get_bytes(self) -> ByteString:
+        hdr_bytes = bytearray(self.getLength())
+        end_offset = self.encode_into(hdr_bytes, 0)
+        # Messages with missing fields are shorter than their length
+        del hdr_bytes[end_offset:]
         return hdr_bytes
 
     def __str__(self) -> str:
@@ -0,0 +1,252 @@
+import struct
+from pathlib import Path
+from typing import BinaryIO, ByteString, Dict, Tuple
+
+import numpy as np
+
+from .orderbook import OrderBook, Side
+
+
+class BookSnapshot:
+    """
+    Binary image of every order of an OrderBook, tagged with the Hdr
+    Sequence of the last message applied to the book for each Hdr Unit
+    and with the last PITCH Time, so a replay can be restarted from there
+    instead of from the start of the capture.
+
+    Layout, little-endian:
+
+    Offset   Length   Description
+       0        4     Magic b"PBSN"
+       4        2     Version
+       6        2     Flags, 1 when prices are floats rather than ticks,
+                      2 when there is a Time
+       8        4     Price scale of the book, 0 when None
+      12        4     Number of tickers (T)
+      16        4     Number of Hdr Units (U)
+      20        4     Time, seconds since midnight of the last Time message
+      24        8     Number of orders (O)
+      32      12*U    Hdr Units: Hdr Unit, Hdr Sequence of the last message
+                      applied
+      ...     40*T    Tickers: Symbol, ladder price range and tick size
+                      (tick size 0 when not a ladder), number of buy orders
+                      and number of sell orders
+      ...     20*O    Orders: Order Id, Price, Quantity
+
+    Orders are stored ticker by ticker, buys then sells, each side in
+    priority order, so restoring them keeps their place in the queue.
+
+    Both tables are NumPy structured arrays, written and read in one go;
+    restoring only has to build the Order objects of the book.
+    """
+
+    MAGIC = b"PBSN"
+    VERSION = 2
+
+    _FLOAT_PRICES = 0x1
+    _HAS_TIME = 0x2
+
+    _header = struct.Struct("<4sHHIIIIQ")
+
+    _unit_dtype = np.dtype([("hdr_unit", "<u4"), ("hdr_sequence", "<u8")])
+
+    _ticker_dtype = np.dtype(
+        [
+            ("symbol", "S8"),
+            ("min_price", "<i8"),
+            ("max_price", "<i8"),
+            ("tick_size", "<i8"),
+            ("buy_orders", "<u4"),
+            ("sell_orders", "<u4"),
+        ]
+    )
+
+    __slots__ = ("_orderbook", "_hdr_sequences", "_time")
+
+    def __init__(
+        self,
+        orderbook: OrderBook,
+        hdr_sequences: Dict[int, int] = None,
+        time: int = None,
+    ):
+        self._orderbook = orderbook
+        self._hdr_sequences = dict(hdr_sequences or {})
+        self._time = time
+
+    def orderbook(self) -> OrderBook:
+        return self._orderbook
+
+    def hdr_sequences(self) -> Dict[int, int]:
+        """
+        Hdr Unit => Hdr Sequence of the last message applied.
+        """
+        return dict(self._hdr_sequences)
+
+    def hdr_sequence(self, hdr_unit: int = 1) -> int:
+        return self._hdr_sequences.get(hdr_unit, 0)
+
+    def time(self) -> int:
+        """
+        Seconds since midnight of the last Time message, None before one.
+        """
+        return self._time
+
+    @staticmethod
+    def _order_dtype(float_prices: bool) -> np.dtype:
+        return np.dtype(
+            [
+                ("order_id", "S8"),
+                ("price", "<f8" if float_prices else "<i8"),
+                ("quantity", "<u4"),
+            ]
+        )
+
+    #
+    # Encoding
+    #
+    def get_bytes(self) -> bytes:
+        orderbook = self._orderbook
+        price_scale = orderbook.price_scale()
+        float_prices = price_scale is None
+
+        tickers = orderbook.tickers()
+        ticker_table = np.zeros(len(tickers), dtype=BookSnapshot._ticker_dtype)
+        orders = []
+        for idx, ticker in enumerate(tickers):
+            buys = orderbook.get_orders(ticker=ticker, side=Side.Buy)
+            sells = orderbook.get_orders(ticker=ticker, side=Side.Sell)
+            ladder = orderbook.ladder(ticker)
+            (min_price, max_price), tick_size = ladder or ((0, 0), 0)
+            ticker_table[idx] = (
+                ticker,
+                min_price,
+                max_price,
+                tick_size,
+                len(buys),
+                len(sells),
+            )
+            orders.extend(buys)
+            orders.extend(sells)
+
+        order_ids = [x.order_id for x in orders]
+        if orders and max(map(len, order_ids)) > 8:
+            raise Exception("Order Ids longer than 8 characters cannot be saved")
+        # Filled column by column, rather than order by order
+        order_dtype = BookSnapshot._order_dtype(float_prices)
+        order_table = np.empty(len(orders), dtype=order_dtype)
+        order_table["order_id"] = order_ids
+        order_table["price"] = [x.price for x in orders]
+        order_table["quantity"] = [x.quantity for x in orders]
+
+        unit_table = np.array(
+            sorted(self._hdr_sequences.items()), dtype=BookSnapshot._unit_dtype
+        )
+
+        flags = BookSnapshot._FLOAT_PRICES if float_prices else 0
+        if self._time is not None:
+            flags |= BookSnapshot._HAS_TIME
+        header = BookSnapshot._header.pack(
+            BookSnapshot.MAGIC,
+            BookSnapshot.VERSION,
+            flags,
+            price_scale or 0,
+            len(tickers),
+            len(unit_table),
+            self._time or 0,
+            len(orders),
+        )
+        tables = (unit_table, ticker_table, order_table)
+        return header + b"".join(x.tobytes() for x in tables)
+
+    def write_to(self, f_out: BinaryIO) -> int:
+        """
+        Write the snapshot to an open binary file, returns its length.
+        """
+        return f_out.write(self.get_bytes())
+
+    def write(self, file_path: str) -> int:
+        with open(file_path, "wb") as f_out:
+            return self.write_to(f_out)
+
+    #
+    # Decoding
+    #
+    @staticmethod
+    def from_buffer(buf: ByteString, offset: int = 0) -> Tuple["BookSnapshot", int]:
+        """
+        Restore the snapshot found at 'offset' into a new OrderBook.
+
+        Returns the snapshot and the offset just past it.
+        """
+        if len(buf) - offset < BookSnapshot._header.size:
+            raise Exception(f"No book snapshot at offset {offset}")
+        (
+            magic,
+            version,
+            flags,
+            price_scale,
+            ticker_count,
+            unit_count,
+            time,
+            order_count,
+        ) = BookSnapshot._header.unpack_from(buf, offset)
+        if magic != BookSnapshot.MAGIC:
+            raise Exception(f"No book snapshot at offset {offset}")
+        if version != BookSnapshot.VERSION:
+            raise Exception(f"Unsupported book snapshot version {version}")
+        offset += BookSnapshot._header.size
+
+        unit_table = np.frombuffer(
+            buf, dtype=BookSnapshot._unit_dtype, count=unit_count, offset=offset
+        )
+        offset += unit_table.nbytes
+        hdr_sequences = dict(unit_table.tolist())
+        if flags & BookSnapshot._HAS_TIME == 0:
+            time = None
+
+        ticker_table = np.frombuffer(
+            buf, dtype=BookSnapshot._ticker_dtype, count=ticker_count, offset=offset
+        )
+        offset += ticker_table.nbytes
+        order_dtype = BookSnapshot._order_dtype(flags & BookSnapshot._FLOAT_PRICES)
+        order_table = np.frombuffer(
+            buf, dtype=order_dtype, count=order_count, offset=offset
+        )
+        offset += order_table.nbytes
+
+        # Whole columns at once, rather than one field of one order at a time
+        order_ids = order_table["order_id"].astype("U8").tolist()
+        prices = order_table["price"].tolist()
+        quantities = order_table["quantity"].tolist()
+
+        orderbook = OrderBook(price_scale=price_scale or None)
+        start = 0
+        for row in ticker_table.tolist():
+            symbol, min_price, max_price, tick_size, buys, sells = row
+            ticker = symbol.decode()
+            if tick_size == 0:
+                orderbook.add_ticker(ticker=ticker)
+            else:
+                orderbook.add_ticker(
+                    ticker=ticker,
+                    price_range=(min_price, max_price),
+                    tick_size=tick_size,
+                )
+            for side, count in ((Side.Buy, buys), (Side.Sell, sells)):
+                end = start + count
+                orderbook.add_orders(
+                    ticker,
+                    side,
+                    zip(order_ids[start:end], prices[start:end], quantities[start:end]),
+                )
+                start = end
+
+        return BookSnapshot(orderbook, hdr_sequences, time), offset
+
+    @staticmethod
+    def from_bytes(buf: ByteString) -> "BookSnapshot":
+        return BookSnapshot.from_buffer(buf)[0]
+
+    @staticmethod
+    def read(file_path: str) -> "BookSnapshot":
+        return BookSnapshot.from_bytes(Path(file_path).read_bytes())
@@ -0,0 +1,165 @@
+import struct
+from typing import Any, ByteString, Dict, Type
+
+import numpy as np
+
+from .columnar import ColumnarDecoder
+from .pitch24 import (
+    MessageBase,
+    MessageCodec,
+    FieldConverter,
+    FieldName,
+    FieldSpec,
+    FieldType,
+)
+
+
+class FieldPatcher:
+    """
+    Encodes a single field of a message straight into a buffer.
+    """
+
+    __slots__ = ("_offset", "_length", "_pack_into", "_encode")
+
+    def __init__(self, field_spec: FieldSpec):
+        self._offset = field_spec.offset()
+        self._length = field_spec.length()
+        self._pack_into = struct.Struct(
+            "<" + MessageCodec._field_format(field_spec)
+        ).pack_into
+
+        field_type = field_spec.field_type()
+        if field_type in (FieldType.Alphanumeric, FieldType.PrintableAscii):
+            self._encode = self._encode_ascii
+        else:
+            self._encode = MessageCodec._binary_encoder
+
+    def _encode_ascii(self, value: str) -> bytes:
+        return value.ljust(self._length).encode()
+
+    def patch(self, buf: bytearray, msg_offset: int, value: Any) -> None:
+        self._pack_into(buf, msg_offset + self._offset, self._encode(value))
+
+
+class MessageTemplate:
+    """
+    Message encoded once, whose fields are then overwritten in place at the
+    offsets of its field table, without encoding the rest of it again.
+
+    Values are given as held by MessageBase: prices in ticks (see
+    patch_price() for dollars), Order Ids as the 8 character string or its
+    integer value.
+
+    A template has length() and encode_into() like a message, so it can be
+    handed to UnitEncoder.add() as is.
+
+    For many messages of the same shape, array() returns a NumPy array of
+    copies of the template laid out as on the wire, whose columns are
+    patched all at once with patch_array().
+    """
+
+    __slots__ = ("_message_class", "_bytes", "_patchers")
+
+    _layouts: Dict[Type[MessageBase], Dict[FieldName, FieldPatcher]] = {}
+
+    def __init__(self, message: MessageBase):
+        self._message_class = type(message)
+        self._bytes = bytearray(message.get_bytes())
+        if len(self._bytes) != message.length():
+            raise Exception(f"Message {message} has fields without a value")
+        self._patchers = MessageTemplate.layout(self._message_class)
+
+    @staticmethod
+    def from_parms(message_class: Type[MessageBase], **kwargs) -> "MessageTemplate":
+        return MessageTemplate(message_class.from_parms(**kwargs))
+
+    @staticmethod
+    def layout(message_class: Type[MessageBase]) -> Dict[FieldName, FieldPatcher]:
+        patchers = MessageTemplate._layouts.get(message_class)
+        if patchers is None:
+            patchers = {
+                field_name: FieldPatcher(field_spec)
+                for field_name, field_spec in message_class._schema.field_specs.items()
+            }
+            MessageTemplate._layouts[message_class] = patchers
+        return patchers
+
+    def message_class(self) -> Type[MessageBase]:
+        return self._message_class
+
+    def length(self) -> int:
+        return len(self._bytes)
+
+    def patch(self, field_name: FieldName, value: Any) -> "MessageTemplate":
+        if field_name in (FieldName.Length, FieldName.MessageType):
+            raise Exception(f"{field_name.value} of a template cannot be changed")
+        patcher = self._patchers.get(field_name)
+        if patcher is None:
+            raise Exception(
+                f"{self._message_class.__name__} has no {field_name.value} field"
+            )
+        patcher.patch(self._bytes, 0, value)
+        return self
+
+    def patch_price(self, price: float) -> "MessageTemplate":
+        price_scale = self._message_class._schema.price_scale
+        if price_scale is None:
+            raise Exception(f"{self._message_class.__name__} has no Price field")
+        price_ticks = FieldConverter.price_to_ticks(price, price_scale)
+        return self.patch(FieldName.Price, price_ticks)
+
+    def get_bytes(self) -> bytes:
+        return bytes(self._bytes)
+
+    def encode_into(self, buf: bytearray, offset: int = 0) -> int:
+        end_offset = offset + len(self._bytes)
+        buf[offset:end_offset] = self._bytes
+        return end_offset
+
+    def to_message(self) -> MessageBase:
+        message = self._message_class()
+        message.from_bytes(self._bytes)
+        return message
+
+    #
+    # Many messages at once
+    #
+    def array(self, count: int) -> np.ndarray:
+        """
+        'count' copies of the template as a structured array with the
+        ColumnarDecoder.wire_dtype() of its class.  The array is the
+        messages back to back, memoryview(array) or array.tobytes() hands
+        them out as such.
+        """
+        wire_dtype = ColumnarDecoder.wire_dtype(self._message_class)
+        return np.frombuffer(self._bytes, dtype=wire_dtype).repeat(count)
+
+    @staticmethod
+    def patch_array(messages: np.ndarray, field_name: FieldName, values: Any) -> None:
+        """
+        Overwrite one field of every message in an array from array().
+        'values' is a single value or one value per message.
+        """
+        if field_name in (FieldName.Length, FieldName.MessageType):
+            raise Exception(f"{field_name.value} of a template cannot be changed")
+        column = messages[ColumnarDecoder.column_name(field_name)]
+        values = np.asarray(values)
+        if values.dtype.kind in "US":
+            if column.dtype.kind == "S":
+                values = np.char.ljust(values.astype("S"), column.dtype.itemsize)
+            else:
+                # i.e. Order Id strings into their integer column
+                values = values.astype(f"S{column.dtype.itemsize}").view(column.dtype)
+        column[...] = values
+
+    @staticmethod
+    def array_view(
+        msg_bytes: ByteString, message_class: Type[MessageBase]
+    ) -> np.ndarray:
+        """
+        View back to back messages of one class, i.e. written out from an
+        array(), as such an array again without copying them.  The view is
+        only writable when 'msg_bytes' is.
+        """
+        wire_dtype = ColumnarDecoder.wire_dtype(message_class)
+        return np.frombuffer(msg_bytes, dtype=wire_dtype)
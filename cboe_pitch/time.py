@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import OrderedDict
 
 from .pitch24 import MessageBase, FieldName, FieldSpec, FieldType
 
@@ -10,26 +11,29 @@ class Time(MessageBase):
     """
 
     _messageType = 0x20
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length] = FieldSpec(
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length] = FieldSpec(
             field_name=FieldName.Length,
             offset=0,
             length=1,
             field_type=FieldType.Binary,
             value=6,
         )
-        self._field_specs[FieldName.MessageType] = FieldSpec(
+        field_specs[FieldName.MessageType] = FieldSpec(
             field_name=FieldName.MessageType,
             offset=1,
             length=1,
             field_type=FieldType.Value,
-            value=self._messageType,
+            value=cls._messageType,
         )
-        self._field_specs[FieldName.Time] = FieldSpec(
+        field_specs[FieldName.Time] = FieldSpec(
             field_name=FieldName.Time, offset=2, length=4, field_type=FieldType.Binary
         )
+        return field_specs
 
     def set_fields(self, time: int = None):
         seconds_since_midnight = time
@@ -38,7 +42,7 @@ class Time(MessageBase):
             seconds_since_midnight = (
                 now - now.replace(hour=0, minute=0, second=0, microsecond=0)
             ).total_seconds()
-        self._field_specs[FieldName.Time].value(seconds_since_midnight)
+        self._set(FieldName.Time, seconds_since_midnight)
 
     @staticmethod
     def from_parms(time: int) -> "Time":
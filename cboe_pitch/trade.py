@@ -1,60 +1,66 @@
+from typing import OrderedDict
+
 from .pitch24 import MessageBase, FieldName, FieldSpec, FieldType
 
 
 class TradeBase(MessageBase):
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length] = FieldSpec(
+    __slots__ = ()
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length] = FieldSpec(
             field_name=FieldName.Length, offset=0, length=1, field_type=FieldType.Binary
         )
-        self._field_specs[FieldName.MessageType] = FieldSpec(
+        field_specs[FieldName.MessageType] = FieldSpec(
             field_name=FieldName.MessageType,
             offset=1,
             length=1,
             field_type=FieldType.Value,
         )
-        self._field_specs[FieldName.TimeOffset] = FieldSpec(
+        field_specs[FieldName.TimeOffset] = FieldSpec(
             field_name=FieldName.TimeOffset,
             offset=2,
             length=4,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.OrderId] = FieldSpec(
+        field_specs[FieldName.OrderId] = FieldSpec(
             field_name=FieldName.OrderId,
             offset=6,
             length=8,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.SideIndicator] = FieldSpec(
+        field_specs[FieldName.SideIndicator] = FieldSpec(
             field_name=FieldName.SideIndicator,
             offset=14,
             length=1,
             field_type=FieldType.Alphanumeric,
         )
-        self._field_specs[FieldName.Quantity] = FieldSpec(
+        field_specs[FieldName.Quantity] = FieldSpec(
             field_name=FieldName.Quantity,
             offset=15,
             length=4,
             field_type=FieldType.Binary,
         )
-        self._field_specs[FieldName.Symbol] = FieldSpec(
+        field_specs[FieldName.Symbol] = FieldSpec(
             field_name=FieldName.Symbol,
             offset=19,
             length=6,
             field_type=FieldType.PrintableAscii,
         )
-        self._field_specs[FieldName.Price] = FieldSpec(
+        field_specs[FieldName.Price] = FieldSpec(
             field_name=FieldName.Price,
             offset=25,
             length=8,
             field_type=FieldType.BinaryLongPrice,
         )
-        self._field_specs[FieldName.ExecutionId] = FieldSpec(
+        field_specs[FieldName.ExecutionId] = FieldSpec(
             field_name=FieldName.ExecutionId,
             offset=33,
             length=8,
             field_type=FieldType.PrintableAscii,
         )
+        return field_specs
 
     def set_fields(
         self,
@@ -66,22 +72,25 @@ class TradeBase(MessageBase):
         price: float,
         execution_id: str,
     ):
-        self._field_specs[FieldName.TimeOffset].value(time_offset)
+        self._set(FieldName.TimeOffset, time_offset)
         self.order_id(order_id)
-        self._field_specs[FieldName.SideIndicator].value(side)
-        self._field_specs[FieldName.Quantity].value(quantity)
-        self._field_specs[FieldName.Symbol].value(symbol)
-        self._field_specs[FieldName.Price].value(price)
+        self._set(FieldName.SideIndicator, side)
+        self._set(FieldName.Quantity, quantity)
+        self._set(FieldName.Symbol, symbol)
+        self.price(price)
         self.execution_id(execution_id)
 
 
 class TradeLong(TradeBase):
     _messageType = 0x2A
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(41)
-        self._field_specs[FieldName.MessageType].value(self._messageType)
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(41)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+        return field_specs
 
     @staticmethod
     def from_parms(
@@ -108,20 +117,23 @@ class TradeLong(TradeBase):
 
 class TradeShort(TradeBase):
     _messageType = 0x2B
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(33)
-        self._field_specs[FieldName.MessageType].value(self._messageType)
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(33)
+        field_specs[FieldName.MessageType].value(cls._messageType)
 
-        self._field_specs[FieldName.Quantity].offset(15)
-        self._field_specs[FieldName.Quantity].length(2)
-        self._field_specs[FieldName.Symbol].offset(17)
+        field_specs[FieldName.Quantity].offset(15)
+        field_specs[FieldName.Quantity].length(2)
+        field_specs[FieldName.Symbol].offset(17)
 
-        self._field_specs[FieldName.Price].offset(23)
-        self._field_specs[FieldName.Price].length(2)
-        self._field_specs[FieldName.Price].field_type(FieldType.BinaryShortPrice)
-        self._field_specs[FieldName.ExecutionId].offset(25)
+        field_specs[FieldName.Price].offset(23)
+        field_specs[FieldName.Price].length(2)
+        field_specs[FieldName.Price].field_type(FieldType.BinaryShortPrice)
+        field_specs[FieldName.ExecutionId].offset(25)
+        return field_specs
 
     @staticmethod
     def from_parms(
@@ -148,17 +160,20 @@ class TradeShort(TradeBase):
 
 class TradeExpanded(TradeBase):
     _messageType = 0x30
-
-    def __init__(self):
-        super().__init__()
-        self._field_specs[FieldName.Length].value(43)
-        self._field_specs[FieldName.MessageType].value(self._messageType)
-
-        self._field_specs[FieldName.Symbol].length(8)
-        self._field_specs[FieldName.Price].offset(27)
-        self._field_specs[FieldName.Price].length(8)
-        self._field_specs[FieldName.ExecutionId].offset(35)
-        self._field_specs[FieldName.ExecutionId].length(8)
+    __slots__ = ()
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length].value(43)
+        field_specs[FieldName.MessageType].value(cls._messageType)
+
+        field_specs[FieldName.Symbol].length(8)
+        field_specs[FieldName.Price].offset(27)
+        field_specs[FieldName.Price].length(8)
+        field_specs[FieldName.ExecutionId].offset(35)
+        field_specs[FieldName.ExecutionId].length(8)
+        return field_specs
 
     @staticmethod
     def from_parms(
@@ -0,0 +1,136 @@
+import struct
+from typing import BinaryIO, Iterable
+
+from .pitch24 import MessageBase
+
+
+class UnitEncoder:
+    """
+    Serializes a stream of messages into back to back Sequenced Unit
+    Headers held in one contiguous, preallocated buffer.
+
+    Messages are encoded in place with encode_into().  A header is reserved
+    when a unit is opened and filled in with its final Hdr Length and Hdr
+    Count when the unit is closed, so each message is visited only once.
+
+    A new unit is started when the next message would take the current one
+    past 'max_hdr_length' bytes or 255 messages.
+    """
+
+    _header = struct.Struct("<HBBI")
+
+    def __init__(
+        self,
+        hdr_sequence: int = 1,
+        hdr_unit: int = 1,
+        max_hdr_length: int = 1_400,
+        capacity: int = 1024 * 1024,
+    ):
+        if max_hdr_length <= UnitEncoder._header.size or max_hdr_length > 0xFFFF:
+            raise Exception(f"Invalid max Hdr Length {max_hdr_length}")
+        self._hdr_sequence = hdr_sequence
+        self._hdr_unit = hdr_unit
+        self._max_hdr_length = max_hdr_length
+
+        self._buf = bytearray(max(capacity, max_hdr_length))
+        self._end = 0
+        self._units = 0
+
+        # Unit being filled: offset of its header, or None
+        self._hdr_offset = None
+        self._hdr_count = 0
+
+    def _reserve(self, length: int) -> None:
+        if self._end + length > len(self._buf):
+            self._buf.extend(bytes(max(len(self._buf), length)))
+
+    def _open_unit(self) -> None:
+        self._reserve(UnitEncoder._header.size)
+        self._hdr_offset = self._end
+        self._hdr_count = 0
+        self._end += UnitEncoder._header.size
+
+    def _close_unit(self) -> None:
+        if self._hdr_offset is None:
+            return
+        UnitEncoder._header.pack_into(
+            self._buf,
+            self._hdr_offset,
+            self._end - self._hdr_offset,
+            self._hdr_count,
+            self._hdr_unit,
+            self._hdr_sequence,
+        )
+        self._hdr_sequence += self._hdr_count
+        self._units += 1
+        self._hdr_offset = None
+        self._hdr_count = 0
+
+    def add(self, message: MessageBase) -> None:
+        length = message.length()
+        if self._hdr_offset is not None and (
+            self._end - self._hdr_offset + length > self._max_hdr_length
+            or self._hdr_count == 255
+        ):
+            self._close_unit()
+        if self._hdr_offset is None:
+            self._open_unit()
+
+        self._reserve(length)
+        self._end = message.encode_into(self._buf, self._end)
+        self._hdr_count += 1
+
+    def add_all(self, messages: Iterable[MessageBase]) -> None:
+        for message in messages:
+            self.add(message)
+
+    def next_sequence(self) -> int:
+        """
+        Hdr Sequence of the next unit, once the current one is closed.
+        """
+        return self._hdr_sequence + self._hdr_count
+
+    def units(self) -> int:
+        return self._units + (0 if self._hdr_offset is None else 1)
+
+    def __len__(self) -> int:
+        return self._end
+
+    def get_bytes(self) -> bytearray:
+        """
+        Close the current unit and return a copy of everything encoded.
+        """
+        self._close_unit()
+        return self._buf[: self._end]
+
+    def write_to(self, f_out: BinaryIO) -> int:
+        """
+        Close the current unit, write everything encoded with a single
+        write() and start over with an empty buffer.  The buffer is kept,
+        as is the Hdr Sequence.
+
+        Returns the number of bytes written.
+        """
+        self._close_unit()
+        with memoryview(self._buf) as buf:
+            written = f_out.write(buf[: self._end])
+        self.clear()
+        return written
+
+    def clear(self) -> None:
+        self._close_unit()
+        self._end = 0
+        self._units = 0
+
+    @staticmethod
+    def encode(
+        messages: Iterable[MessageBase],
+        hdr_sequence: int = 1,
+        hdr_unit: int = 1,
+        max_hdr_length: int = 1_400,
+    ) -> bytearray:
+        unit_encoder = UnitEncoder(
+            hdr_sequence=hdr_sequence, hdr_unit=hdr_unit, max_hdr_length=max_hdr_length
+        )
+        unit_encoder.add_all(messages)
+        return unit_encoder.get_bytes()
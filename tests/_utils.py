@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import List
+
+from cboe_pitch.generator import Generator, WatchListItem
+from cboe_pitch.orderbook import OrderBook, Side
+from cboe_pitch.pitch24 import MessageBase
+
+
+def watch_list_item(ticker: str, weight: float, price_range) -> WatchListItem:
+    return WatchListItem(
+        ticker=ticker,
+        weight=weight,
+        book_size_range=(5, 20),
+        price_range=price_range,
+        size_range=(25, 200),
+    )
+
+
+def generator(watch_list: List[WatchListItem], start_time: datetime) -> Generator:
+    return Generator(
+        watch_list=watch_list,
+        msg_rate_p_sec=30,
+        start_time=start_time,
+        seed=100,
+        price_ticks=True,
+    )
+
+
+def generate_messages(gen: Generator, count: int) -> List[MessageBase]:
+    messages = [gen.getNextMsg() for _ in range(count)]
+    return [x for x in messages if x is not None]
+
+
+def book_state(orderbook: OrderBook):
+    """
+    Orders of every side of every ticker, in priority order.
+    """
+    return {
+        (ticker, side): [
+            (x.order_id, x.price, x.quantity)
+            for x in orderbook.get_orders(ticker=ticker, side=side)
+        ]
+        for ticker in orderbook.tickers()
+        for side in (Side.Buy, Side.Sell)
+    }
@@ -0,0 +1,213 @@
+from datetime import datetime
+from unittest import TestCase
+
+import pkg_resources
+from hamcrest import assert_that, equal_to, has_length
+
+from cboe_pitch.add_order import AddOrderLong
+from cboe_pitch.book_builder import BookBuilder
+from cboe_pitch.delete_order import DeleteOrder
+from cboe_pitch.file_parser import FileParser
+from cboe_pitch.modify import ModifyOrderShort
+from cboe_pitch.order_executed import OrderExecuted, OrderExecutedAtPriceSize
+from cboe_pitch.orderbook import Side
+from cboe_pitch.reduce_size import ReduceSizeLong
+from cboe_pitch.trade import TradeExpanded, TradeLong, TradeShort
+from cboe_pitch.unit_encoder import UnitEncoder
+from tests._utils import generate_messages, generator, watch_list_item
+
+
+def add_order(order_id: str, side: str, quantity: int, price: float) -> AddOrderLong:
+    return AddOrderLong.from_parms(
+        time_offset=0,
+        order_id=order_id,
+        side=side,
+        quantity=quantity,
+        symbol="MSFT",
+        price=price,
+    )
+
+
+class TestBookBuilder(TestCase):
+    def test_from_file(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+
+        # WHEN
+        book_builder = BookBuilder.from_file(file_path=full_path)
+
+        # THEN
+        orderbook = book_builder.orderbook()
+        assert_that(book_builder.messages(), equal_to(8))
+        assert_that(sorted(orderbook.tickers()), equal_to(["GE", "MSFT"]))
+        assert_that(
+            [x.order_id for x in orderbook.get_orders(ticker="GE", side=Side.Sell)],
+            equal_to(["ORID0008", "ORID0007", "ORID0006"]),
+        )
+        assert_that(
+            orderbook.best_level(ticker="MSFT", side=Side.Buy).price, equal_to(3_320_800)
+        )
+
+    def test_views_match_messages(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+
+        # WHEN
+        from_messages = BookBuilder()
+        from_messages.apply_all(FileParser.iter_messages(file_path=full_path))
+        from_views = BookBuilder.from_file(file_path=full_path)
+
+        # THEN
+        for ticker in ("GE", "MSFT"):
+            assert_that(
+                from_messages.orderbook().get_order_book(ticker),
+                equal_to(from_views.orderbook().get_order_book(ticker)),
+            )
+
+    def test_order_lifecycle(self):
+        # GIVEN
+        book_builder = BookBuilder()
+        messages = [
+            add_order("ORID0001", "B", 300, 331.25),
+            add_order("ORID0002", "B", 200, 331.25),
+            add_order("ORID0003", "S", 100, 331.50),
+            ReduceSizeLong.from_parms(
+                time_offset=1, order_id="ORID0001", canceled_quantity=50
+            ),
+            OrderExecuted.from_parms(
+                time_offset=2,
+                order_id="ORID0002",
+                executed_quantity=200,
+                execution_id="EXID0001",
+            ),
+            OrderExecutedAtPriceSize.from_parms(
+                time_offset=3,
+                order_id="ORID0001",
+                executed_quantity=100,
+                remaining_quantity=150,
+                execution_id="EXID0002",
+                price=331.20,
+            ),
+            # Short prices are in cents, the book is in 1/10_000 dollars
+            ModifyOrderShort.from_parms(
+                time_offset=4, order_id="ORID0003", quantity=75, price=331.75
+            ),
+            DeleteOrder.from_parms(time_offset=5, order_id="ORID0009"),
+        ]
+
+        # WHEN
+        book_builder.apply_all(messages)
+
+        # THEN
+        orderbook = book_builder.orderbook()
+        buys = orderbook.get_orders(ticker="MSFT", side=Side.Buy)
+        assert_that(
+            [(x.order_id, x.price, x.quantity) for x in buys],
+            equal_to([("ORID0001", 3_312_500, 150)]),
+        )
+        sells = orderbook.get_orders(ticker="MSFT", side=Side.Sell)
+        assert_that(
+            [(x.order_id, x.price, x.quantity) for x in sells],
+            equal_to([("ORID0003", 3_317_500, 75)]),
+        )
+        assert_that(book_builder.messages(), equal_to(7))
+        assert_that(book_builder.missing_orders(), equal_to(1))
+
+    def test_interleaved_units(self):
+        # GIVEN
+        # Each Hdr Unit counts its own sequence: unit 1 has 1 to 10, unit 2
+        # has 1 to 3
+        unit_1 = UnitEncoder(hdr_sequence=1, hdr_unit=1)
+        unit_1.add_all(
+            add_order(f"ORID{idx:04}", "B", 100, 331.25) for idx in range(10)
+        )
+        unit_2 = UnitEncoder(hdr_sequence=1, hdr_unit=2)
+        unit_2.add_all(
+            add_order(f"ORID{idx:04}", "S", 100, 331.50) for idx in range(10, 13)
+        )
+
+        # WHEN
+        book_builder = BookBuilder()
+        book_builder.apply_buffer(unit_1.get_bytes() + unit_2.get_bytes())
+
+        # THEN
+        assert_that(book_builder.messages(), equal_to(13))
+        assert_that(book_builder.hdr_sequences(), equal_to({1: 10, 2: 3}))
+        assert_that(book_builder.hdr_sequence(hdr_unit=2), equal_to(3))
+        assert_that(
+            book_builder.orderbook().order_count(ticker="MSFT", side=Side.Sell),
+            equal_to(3),
+        )
+
+    def test_trade_leaves_book_alone(self):
+        # GIVEN
+        book_builder = BookBuilder()
+        book_builder.apply(add_order("ORID0001", "B", 300, 331.25))
+        trades = [
+            TradeShort.from_parms(
+                time_offset=1,
+                order_id="ORID0001",
+                side="B",
+                quantity=100,
+                symbol="MSFT",
+                price=331.25,
+                execution_id="EXID0001",
+            ),
+            TradeLong.from_parms(
+                time_offset=2,
+                order_id="ORID0001",
+                side="B",
+                quantity=300,
+                symbol="MSFT",
+                price=331.25,
+                execution_id="EXID0002",
+            ),
+        ]
+
+        # WHEN
+        book_builder.apply_all(trades)
+
+        # THEN
+        buys = book_builder.orderbook().get_orders(ticker="MSFT", side=Side.Buy)
+        assert_that(
+            [(x.order_id, x.price, x.quantity) for x in buys],
+            equal_to([("ORID0001", 3_312_500, 300)]),
+        )
+        assert_that(book_builder.messages(), equal_to(1))
+
+    def test_replays_generator(self):
+        # GIVEN
+        gen = generator(
+            [watch_list_item("GE", 1.0, (50.00, 55.00))],
+            start_time=datetime(2023, 5, 7, 9, 30, 0),
+        )
+        messages = generate_messages(gen, 2_000)
+
+        # WHEN
+        book_builder = BookBuilder()
+        book_builder.apply_all(messages)
+
+        # THEN
+        # The generator also takes displayed orders out of its book with Trade
+        # messages, which contradicts the spec: Trade messages are for orders
+        # that were never displayed and leave the book alone (see
+        # test_trade_leaves_book_alone), so those orders are left out here
+        traded = {
+            x.order_id()
+            for x in messages
+            if isinstance(x, (TradeLong, TradeShort, TradeExpanded))
+        }
+        for side in (Side.Buy, Side.Sell):
+            expected = [
+                (x.order_id, x.price, x.quantity)
+                for x in gen._orderbook.get_orders(ticker="GE", side=side)
+            ]
+            replayed = [
+                (x.order_id, x.price, x.quantity)
+                for x in book_builder.orderbook().get_orders(ticker="GE", side=side)
+                if x.order_id not in traded
+            ]
+            assert_that(replayed, has_length(len(expected)))
+            assert_that(sorted(replayed), equal_to(sorted(expected)))
@@ -0,0 +1,212 @@
+import os
+import tempfile
+from datetime import datetime
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, greater_than_or_equal_to, less_than
+
+from cboe_pitch.book_builder import BookBuilder
+from cboe_pitch.checkpoint import Checkpointer, CheckpointIndex
+from cboe_pitch.time import Time
+from cboe_pitch.unit_encoder import UnitEncoder
+from tests._utils import book_state, generate_messages, generator, watch_list_item
+
+
+def replay_until(messages, time_ns: int) -> BookBuilder:
+    book_builder = BookBuilder()
+    seconds = 0
+    for message in messages:
+        if isinstance(message, Time):
+            seconds = message.time()
+            message_ns = seconds * 1_000_000_000
+        else:
+            message_ns = seconds * 1_000_000_000 + message.time_offset()
+        if message_ns > time_ns:
+            break
+        book_builder.apply(message)
+    return book_builder
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        gen = generator(
+            [
+                watch_list_item("GE", 0.5, (50.00, 55.00)),
+                watch_list_item("MSFT", 0.5, (330.00, 335.00)),
+            ],
+            start_time=datetime(2023, 5, 7, 10, 30, 0),
+        )
+        self._messages = generate_messages(gen, 3_000)
+        self._capture_path = os.path.join(self._tmp_dir.name, "capture.dat")
+        self._checkpoint_path = os.path.join(self._tmp_dir.name, "capture.ckp")
+
+        unit_encoder = UnitEncoder(hdr_sequence=1, max_hdr_length=200)
+        unit_encoder.add_all(self._messages)
+        with open(self._capture_path, "wb") as f_out:
+            unit_encoder.write_to(f_out)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_every_messages(self):
+        # GIVEN
+        checkpointer = Checkpointer(every_messages=500)
+
+        # WHEN
+        checkpoints = checkpointer.write(self._capture_path, self._checkpoint_path)
+
+        # THEN
+        with CheckpointIndex(self._capture_path, self._checkpoint_path) as index:
+            assert_that(index.checkpoints(), equal_to(checkpoints))
+            assert_that(len(checkpoints), equal_to(len(self._messages) // 500))
+            for previous, checkpoint in zip(checkpoints, checkpoints[1:]):
+                assert_that(
+                    checkpoint.hdr_sequences[1] - previous.hdr_sequences[1],
+                    greater_than_or_equal_to(500),
+                )
+
+            for hdr_sequence in (1, 499, 500, 1_234, 2_001, len(self._messages)):
+                expected = BookBuilder()
+                expected.apply_all(self._messages[:hdr_sequence])
+
+                book_builder = index.at_sequence(hdr_sequence)
+
+                assert_that(book_builder.hdr_sequence(), equal_to(hdr_sequence))
+                assert_that(
+                    book_state(book_builder.orderbook()),
+                    equal_to(book_state(expected.orderbook())),
+                )
+
+    def test_every_messages_mid_session(self):
+        # GIVEN
+        # Capture started mid-session, so the first Hdr Sequence is not 1
+        unit_encoder = UnitEncoder(hdr_sequence=5_000_000, max_hdr_length=200)
+        unit_encoder.add_all(self._messages)
+        with open(self._capture_path, "wb") as f_out:
+            unit_encoder.write_to(f_out)
+        checkpointer = Checkpointer(every_messages=500)
+
+        # WHEN
+        checkpoints = checkpointer.write(self._capture_path, self._checkpoint_path)
+
+        # THEN
+        assert_that(len(checkpoints), equal_to(len(self._messages) // 500))
+        # At most 32 messages of 6 bytes or more in a unit of 200 bytes
+        hdr_sequences = [4_999_999] + [x.hdr_sequences[1] for x in checkpoints]
+        for previous, hdr_sequence in zip(hdr_sequences, hdr_sequences[1:]):
+            assert_that(hdr_sequence - previous, greater_than_or_equal_to(500))
+            assert_that(hdr_sequence - previous, less_than(500 + 32))
+
+        with CheckpointIndex(self._capture_path, self._checkpoint_path) as index:
+            expected = BookBuilder()
+            expected.apply_all(self._messages[:1_234])
+
+            book_builder = index.at_sequence(4_999_999 + 1_234)
+
+            assert_that(book_builder.hdr_sequence(), equal_to(4_999_999 + 1_234))
+            assert_that(
+                book_state(book_builder.orderbook()),
+                equal_to(book_state(expected.orderbook())),
+            )
+
+    def test_every_seconds(self):
+        # GIVEN
+        checkpointer = Checkpointer(every_seconds=10)
+
+        # WHEN
+        checkpoints = checkpointer.write(self._capture_path, self._checkpoint_path)
+
+        # THEN
+        times = [x.time for x in checkpoints]
+        assert_that(len(times), greater_than_or_equal_to(5))
+        for previous, time in zip(times, times[1:]):
+            assert_that(time - previous, greater_than_or_equal_to(10))
+
+        with CheckpointIndex(self._capture_path, self._checkpoint_path) as index:
+            for time_ns in (
+                CheckpointIndex.time_ns(10, 30, 0.5),
+                CheckpointIndex.time_ns(10, 30, 31.123),
+                CheckpointIndex.time_ns(10, 31, 7.123),
+                CheckpointIndex.time_ns(11, 0, 0),
+            ):
+                checkpoint = index.find_time(time_ns)
+                if checkpoint is not None:
+                    assert_that(
+                        (checkpoint.time + 1) * 1_000_000_000 <= time_ns, equal_to(True)
+                    )
+
+                book_builder = index.at_time(time_ns)
+
+                expected = replay_until(self._messages, time_ns)
+                assert_that(
+                    book_state(book_builder.orderbook()),
+                    equal_to(book_state(expected.orderbook())),
+                )
+
+    def test_interleaved_units(self):
+        # GIVEN
+        # Units of 8 messages, alternately of Hdr Unit 1 and 2, each unit
+        # counting its own sequence from 1
+        unit_bytes = []
+        # Hdr Unit, Hdr Sequence and message, in capture order
+        sequenced = []
+        next_sequences = {1: 1, 2: 1}
+        for idx in range(0, len(self._messages), 8):
+            hdr_unit = 1 + (idx // 8) % 2
+            chunk = self._messages[idx : idx + 8]
+            unit_encoder = UnitEncoder(
+                hdr_sequence=next_sequences[hdr_unit], hdr_unit=hdr_unit
+            )
+            unit_encoder.add_all(chunk)
+            unit_bytes.append(bytes(unit_encoder.get_bytes()))
+            for message in chunk:
+                sequenced.append((hdr_unit, next_sequences[hdr_unit], message))
+                next_sequences[hdr_unit] += 1
+        with open(self._capture_path, "wb") as f_out:
+            f_out.write(b"".join(unit_bytes))
+        checkpointer = Checkpointer(every_messages=500)
+
+        # WHEN
+        checkpoints = checkpointer.write(self._capture_path, self._checkpoint_path)
+
+        # THEN
+        assert_that(checkpoints[0].hdr_sequences, equal_to({1: 256, 2: 248}))
+        with CheckpointIndex(self._capture_path, self._checkpoint_path) as index:
+            assert_that(index.checkpoints(), equal_to(checkpoints))
+            for hdr_unit, hdr_sequence in (
+                (1, 1),
+                (2, 1),
+                (1, 256),
+                (1, 257),
+                (2, 249),
+                (2, 1_234),
+            ):
+                position = next(
+                    idx
+                    for idx, (unit, sequence, _) in enumerate(sequenced)
+                    if (unit, sequence) == (hdr_unit, hdr_sequence)
+                )
+                expected = BookBuilder()
+                expected.apply_all([x[2] for x in sequenced[: position + 1]])
+
+                book_builder = index.at_sequence(hdr_sequence, hdr_unit)
+
+                assert_that(
+                    book_builder.hdr_sequence(hdr_unit), equal_to(hdr_sequence)
+                )
+                assert_that(
+                    book_state(book_builder.orderbook()),
+                    equal_to(book_state(expected.orderbook())),
+                )
+
+    def test_not_a_checkpoint_file(self):
+        # WHEN
+        with self.assertRaises(Exception) as ex:
+            CheckpointIndex(self._capture_path, self._capture_path)
+
+        # THEN
+        assert_that(
+            str(ex.exception),
+            equal_to(f"File {self._capture_path} is not a checkpoint file"),
+        )
@@ -0,0 +1,113 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+import pkg_resources
+from hamcrest import assert_that, equal_to, has_length
+
+from cboe_pitch.add_order import AddOrderLong, AddOrderShort
+from cboe_pitch.columnar import ColumnarDecoder
+from cboe_pitch.message_factory import UnknownMessageType
+from cboe_pitch.pitch24 import FieldName
+from cboe_pitch.seq_unit_header import SequencedUnitHeader
+from cboe_pitch.time import Time
+from cboe_pitch.trade import TradeShort
+
+
+class TestColumnarDecoder(TestCase):
+    def test_column_name(self):
+        # THEN
+        assert_that(
+            ColumnarDecoder.column_name(FieldName.TimeOffset), equal_to("time_offset")
+        )
+        assert_that(ColumnarDecoder.column_name(FieldName.Symbol), equal_to("symbol"))
+
+    def test_wire_dtype_mirrors_field_table(self):
+        # WHEN
+        wire_dtype = ColumnarDecoder.wire_dtype(TradeShort)
+
+        # THEN
+        assert_that(wire_dtype.itemsize, equal_to(33))
+        assert_that(wire_dtype.fields["quantity"][1], equal_to(15))
+        assert_that(wire_dtype.fields["symbol"][1], equal_to(17))
+        assert_that(wire_dtype.fields["price"], equal_to((np.dtype("<u2"), 23)))
+        assert_that(wire_dtype.fields["execution_id"][1], equal_to(25))
+
+    def test_from_file(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+
+        # WHEN
+        messages = ColumnarDecoder.from_file(file_path=full_path)
+
+        # THEN
+        assert_that(set(messages.keys()), equal_to({Time, AddOrderShort, AddOrderLong}))
+        assert_that(messages[Time], has_length(2))
+        assert_that(messages[AddOrderShort], has_length(2))
+        assert_that(messages[AddOrderLong], has_length(6))
+
+        add_orders = messages[AddOrderLong]
+        assert_that(list(add_orders["hdr_sequence"]), equal_to([4, 4, 6, 6, 9, 9]))
+        assert_that(list(add_orders["msg_index"]), equal_to([0, 1, 0, 2, 0, 1]))
+        assert_that(add_orders["symbol"][0], equal_to(b"MSFT  "))
+        assert_that(int(add_orders["quantity"][0]), equal_to(30))
+        assert_that(int(add_orders["price"][1]), equal_to(3_238_000))
+        assert_that(
+            list(ColumnarDecoder.float_prices(AddOrderShort, messages[AddOrderShort])),
+            equal_to([332.08, 51.91]),
+        )
+
+    def test_matches_message_decode(self):
+        # GIVEN
+        seq_unit_hdr = SequencedUnitHeader(hdr_sequence=20)
+        seq_unit_hdr.addMessage(Time.from_parms(time=34_200))
+        seq_unit_hdr.addMessage(
+            AddOrderShort.from_parms(
+                time_offset=100,
+                order_id="ORID0100",
+                side="S",
+                quantity=100,
+                symbol="AAPL",
+                price=100.25,
+            )
+        )
+
+        # WHEN
+        messages = ColumnarDecoder.from_buffer(bytes(seq_unit_hdr.get_bytes()))
+
+        # THEN
+        add_order = messages[AddOrderShort][0]
+        assert_that(int(messages[Time][0]["time"]), equal_to(34_200))
+        assert_that(int(add_order["hdr_sequence"]), equal_to(20))
+        assert_that(int(add_order["msg_index"]), equal_to(1))
+        assert_that(add_order["side_indicator"], equal_to(b"S"))
+        assert_that(int(add_order["price"]), equal_to(10_025))
+        assert_that(
+            ColumnarDecoder.float_prices(AddOrderShort, messages[AddOrderShort])[0],
+            equal_to(100.25),
+        )
+        assert_that(
+            int(add_order["order_id"]),
+            equal_to(int.from_bytes(b"ORID0100", "little")),
+        )
+
+    def test_from_file_unknown_message_type(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+        msg_bytes = bytearray(Path(full_path).read_bytes())
+        # Type of the first message
+        msg_bytes[9] = 0x99
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "unknown.dat"
+            file_path.write_bytes(msg_bytes)
+
+            # WHEN
+            with self.assertRaises(UnknownMessageType) as ex:
+                ColumnarDecoder.from_file(file_path=file_path)
+
+        # THEN
+        # Not hidden by a BufferError from closing the mapped file
+        assert_that(str(ex.exception), equal_to("Unknown type 0x99"))
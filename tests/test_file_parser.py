@@ -2,9 +2,12 @@ from unittest import TestCase
 
 from hamcrest import assert_that, equal_to, has_length, instance_of
 
+import tempfile
 from pathlib import Path
 from cboe_pitch.file_parser import FileParser
+from cboe_pitch.message_factory import UnknownMessageType
 from cboe_pitch.add_order import AddOrderShort, AddOrderLong
+from cboe_pitch.seq_unit_header import SequencedUnitHeader
 from cboe_pitch.time import Time
 import pkg_resources
 
@@ -63,3 +66,79 @@ class TestFileParser(TestCase):
         assert_that(seq_array[3].getMessages()[0], instance_of(AddOrderLong))
         assert_that(seq_array[3].getMessages()[0].order_id(), equal_to("ORID0007"))
         assert_that(seq_array[3].getMessages()[1], instance_of(AddOrderLong))
+
+    def test_iter_units(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+
+        # WHEN
+        seq_iter = FileParser.iter_units(file_path=full_path)
+        first_seq = next(seq_iter)
+        rem_seqs = list(seq_iter)
+
+        # THEN
+        assert_that(first_seq, instance_of(SequencedUnitHeader))
+        assert_that(first_seq.hdr_sequence(), equal_to(1))
+        assert_that(first_seq.getMessages(), has_length(3))
+        assert_that(rem_seqs, has_length(3))
+        assert_that(rem_seqs[-1].hdr_sequence(), equal_to(9))
+
+    def test_iter_messages(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+
+        # WHEN
+        messages = list(FileParser.iter_messages(file_path=full_path))
+
+        # THEN
+        assert_that(messages, has_length(10))
+        assert_that(messages[0], instance_of(Time))
+        assert_that(messages[-1].order_id(), equal_to("ORID0008"))
+
+    def test_parse_empty_file(self):
+        # GIVEN
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "empty.dat"
+            file_path.write_bytes(b"")
+
+            # WHEN
+            seq_array = FileParser.parse_file(file_path=file_path)
+
+        # THEN
+        assert_that(seq_array, has_length(0))
+
+    def test_parse_truncated_file(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "truncated.dat"
+            file_path.write_bytes(Path(full_path).read_bytes()[:-5])
+
+            # WHEN
+            with self.assertRaises(Exception) as ex:
+                FileParser.parse_file(file_path=file_path)
+
+        # THEN
+        # Not hidden by a BufferError from closing the mapped file
+        assert_that(str(ex.exception), equal_to("Invalid Hdr Length 76 at offset 224"))
+
+    def test_parse_unknown_message_type(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+        msg_bytes = bytearray(Path(full_path).read_bytes())
+        # Type of the first message
+        msg_bytes[9] = 0x99
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "unknown.dat"
+            file_path.write_bytes(msg_bytes)
+
+            # WHEN
+            with self.assertRaises(UnknownMessageType) as ex:
+                FileParser.parse_file(file_path=file_path)
+
+        # THEN
+        assert_that(str(ex.exception), equal_to("Unknown type 0x99"))
@@ -20,6 +20,7 @@ from cboe_pitch.add_order import AddOrderLong, AddOrderShort
 from cboe_pitch.delete_order import DeleteOrder
 from cboe_pitch.generator import Generator
 from cboe_pitch.generator import WatchListItem
+from cboe_pitch.modify import ModifyOrderShort
 from cboe_pitch.order_executed import OrderExecutedAtPriceSize
 from cboe_pitch.orderbook import Side
 from cboe_pitch.reduce_size import ReduceSizeLong
@@ -91,6 +92,99 @@ class TestGenerator(TestCase):
         with self.assertRaises(Exception):
             gen = Generator(watch_list=watch_list)
 
+    def test_price_ticks(self):
+        # GIVEN
+        watch_list = [
+            WatchListItem(
+                ticker="GE",
+                weight=1.0,
+                book_size_range=(1, 3),
+                price_range=(0.25, 0.35),
+                size_range=(25, 200),
+            )
+        ]
+        gen = Generator(
+            watch_list=watch_list,
+            msg_rate_p_sec=30,
+            start_time=datetime(2023, 5, 7, 9, 30, 0),
+            seed=100,
+            price_ticks=True,
+        )
+
+        # WHEN
+        messages = [gen.getNextMsg() for _ in range(200)]
+
+        # THEN
+        for side in (Side.Buy, Side.Sell):
+            for order in gen._orderbook.get_orders(ticker="GE", side=side):
+                assert_that(order.price, instance_of(int))
+                assert_that(order.price % 100, equal_to(0))
+        book_prices = {
+            order.order_id: order.price
+            for side in (Side.Buy, Side.Sell)
+            for order in gen._orderbook.get_orders(ticker="GE", side=side)
+        }
+        add_orders = [x for x in messages if isinstance(x, (AddOrderLong, AddOrderShort))]
+        assert_that(len(add_orders) > 0, equal_to(True))
+        modified = {
+            x.order_id() for x in messages if isinstance(x, (ModifyOrderLong, ModifyOrderShort))
+        }
+        for message in add_orders:
+            if message.order_id() in book_prices and message.order_id() not in modified:
+                assert_that(
+                    message.price_ticks() * (10_000 // message._schema.price_scale),
+                    equal_to(book_prices[message.order_id()]),
+                )
+
+    def test_levels_match_orders(self):
+        # GIVEN
+        watch_list = [
+            WatchListItem(
+                ticker="GE",
+                weight=1.0,
+                book_size_range=(5, 20),
+                price_range=(0.25, 0.35),
+                size_range=(25, 200),
+            )
+        ]
+        gen = Generator(
+            watch_list=watch_list,
+            msg_rate_p_sec=30,
+            start_time=datetime(2023, 5, 7, 9, 30, 0),
+            seed=100,
+            price_ticks=True,
+        )
+
+        # WHEN
+        for _ in range(1_000):
+            gen.getNextMsg()
+
+        # THEN
+        for side in (Side.Buy, Side.Sell):
+            orders = gen._orderbook.get_orders(ticker="GE", side=side)
+            levels = gen._orderbook.get_levels(ticker="GE", side=side)
+            assert_that(
+                [x.price for x in levels],
+                equal_to(sorted({x.price for x in orders}, reverse=side == Side.Buy)),
+            )
+            for level in levels:
+                assert_that(
+                    level.quantity,
+                    equal_to(sum(x.quantity for x in orders if x.price == level.price)),
+                )
+
+    def test_clock_ns(self):
+        # GIVEN
+        gen = setupTest(ticker="NVDA", side=Side.Buy, num_orders=0)
+        start_ns = int(datetime(2023, 5, 7, 9, 30, 0).timestamp()) * 1_000_000_000
+
+        # WHEN
+        gen.getNextMsg()
+        gen.getNextMsg()
+
+        # THEN
+        assert_that(gen.clock_ns(), equal_to(start_ns + 1_000_000_000 + 1_000_000_000 // 30))
+
 #    def test_pickTicker_EdgeCase_1(self):
 #        # GIVEN
 #        watch_list = [WatchListItem(ticker="TSLA", weight=0.40)]
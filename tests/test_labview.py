@@ -18,9 +18,11 @@ from cboe_pitch import (
     get_reduce_size_long, get_reduce_size_short,
     get_modify_order_long, get_modify_order_short,
     get_delete_order,
-    get_trade_long, get_trade_short, get_trade_expanded
+    get_trade_long, get_trade_short, get_trade_expanded,
+    get_messages, get_seq_units
 )
 from cboe_pitch.message_factory import MessageFactory
+from cboe_pitch.seq_unit_header import SequencedUnitHeader
 
 from cboe_pitch.time import Time
 from cboe_pitch.add_order import AddOrderLong, AddOrderShort, AddOrderExpanded
@@ -575,3 +577,71 @@ class TestSequencedUnitHeader(TestCase):
         #full_msg_array = None
         #full_msg_array.extend(new_time_msg)
         #full_msg_array.extend(new_add_order_msg)
+
+
+class TestBatch(TestCase):
+    def test_get_messages_mixed_types(self):
+        # GIVEN
+        time_args = {"Time": 34_300}
+        add_order_args = {
+            "Time Offset": 44_000,
+            "Order Id": "ORID0001",
+            "Side Indicator": "B",
+            "Quantity": 95_000,
+            "Symbol": "AAPL",
+            "Price": 0.905,
+        }
+        delete_order_args = {"Time Offset": 45_000, "Order Id": "ORID0001"}
+        args = [
+            {"Message Type": "Time", **time_args},
+            {"Message Type": "AddOrderLong", **add_order_args},
+            {"Message Type": 0x29, **delete_order_args},
+        ]
+
+        # WHEN
+        msg_bytes, offsets = get_messages(Parameters.to_json(args))
+
+        # THEN
+        assert_that(offsets, equal_to([0, 6, 40]))
+        assert_that(msg_bytes, equal_to(
+            get_time(Parameters.to_json(time_args))
+            + get_add_order_long(Parameters.to_json(add_order_args))
+            + get_delete_order(Parameters.to_json(delete_order_args))
+        ))
+        assert_that(MessageFactory.from_list(msg_bytes[offsets[2]:]),
+                    instance_of(DeleteOrder))
+
+    def test_get_messages_unknown_type(self):
+        # GIVEN
+        args = [{"Message Type": "UnitClear"}]
+
+        # WHEN
+        with self.assertRaises(Exception) as ex:
+            get_messages(Parameters.to_json(args))
+
+        # THEN
+        assert_that(str(ex.exception), equal_to("Unknown Message Type UnitClear"))
+
+    def test_get_seq_units(self):
+        # GIVEN
+        args = {
+            "HdrSeq": 15,
+            "Max Hdr Length": 20,
+            "Messages": [
+                {"Message Type": "Time", "Time": 34_201},
+                {"Message Type": "Time", "Time": 34_202},
+                {"Message Type": "Time", "Time": 34_203},
+            ],
+        }
+
+        # WHEN
+        msg_bytes = get_seq_units(Parameters.to_json(args))
+
+        # THEN
+        [first_unit, rem_bytes] = SequencedUnitHeader.from_bytestream(bytes(msg_bytes))
+        [second_unit, rem_bytes] = SequencedUnitHeader.from_bytestream(rem_bytes)
+        assert_that(rem_bytes, equal_to(None))
+        assert_that(first_unit.hdr_sequence(), equal_to(15))
+        assert_that(first_unit.hdr_count(), equal_to(2))
+        assert_that(second_unit.hdr_sequence(), equal_to(17))
+        assert_that([x.time() for x in second_unit.getMessages()], equal_to([34_203]))
@@ -0,0 +1,72 @@
+from typing import OrderedDict
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, instance_of
+
+from cboe_pitch.message_factory import MessageFactory, UnknownMessageType
+from cboe_pitch.pitch24 import MessageBase, FieldName, FieldSpec, FieldType
+from cboe_pitch.trade import TradeExpanded
+
+
+class UnitClear(MessageBase):
+    _messageType = 0x97
+    __slots__ = ()
+
+    @classmethod
+    def _field_table(cls) -> OrderedDict[FieldName, FieldSpec]:
+        field_specs = super()._field_table()
+        field_specs[FieldName.Length] = FieldSpec(
+            field_name=FieldName.Length,
+            offset=0,
+            length=1,
+            field_type=FieldType.Binary,
+            value=6,
+        )
+        field_specs[FieldName.MessageType] = FieldSpec(
+            field_name=FieldName.MessageType,
+            offset=1,
+            length=1,
+            field_type=FieldType.Value,
+            value=cls._messageType,
+        )
+        field_specs[FieldName.TimeOffset] = FieldSpec(
+            field_name=FieldName.TimeOffset,
+            offset=2,
+            length=4,
+            field_type=FieldType.Binary,
+        )
+        return field_specs
+
+
+class TestMessageFactory(TestCase):
+    def tearDown(self):
+        MessageFactory._dispatch[UnitClear._messageType] = None
+
+    def test_lookup(self):
+        # THEN
+        assert_that(MessageFactory.lookup(0x30), equal_to(TradeExpanded))
+        assert_that(MessageFactory.lookup(0x97), equal_to(None))
+
+    def test_unknown_type(self):
+        # GIVEN
+        msg_bytes = bytearray([0x6, 0x97, 0x10, 0x0, 0x0, 0x0])
+
+        # WHEN
+        with self.assertRaises(UnknownMessageType) as ctx:
+            MessageFactory.from_bytes(msg_bytes)
+
+        # THEN
+        assert_that(ctx.exception.msg_type, equal_to(0x97))
+
+    def test_register(self):
+        # GIVEN
+        msg_bytes = bytearray([0x6, 0x97, 0x10, 0x0, 0x0, 0x0])
+
+        # WHEN
+        MessageFactory.register(UnitClear)
+        message = MessageFactory.from_bytes(msg_bytes)
+
+        # THEN
+        assert_that(message, instance_of(UnitClear))
+        assert_that(message.time_offset(), equal_to(0x10))
+        assert_that(message.get_bytes(), equal_to(msg_bytes))
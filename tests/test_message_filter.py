@@ -0,0 +1,234 @@
+from unittest import TestCase
+
+import pkg_resources
+from hamcrest import assert_that, equal_to, has_length, instance_of
+
+from cboe_pitch.add_order import AddOrderLong, AddOrderShort, AddOrderExpanded
+from cboe_pitch.book_builder import BookBuilder
+from cboe_pitch.columnar import ColumnarDecoder
+from cboe_pitch.delete_order import DeleteOrder
+from cboe_pitch.file_parser import FileParser
+from cboe_pitch.message_filter import MessageFilter
+from cboe_pitch.modify import ModifyOrderLong
+from cboe_pitch.order_executed import OrderExecuted
+from cboe_pitch.reduce_size import ReduceSizeShort
+from cboe_pitch.seq_unit_header import SequencedUnitHeader
+from cboe_pitch.time import Time
+from cboe_pitch.trade import TradeLong
+
+
+class TestMessageFilter(TestCase):
+    def setUp(self):
+        seq_unit_hdr = SequencedUnitHeader(hdr_sequence=1)
+        seq_unit_hdr.addMessage(Time.from_parms(time=34_200))
+        seq_unit_hdr.addMessage(
+            AddOrderShort.from_parms(
+                time_offset=100,
+                order_id="ORID0001",
+                side="B",
+                quantity=100,
+                symbol="GE",
+                price=52.25,
+            )
+        )
+        seq_unit_hdr.addMessage(
+            AddOrderExpanded.from_parms(
+                time_offset=200,
+                order_id="ORID0002",
+                side="S",
+                quantity=100,
+                symbol="MSFT",
+                price=331.25,
+            )
+        )
+        seq_unit_hdr.addMessage(
+            ModifyOrderLong.from_parms(
+                time_offset=300, order_id="ORID0001", quantity=50, price=52.50
+            )
+        )
+        seq_unit_hdr.addMessage(
+            TradeLong.from_parms(
+                time_offset=400,
+                order_id="ORID0003",
+                side="B",
+                quantity=25,
+                symbol="MSFT",
+                price=331.00,
+                execution_id="EXID0001",
+            )
+        )
+        seq_unit_hdr.addMessage(DeleteOrder.from_parms(time_offset=500, order_id="ORID0002"))
+        seq_unit_hdr.addMessage(DeleteOrder.from_parms(time_offset=600, order_id="ORID0001"))
+        self._msg_bytes = bytes(seq_unit_hdr.get_bytes())
+
+    def test_type_filter(self):
+        # GIVEN
+        message_filter = MessageFilter(msg_types={DeleteOrder._messageType})
+
+        # WHEN
+        [seq_unit_hdr, _] = SequencedUnitHeader.from_buffer(
+            self._msg_bytes, message_filter=message_filter
+        )
+
+        # THEN
+        messages = seq_unit_hdr.getMessages()
+        assert_that(messages, has_length(2))
+        assert_that(messages[0], instance_of(DeleteOrder))
+        # Hdr Count and Hdr Sequence stay the ones on the wire
+        assert_that(seq_unit_hdr.message_count(), equal_to(2))
+        assert_that(seq_unit_hdr.hdr_count(), equal_to(7))
+        assert_that(seq_unit_hdr.hdr_sequence(), equal_to(1))
+        assert_that(seq_unit_hdr.getNextSequence(), equal_to(8))
+
+    def test_symbol_filter_follows_order_ids(self):
+        # GIVEN
+        message_filter = MessageFilter(symbols={"GE"})
+
+        # WHEN
+        [seq_unit_hdr, _] = SequencedUnitHeader.from_buffer(
+            self._msg_bytes, message_filter=message_filter
+        )
+
+        # THEN
+        messages = seq_unit_hdr.getMessages()
+        assert_that(
+            [type(x) for x in messages],
+            equal_to([Time, AddOrderShort, ModifyOrderLong, DeleteOrder]),
+        )
+        assert_that(messages[-1].order_id(), equal_to("ORID0001"))
+
+    def test_filled_order_ids_are_dropped(self):
+        # GIVEN
+        seq_unit_hdr = SequencedUnitHeader(hdr_sequence=1)
+        seq_unit_hdr.addMessage(
+            AddOrderShort.from_parms(
+                time_offset=100,
+                order_id="ORID0001",
+                side="B",
+                quantity=100,
+                symbol="GE",
+                price=52.25,
+            )
+        )
+        seq_unit_hdr.addMessage(
+            OrderExecuted.from_parms(
+                time_offset=200,
+                order_id="ORID0001",
+                executed_quantity=100,
+                execution_id="EXID0001",
+            )
+        )
+        # Order Id used again for another symbol once the first order is gone
+        seq_unit_hdr.addMessage(
+            AddOrderShort.from_parms(
+                time_offset=300,
+                order_id="ORID0001",
+                side="S",
+                quantity=100,
+                symbol="MSFT",
+                price=331.25,
+            )
+        )
+        seq_unit_hdr.addMessage(
+            ReduceSizeShort.from_parms(
+                time_offset=400, order_id="ORID0001", canceled_quantity=100
+            )
+        )
+        message_filter = MessageFilter(symbols={"GE"})
+
+        # WHEN
+        [seq_unit_hdr, _] = SequencedUnitHeader.from_buffer(
+            bytes(seq_unit_hdr.get_bytes()), message_filter=message_filter
+        )
+
+        # THEN
+        assert_that(
+            [type(x) for x in seq_unit_hdr.getMessages()],
+            equal_to([AddOrderShort, OrderExecuted]),
+        )
+
+    def test_filter_reset_per_parse(self):
+        # GIVEN
+        first = SequencedUnitHeader(hdr_sequence=1)
+        first.addMessage(
+            AddOrderShort.from_parms(
+                time_offset=100,
+                order_id="ORID0001",
+                side="B",
+                quantity=100,
+                symbol="GE",
+                price=52.25,
+            )
+        )
+        second = SequencedUnitHeader(hdr_sequence=1)
+        second.addMessage(DeleteOrder.from_parms(time_offset=200, order_id="ORID0001"))
+        message_filter = MessageFilter(symbols={"GE"})
+
+        # WHEN
+        first_messages = ColumnarDecoder.from_buffer(
+            bytes(first.get_bytes()), message_filter
+        )
+        second_messages = ColumnarDecoder.from_buffer(
+            bytes(second.get_bytes()), message_filter
+        )
+
+        # THEN
+        # ORID0001 of the first capture is not an order of the second one
+        assert_that(first_messages[AddOrderShort], has_length(1))
+        assert_that(second_messages, equal_to({}))
+
+    def test_symbol_and_type_filter(self):
+        # GIVEN
+        message_filter = MessageFilter(
+            msg_types={TradeLong._messageType, DeleteOrder._messageType},
+            symbols={"MSFT"},
+        )
+
+        # WHEN
+        messages = ColumnarDecoder.from_buffer(self._msg_bytes, message_filter)
+
+        # THEN
+        assert_that(set(messages.keys()), equal_to({TradeLong, DeleteOrder}))
+        assert_that(messages[TradeLong], has_length(1))
+        assert_that(list(messages[DeleteOrder]["msg_index"]), equal_to([5]))
+
+    def test_filter_file(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+
+        # WHEN
+        messages = list(
+            FileParser.iter_messages(
+                file_path=full_path,
+                message_filter=MessageFilter(
+                    msg_types={AddOrderLong._messageType}, symbols={"GE"}
+                ),
+            )
+        )
+        views = list(
+            FileParser.iter_views(
+                file_path=full_path, message_filter=MessageFilter(symbols={"MSFT"})
+            )
+        )
+
+        # THEN
+        assert_that([x.order_id() for x in messages], equal_to(["ORID0006", "ORID0007", "ORID0008"]))
+        assert_that(views, has_length(6))
+
+    def test_filtered_units_keep_hdr_sequence(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+        book_builder = BookBuilder()
+
+        # WHEN
+        for seq_unit_hdr in FileParser.iter_units(
+            file_path=full_path, message_filter=MessageFilter(symbols={"GE"})
+        ):
+            book_builder.apply_unit(seq_unit_hdr)
+
+        # THEN
+        # Every message of the file was seen, not only those kept
+        assert_that(book_builder.hdr_sequence(), equal_to(10))
+        assert_that(book_builder.orderbook().tickers(), equal_to(["GE"]))
@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+import pkg_resources
+from hamcrest import assert_that, equal_to, has_length
+
+from cboe_pitch.add_order import AddOrderExpanded, AddOrderLong, AddOrderShort
+from cboe_pitch.file_parser import FileParser
+from cboe_pitch.message_view import MessageView
+from cboe_pitch.order_executed import OrderExecutedAtPriceSize
+from cboe_pitch.time import Time
+
+
+class TestMessageView(TestCase):
+    def test_add_order_expanded(self):
+        # GIVEN
+        message = AddOrderExpanded.from_parms(
+            time_offset=448_000,
+            order_id="ORID0001",
+            side="B",
+            quantity=20_000,
+            symbol="AAPL",
+            price=0.9050,
+            participant_id="MPID",
+            customer_indicator="C",
+        )
+        msg_bytes = bytes(3) + bytes(message.get_bytes())
+
+        # WHEN
+        view = MessageView(msg_bytes, 3)
+
+        # THEN
+        assert_that(view.message_class(), equal_to(AddOrderExpanded))
+        assert_that(view.length(), equal_to(41))
+        assert_that(view.messageType(), equal_to(0x2F))
+        assert_that(view.time_offset(), equal_to(448_000))
+        assert_that(view.order_id(), equal_to("ORID0001"))
+        assert_that(view.side(), equal_to("B"))
+        assert_that(view.quantity(), equal_to(20_000))
+        assert_that(view.symbol(), equal_to("AAPL"))
+        assert_that(view.price(), equal_to(0.9050))
+        assert_that(view.displayed(), equal_to(True))
+        assert_that(view.participant_id(), equal_to("MPID"))
+        assert_that(view.customer_indicator(), equal_to("C"))
+        assert_that(view.get_bytes(), equal_to(bytes(message.get_bytes())))
+
+    def test_prices(self):
+        # GIVEN
+        messages = [
+            AddOrderShort.from_parms(
+                time_offset=0,
+                order_id="ORID0001",
+                side="B",
+                quantity=100,
+                symbol="MSFT",
+                price=331.25,
+            ),
+            AddOrderLong.from_parms(
+                time_offset=0,
+                order_id="ORID0002",
+                side="S",
+                quantity=100,
+                symbol="MSFT",
+                price=331.2575,
+            ),
+        ]
+
+        # WHEN
+        views = [MessageView(x.get_bytes()) for x in messages]
+
+        # THEN
+        # Scaled by the ticks per dollar of each price type
+        assert_that(views[0].price_ticks(), equal_to(33_125))
+        assert_that(views[0].price(), equal_to(331.25))
+        assert_that(views[1].price_ticks(), equal_to(3_312_575))
+        assert_that(views[1].price(), equal_to(331.2575))
+
+    def test_to_message(self):
+        # GIVEN
+        message = OrderExecutedAtPriceSize.from_parms(
+            time_offset=447_000,
+            order_id="ORID0002",
+            executed_quantity=100,
+            remaining_quantity=200,
+            execution_id="EXID0002",
+            price=52.75,
+        )
+
+        # WHEN
+        view = MessageView(message.get_bytes())
+        new_msg = view.to_message()
+
+        # THEN
+        assert_that(view.execution_id(), equal_to("EXID0002"))
+        assert_that(view.remaining_quantity(), equal_to(200))
+        assert_that(new_msg.get_bytes(), equal_to(message.get_bytes()))
+
+    def test_iter_views(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+
+        # WHEN
+        summary = [
+            (view.message_class(), view.symbol() if view.messageType() != 0x20 else None)
+            for view in FileParser.iter_views(file_path=full_path)
+        ]
+
+        # THEN
+        assert_that(summary, has_length(10))
+        assert_that(summary[0], equal_to((Time, None)))
+        assert_that(summary[3], equal_to((AddOrderLong, "MSFT")))
+        assert_that(summary[-1], equal_to((AddOrderLong, "GE")))
@@ -2,7 +2,7 @@ from unittest import TestCase
 
 from hamcrest import assert_that, has_length, has_item, equal_to
 
-from cboe_pitch.orderbook import OrderBook, Side
+from cboe_pitch.orderbook import LadderSide, Order, OrderBook, Side, TopOfBook
 
 
 class TestOrderBook(TestCase):
@@ -119,3 +119,359 @@ class TestOrderBook(TestCase):
 
         buy_orders = ob.get_orders(ticker=ticker, side=side)
         assert_that(buy_orders, has_length(2))
+
+    def test_price_scale(self):
+        # GIVEN
+        ticker = "GE"
+        side = Side.Sell
+        ob = OrderBook(price_scale=10_000)
+        ob.add_ticker(ticker=ticker)
+
+        # WHEN
+        ob.add_order(
+            ticker=ticker, side=side, price=522_900, quantity=100, order_id="ORID0001"
+        )
+        ob.add_order(
+            ticker=ticker, side=side, price=522_500, quantity=100, order_id="ORID0002"
+        )
+
+        # THEN
+        orders = ob.get_orders(ticker=ticker, side=side)
+        assert_that([x.price for x in orders], equal_to([522_500, 522_900]))
+        assert_that(orders[0].display_price, equal_to(52.25))
+        assert_that(str(orders[0]), equal_to("GE, [ORID0002] 52.25 X 100"))
+
+    def test_modify_order(self):
+        # GIVEN
+        ticker = "GE"
+        side = Side.Buy
+        ob = OrderBook()
+        ob.add_ticker(ticker=ticker)
+        ob.add_order(
+            ticker=ticker, side=side, price=52.25, quantity=100, order_id="ORID0001"
+        )
+        ob.add_order(
+            ticker=ticker, side=side, price=52.25, quantity=200, order_id="ORID0002"
+        )
+        ob.add_order(
+            ticker=ticker, side=side, price=52.50, quantity=300, order_id="ORID0003"
+        )
+
+        # WHEN
+        # Smaller size at the same price keeps its place
+        ob.modify_order(order_id="ORID0001", price=52.25, quantity=50)
+        kept = [x.order_id for x in ob.get_orders(ticker=ticker, side=side)]
+        # A new price goes to the back of the queue at that price
+        ob.modify_order(order_id="ORID0003", price=52.25, quantity=300)
+
+        # THEN
+        assert_that(kept, equal_to(["ORID0003", "ORID0001", "ORID0002"]))
+        orders = ob.get_orders(ticker=ticker, side=side)
+        assert_that(
+            [(x.order_id, x.quantity) for x in orders],
+            equal_to([("ORID0001", 50), ("ORID0002", 200), ("ORID0003", 300)]),
+        )
+        assert_that(ob.get_order("ORID0003").price, equal_to(52.25))
+
+    def test_modify_order_to_zero(self):
+        # GIVEN
+        ticker = "GE"
+        side = Side.Buy
+        ob = OrderBook()
+        ob.add_ticker(ticker=ticker)
+        ob.add_order(
+            ticker=ticker, side=side, price=52.25, quantity=100, order_id="ORID0001"
+        )
+        ob.add_order(
+            ticker=ticker, side=side, price=52.00, quantity=200, order_id="ORID0002"
+        )
+
+        # WHEN
+        order = ob.modify_order(order_id="ORID0001", price=52.25, quantity=0)
+
+        # THEN
+        # Taken off the book rather than left as an empty best level
+        assert_that(order.quantity, equal_to(0))
+        assert_that(ob.get_order("ORID0001"), equal_to(None))
+        assert_that(
+            [x.order_id for x in ob.get_orders(ticker=ticker, side=side)],
+            equal_to(["ORID0002"]),
+        )
+        best = ob.best_level(ticker=ticker, side=side)
+        assert_that((best.price, best.quantity), equal_to((52.00, 200)))
+
+    def test_reduce_and_execute_order(self):
+        # GIVEN
+        ticker = "GE"
+        side = Side.Sell
+        ob = OrderBook()
+        ob.add_ticker(ticker=ticker)
+        ob.add_order(
+            ticker=ticker, side=side, price=52.25, quantity=100, order_id="ORID0001"
+        )
+
+        # WHEN
+        after_reduce = ob.reduce_order(order_id="ORID0001", canceled_quantity=30)
+        after_execute = ob.execute_order(order_id="ORID0001", executed_quantity=20)
+        with self.assertRaises(Exception) as ex:
+            ob.execute_order(order_id="ORID0001", executed_quantity=60)
+        after_fill = ob.execute_order(order_id="ORID0001", executed_quantity=50)
+
+        # THEN
+        assert_that(after_reduce, equal_to(70))
+        assert_that(after_execute, equal_to(50))
+        assert_that(
+            str(ex.exception), equal_to("Order with ID ORID0001 has 50 left, not 60")
+        )
+        assert_that(after_fill, equal_to(0))
+        assert_that(ob.get_order("ORID0001"), equal_to(None))
+        assert_that(ob.get_orders(ticker=ticker, side=side), has_length(0))
+
+    def test_order_id_unique_across_sides(self):
+        # GIVEN
+        ob = OrderBook()
+        ob.add_ticker(ticker="GE")
+        ob.add_order(
+            ticker="GE", side=Side.Buy, price=52.25, quantity=100, order_id="ORID0001"
+        )
+
+        # WHEN
+        with self.assertRaises(Exception):
+            ob.add_order(
+                ticker="GE", side=Side.Sell, price=52.50, quantity=100, order_id="ORID0001"
+            )
+        ob.delete_order(ticker="GE", side=Side.Sell, order_id="ORID0001")
+
+        # THEN
+        assert_that(
+            ob.has_order_id(ticker="GE", side=Side.Buy, order_id="ORID0001"),
+            equal_to(True),
+        )
+        assert_that(
+            ob.has_order_id(ticker="GE", side=Side.Sell, order_id="ORID0001"),
+            equal_to(False),
+        )
+
+    def test_price_levels(self):
+        # GIVEN
+        ticker = "GE"
+        ob = OrderBook()
+        ob.add_ticker(ticker=ticker)
+        for order_id, side, price, quantity in (
+            ("ORID0001", Side.Buy, 52.25, 100),
+            ("ORID0002", Side.Buy, 52.50, 200),
+            ("ORID0003", Side.Buy, 52.25, 300),
+            ("ORID0004", Side.Sell, 52.75, 400),
+            ("ORID0005", Side.Sell, 53.00, 500),
+        ):
+            ob.add_order(
+                ticker=ticker, side=side, price=price, quantity=quantity, order_id=order_id
+            )
+
+        # WHEN
+        ob.reduce_order(order_id="ORID0001", canceled_quantity=25)
+        ob.delete_order(ticker=ticker, side=Side.Buy, order_id="ORID0002")
+        ob.execute_order(order_id="ORID0004", executed_quantity=400)
+
+        # THEN
+        buy_levels = ob.get_levels(ticker=ticker, side=Side.Buy)
+        assert_that(
+            [(x.price, x.quantity, len(x)) for x in buy_levels],
+            equal_to([(52.25, 375, 2)]),
+        )
+        assert_that(
+            [x.order_id for x in buy_levels[0].orders()],
+            equal_to(["ORID0001", "ORID0003"]),
+        )
+        assert_that(ob.best_level(ticker=ticker, side=Side.Sell).price, equal_to(53.00))
+        assert_that(ob.order_count(ticker=ticker, side=Side.Buy), equal_to(2))
+        assert_that(
+            ob.get_order_at(ticker=ticker, side=Side.Buy, index=1).order_id,
+            equal_to("ORID0003"),
+        )
+
+    def test_empty_side(self):
+        # GIVEN
+        ob = OrderBook()
+        ob.add_ticker(ticker="GE")
+
+        # THEN
+        assert_that(ob.best_level(ticker="GE", side=Side.Buy), equal_to(None))
+        assert_that(ob.get_levels(ticker="GE", side=Side.Sell), has_length(0))
+        assert_that(ob.order_count(ticker="GE", side=Side.Sell), equal_to(0))
+
+    def test_bbo(self):
+        # GIVEN
+        ticker = "GE"
+        ob = OrderBook()
+        ob.add_ticker(ticker=ticker)
+        changes = []
+        ob.subscribe(lambda ticker, bid, offer: changes.append((ticker, bid, offer)))
+
+        # WHEN
+        ob.add_order(
+            ticker=ticker, side=Side.Buy, price=52.25, quantity=100, order_id="ORID0001"
+        )
+        # Below the best bid, no change
+        ob.add_order(
+            ticker=ticker, side=Side.Buy, price=52.00, quantity=100, order_id="ORID0002"
+        )
+        ob.add_order(
+            ticker=ticker, side=Side.Sell, price=52.50, quantity=300, order_id="ORID0003"
+        )
+        ob.add_order(
+            ticker=ticker, side=Side.Buy, price=52.25, quantity=200, order_id="ORID0004"
+        )
+        ob.reduce_order(order_id="ORID0002", canceled_quantity=50)
+        ob.execute_order(order_id="ORID0003", executed_quantity=300)
+        # Taken out of the level and put back, the top changes only once
+        ob.modify_order(order_id="ORID0001", price=52.25, quantity=150)
+        ob.delete_order(ticker=ticker, side=Side.Buy, order_id="ORID0004")
+
+        # THEN
+        bid_52_25 = TopOfBook(price=52.25, quantity=100, orders=1)
+        offer_52_50 = TopOfBook(price=52.50, quantity=300, orders=1)
+        assert_that(
+            changes,
+            equal_to(
+                [
+                    (ticker, bid_52_25, None),
+                    (ticker, bid_52_25, offer_52_50),
+                    (ticker, TopOfBook(price=52.25, quantity=300, orders=2), offer_52_50),
+                    (ticker, TopOfBook(price=52.25, quantity=300, orders=2), None),
+                    (ticker, TopOfBook(price=52.25, quantity=350, orders=2), None),
+                    (ticker, TopOfBook(price=52.25, quantity=150, orders=1), None),
+                ]
+            ),
+        )
+        assert_that(
+            ob.bbo(ticker), equal_to((TopOfBook(price=52.25, quantity=150, orders=1), None))
+        )
+        assert_that(ob.best_offer(ticker), equal_to(None))
+
+    def test_bbo_matches_levels(self):
+        # GIVEN
+        ob = OrderBook()
+        ob.add_ticker(ticker="GE")
+        for idx in range(20):
+            ob.add_order(
+                ticker="GE",
+                side=Side.Buy if idx % 2 else Side.Sell,
+                price=50 + (idx * 7) % 11,
+                quantity=100 + idx,
+                order_id=f"ORID{idx:04}",
+            )
+
+        # WHEN
+        for idx in range(0, 20, 3):
+            ob.delete_order(
+                ticker="GE", side=Side.Buy if idx % 2 else Side.Sell, order_id=f"ORID{idx:04}"
+            )
+
+        # THEN
+        for side, top in zip((Side.Buy, Side.Sell), ob.bbo("GE")):
+            level = ob.best_level(ticker="GE", side=side)
+            assert_that(top, equal_to(TopOfBook(level.price, level.quantity, len(level))))
+
+    def test_ladder(self):
+        # GIVEN
+        ob = OrderBook(price_scale=10_000)
+        ob.add_ticker(ticker="GE", price_range=(500_000, 510_000), tick_size=100)
+
+        # WHEN
+        ob.add_order(
+            ticker="GE", side=Side.Buy, price=501_000, quantity=100, order_id="ORID0001"
+        )
+        ob.add_order(
+            ticker="GE", side=Side.Buy, price=503_000, quantity=200, order_id="ORID0002"
+        )
+        ob.add_order(
+            ticker="GE", side=Side.Buy, price=503_000, quantity=50, order_id="ORID0003"
+        )
+        ob.add_order(
+            ticker="GE", side=Side.Sell, price=504_000, quantity=300, order_id="ORID0004"
+        )
+
+        # THEN
+        assert_that(
+            [(x.price, x.quantity, len(x)) for x in ob.get_levels("GE", Side.Buy)],
+            equal_to([(503_000, 250, 2), (501_000, 100, 1)]),
+        )
+        assert_that(
+            [x.order_id for x in ob.get_orders("GE", Side.Buy)],
+            equal_to(["ORID0002", "ORID0003", "ORID0001"]),
+        )
+        assert_that(ob.get_order_at("GE", Side.Buy, 2).order_id, equal_to("ORID0001"))
+        assert_that(ob.best_bid("GE"), equal_to(TopOfBook(503_000, 250, 2)))
+
+        # Emptying the best level moves the best price to the next one
+        ob.execute_order(order_id="ORID0002", executed_quantity=200)
+        ob.delete_order(ticker="GE", side=Side.Buy, order_id="ORID0003")
+        assert_that(ob.best_bid("GE"), equal_to(TopOfBook(501_000, 100, 1)))
+        ob.modify_order(order_id="ORID0004", price=502_000, quantity=300)
+        assert_that(ob.best_offer("GE"), equal_to(TopOfBook(502_000, 300, 1)))
+        ob.delete_order(ticker="GE", side=Side.Sell, order_id="ORID0004")
+        assert_that(ob.best_offer("GE"), equal_to(None))
+
+        with self.assertRaises(Exception) as ex:
+            ob.add_order(
+                ticker="GE", side=Side.Buy, price=511_000, quantity=1, order_id="ORID0005"
+            )
+        assert_that(str(ex.exception), equal_to("Price 511000 is not on the ladder"))
+
+    def test_ladder_depth(self):
+        # GIVEN
+        ladder = LadderSide(Side.Sell, price_range=(100, 104))
+        orders = [
+            Order(ticker="GE", side=Side.Sell, price=102, quantity=10, order_id="ORID0001"),
+            Order(ticker="GE", side=Side.Sell, price=104, quantity=20, order_id="ORID0002"),
+            Order(ticker="GE", side=Side.Sell, price=102, quantity=30, order_id="ORID0003"),
+        ]
+
+        # WHEN
+        for order in orders:
+            ladder.add(order)
+        ladder.resize(orders[0], 5)
+        prices, sizes, counts = ladder.depth()
+
+        # THEN
+        assert_that(list(prices), equal_to([100, 101, 102, 103, 104]))
+        assert_that(list(sizes), equal_to([0, 0, 35, 0, 20]))
+        assert_that(list(counts), equal_to([0, 0, 2, 0, 1]))
+        assert_that(ladder.best().price, equal_to(102))
+
+    def test_ladder_matches_book_side(self):
+        # GIVEN
+        books = [OrderBook(), OrderBook()]
+        books[0].add_ticker(ticker="GE")
+        books[1].add_ticker(ticker="GE", price_range=(40, 60))
+
+        # WHEN
+        for ob in books:
+            for idx in range(40):
+                ob.add_order(
+                    ticker="GE",
+                    side=Side.Buy if idx % 2 else Side.Sell,
+                    price=40 + (idx * 7) % 21,
+                    quantity=100 + idx,
+                    order_id=f"ORID{idx:04}",
+                )
+            for idx in range(0, 40, 3):
+                ob.delete_order(
+                    ticker="GE",
+                    side=Side.Buy if idx % 2 else Side.Sell,
+                    order_id=f"ORID{idx:04}",
+                )
+            for idx in range(1, 40, 3):
+                ob.modify_order(
+                    order_id=f"ORID{idx:04}", price=40 + (idx * 3) % 21, quantity=50
+                )
+
+        # THEN
+        for side in (Side.Buy, Side.Sell):
+            expected, actual = [
+                [(x.price, x.quantity, len(x)) for x in ob.get_levels("GE", side)]
+                for ob in books
+            ]
+            assert_that(actual, equal_to(expected))
+        assert_that(books[1].bbo("GE"), equal_to(books[0].bbo("GE")))
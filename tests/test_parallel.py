@@ -0,0 +1,99 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+import pkg_resources
+from hamcrest import assert_that, equal_to, has_length
+
+from cboe_pitch.add_order import AddOrderLong, AddOrderShort
+from cboe_pitch.columnar import ColumnarDecoder
+from cboe_pitch.parallel import ParallelParser, ParseStatistics, _decode_chunk
+from cboe_pitch.time import Time
+
+
+class TestParallelParser(TestCase):
+    def setUp(self):
+        self.full_path = pkg_resources.resource_filename(__name__, "data/multi.dat")
+
+    def test_split_on_unit_boundaries(self):
+        # WHEN
+        chunks = ParallelParser.split(self.full_path, 2)
+
+        # THEN
+        assert_that(chunks, equal_to([(0x0, 0xE0), (0xE0, 0x12C)]))
+
+    def test_split_more_chunks_than_units(self):
+        # WHEN
+        chunks = ParallelParser.split(self.full_path, 10)
+
+        # THEN
+        assert_that(
+            chunks, equal_to([(0x0, 0x42), (0x42, 0x8E), (0x8E, 0xE0), (0xE0, 0x12C)])
+        )
+
+    def test_parse_columnar_matches_single_process(self):
+        # GIVEN
+        expected = ColumnarDecoder.from_file(file_path=self.full_path)
+
+        # WHEN
+        messages = ParallelParser.parse_columnar(self.full_path, max_workers=3)
+
+        # THEN
+        assert_that(set(messages.keys()), equal_to({Time, AddOrderShort, AddOrderLong}))
+        for message_class, msg_array in expected.items():
+            assert_that(np.array_equal(messages[message_class], msg_array), equal_to(True))
+
+    def test_parse_statistics(self):
+        # WHEN
+        stats = ParallelParser.parse_statistics(self.full_path, max_workers=2)
+
+        # THEN
+        assert_that(stats.units, equal_to(4))
+        assert_that(stats.messages, equal_to(10))
+        assert_that(stats.msg_counts["AddOrderLong"], equal_to(6))
+        assert_that(stats.first_sequence, equal_to(1))
+        assert_that(stats.next_sequence, equal_to(11))
+
+    def test_statistics_merge(self):
+        # GIVEN
+        first = ParseStatistics()
+        first.units, first.messages, first.first_sequence, first.next_sequence = 1, 2, 5, 7
+        first.msg_counts["Time"] = 2
+        second = ParseStatistics()
+
+        # WHEN
+        merged = second.merge(first)
+
+        # THEN
+        assert_that(merged.units, equal_to(1))
+        assert_that(merged.msg_counts["Time"], equal_to(2))
+        assert_that((merged.first_sequence, merged.next_sequence), equal_to((5, 7)))
+
+    def test_parse_truncated_file(self):
+        # GIVEN
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "truncated.dat"
+            file_path.write_bytes(Path(self.full_path).read_bytes()[:-5])
+
+            # WHEN
+            with self.assertRaises(Exception) as ex:
+                _decode_chunk(str(file_path), 0, file_path.stat().st_size)
+
+        # THEN
+        # Not hidden by a BufferError from closing the mapped file
+        assert_that(str(ex.exception), equal_to("Invalid Hdr Length 76 at offset 224"))
+
+
+class TestUnitOffsets(TestCase):
+    def test_invalid_hdr_length(self):
+        # GIVEN
+        msg_bytes = bytes([0x04, 0x00, 0x00, 0x01])
+
+        # WHEN
+        with self.assertRaises(Exception):
+            ParallelParser.unit_offsets(msg_bytes)
+
+    def test_empty(self):
+        # THEN
+        assert_that(ParallelParser.unit_offsets(b""), has_length(0))
@@ -0,0 +1,145 @@
+import struct
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import pkg_resources
+from hamcrest import assert_that, equal_to, has_length, instance_of
+
+from cboe_pitch.add_order import AddOrderLong, AddOrderShort
+from cboe_pitch.pcap import PcapReader, PcapWriter
+from cboe_pitch.seq_unit_header import SequencedUnitHeader
+from cboe_pitch.time import Time
+
+
+def make_frame(payload: bytes, vlan: bool = False, protocol: int = 17) -> bytes:
+    ether = bytes(12) + (b"\x81\x00\x00\x05" if vlan else b"") + b"\x08\x00"
+    ip = struct.pack(
+        "!BBHHHBBH4s4s", 0x45, 0, 28 + len(payload), 1, 0, 64, protocol, 0,
+        bytes([10, 0, 0, 1]), bytes([224, 0, 0, 1]),
+    )
+    udp = struct.pack("!HHHH", 53, 8000, 8 + len(payload), 0)
+    return ether + ip + udp + payload
+
+
+def make_pcap(frames, magic: int = 0xA1B23C4D) -> bytes:
+    pcap = struct.pack("<IHHiIII", magic, 2, 4, 0, 0, 65535, 1)
+    for ts_frac, frame in enumerate(frames):
+        pcap += struct.pack("<IIII", 100, ts_frac, len(frame), len(frame)) + frame
+    return pcap
+
+
+class TestPcapReader(TestCase):
+    def test_iter_units_sample(self):
+        # GIVEN
+        full_path = pkg_resources.resource_filename(__name__, "data/single_unit.pcap")
+
+        # WHEN
+        units = list(PcapReader.iter_units(full_path))
+
+        # THEN
+        assert_that(units, has_length(1))
+        [timestamp, seq_unit_hdr] = units[0]
+        assert_that(timestamp, equal_to(1739136820_258866_000))
+        assert_that(seq_unit_hdr.hdr_length(), equal_to(259))
+        assert_that(seq_unit_hdr.getMessages(), has_length(10))
+        assert_that(seq_unit_hdr.getMessages()[0], instance_of(Time))
+        assert_that(seq_unit_hdr.getMessages()[1], instance_of(AddOrderLong))
+        assert_that(seq_unit_hdr.getMessages()[2], instance_of(AddOrderShort))
+
+    def test_iter_payloads_skips_other_traffic(self):
+        # GIVEN
+        seq_unit_hdr = SequencedUnitHeader(hdr_sequence=7)
+        seq_unit_hdr.addMessage(Time.from_parms(time=34_200))
+        payload = bytes(seq_unit_hdr.get_bytes())
+        frames = [
+            make_frame(payload, vlan=True),
+            make_frame(payload, protocol=6),
+            bytes(12) + b"\x86\xdd" + bytes(40),
+            make_frame(payload),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "capture.pcap"
+            file_path.write_bytes(make_pcap(frames))
+
+            # WHEN
+            payloads = [
+                (timestamp, bytes(payload))
+                for timestamp, payload in PcapReader.iter_payloads(file_path, 8000)
+            ]
+            other_port = list(PcapReader.iter_payloads(file_path, 8001))
+
+        # THEN
+        assert_that(payloads, equal_to([(100_000_000_000, payload), (100_000_000_003, payload)]))
+        assert_that(other_port, has_length(0))
+
+    def test_invalid_magic(self):
+        # GIVEN
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "capture.pcap"
+            file_path.write_bytes(make_pcap([], magic=0x12345678))
+
+            # WHEN
+            with self.assertRaises(Exception):
+                list(PcapReader.iter_frames(file_path))
+
+
+def verify_checksum(data: bytes) -> int:
+    if len(data) % 2 == 1:
+        data += b"\x00"
+    total = sum(int.from_bytes(data[i : i + 2], "big") for i in range(0, len(data), 2))
+    while total > 0xFFFF:
+        total = (total & 0xFFFF) + (total >> 16)
+    return total
+
+
+class TestPcapWriter(TestCase):
+    def test_round_trip(self):
+        # GIVEN
+        seq_unit_hdr = SequencedUnitHeader(hdr_sequence=3)
+        seq_unit_hdr.addMessage(Time.from_parms(time=34_201))
+        payload = bytes(seq_unit_hdr.get_bytes())
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / "capture.pcap"
+
+            # WHEN
+            with PcapWriter(file_path, dst_ip="239.1.2.3", dst_port=9001) as pcap_writer:
+                pcap_writer.write_unit(payload, 1_700_000_000_123_456_789)
+                pcap_writer.write_unit(payload[:-1] + b"\x01", 1_700_000_001_000_000_000)
+            frames = [(ts, bytes(frame)) for ts, _, frame in PcapReader.iter_frames(file_path)]
+            units = list(PcapReader.iter_units(file_path, udp_port=9001))
+
+        # THEN
+        assert_that(frames, has_length(2))
+        assert_that(frames[0][0], equal_to(1_700_000_000_123_456_789))
+        assert_that(units[0][1].getMessages()[0].time(), equal_to(34_201))
+
+        for _, frame in frames:
+            # Multicast MAC for 239.1.2.3
+            assert_that(frame[0:6], equal_to(bytes.fromhex("01005e010203")))
+            assert_that(verify_checksum(frame[14:34]), equal_to(0xFFFF))
+            pseudo_header = frame[26:34] + struct.pack("!HH", 17, len(frame) - 34)
+            assert_that(verify_checksum(pseudo_header + frame[34:]), equal_to(0xFFFF))
+
+    def test_microsecond_capture(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # GIVEN
+            file_path = Path(tmp_dir) / "capture.pcap"
+
+            # WHEN
+            with PcapWriter(file_path, nanosecond=False, batch_size=1) as pcap_writer:
+                pcap_writer.write_units([(5_000_001_999, b"\x08\x00\x00\x01\x01\x00\x00\x00")])
+            frames = list(PcapReader.iter_frames(file_path))
+
+        # THEN
+        assert_that(frames[0][0], equal_to(5_000_001_000))
+
+    def test_payload_too_large(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # GIVEN
+            with PcapWriter(Path(tmp_dir) / "capture.pcap") as pcap_writer:
+                # WHEN
+                with self.assertRaises(Exception):
+                    pcap_writer.write_unit(bytes(70_000), 0)
@@ -1,8 +1,12 @@
 from unittest import TestCase
 from hamcrest import assert_that, has_length, has_item, equal_to
 
+from cboe_pitch.add_order import AddOrderShort
+from cboe_pitch.message_factory import MessageFactory
 from cboe_pitch.orderbook import OrderBook, Side
-from cboe_pitch.pitch24 import FieldConverter
+from cboe_pitch.order_executed import OrderExecutedAtPriceSize
+from cboe_pitch.pitch24 import FieldConverter, FieldName, FieldType
+from cboe_pitch.trade import TradeExpanded
 
 class TestFieldConverter(TestCase):
     def test_encode_orderid(self):
@@ -44,3 +48,189 @@ class TestFieldConverter(TestCase):
 
         # THEN
         assert_that(decoded_symbol, equal_to("AAPL"))
+
+
+class TestMessageCodec(TestCase):
+    def test_codec_size_matches_length(self):
+        # GIVEN
+        message = TradeExpanded.from_parms(
+            time_offset=1_000,
+            order_id="ORID0001",
+            side="S",
+            quantity=300,
+            symbol="MSFT",
+            price=331.25,
+            execution_id="EXID0001",
+        )
+
+        # WHEN
+        codec = message._codec()
+
+        # THEN
+        assert_that(codec.size, equal_to(message.length()))
+        assert_that(message._codec(), equal_to(TradeExpanded()._codec()))
+
+    def test_codec_round_trip(self):
+        # GIVEN
+        message = OrderExecutedAtPriceSize.from_parms(
+            time_offset=447_000,
+            order_id="ORID0002",
+            executed_quantity=100,
+            remaining_quantity=200,
+            execution_id="EXID0002",
+            price=52.75,
+        )
+
+        # WHEN
+        msg_bytes = message.get_bytes()
+        new_msg = MessageFactory.from_bytes(msg_bytes)
+
+        # THEN
+        assert_that(msg_bytes, has_length(38))
+        assert_that(new_msg.get_bytes(), equal_to(msg_bytes))
+        assert_that(new_msg.remaining_quantity(), equal_to(200))
+        assert_that(new_msg.execution_id(), equal_to("EXID0002"))
+        assert_that(new_msg.price(), equal_to(52.75))
+
+    def test_codec_decode_at_offset(self):
+        # GIVEN
+        message = AddOrderShort.from_parms(
+            time_offset=100,
+            order_id="ORID0100",
+            side="B",
+            quantity=100,
+            symbol="AAPL",
+            price=100.25,
+        )
+        msg_bytes = bytearray(4) + message.get_bytes()
+
+        # WHEN
+        values = message._codec().decode(msg_bytes, 4)
+
+        # THEN
+        assert_that(values, has_length(9))
+        assert_that(values[5], equal_to(100))
+        assert_that(values[6], equal_to("AAPL  "))
+        # Prices stay as ticks
+        assert_that(values[7], equal_to(10_025))
+
+
+class TestEncodeInto(TestCase):
+    def test_encode_into_offset(self):
+        # GIVEN
+        message = AddOrderShort.from_parms(
+            time_offset=100,
+            order_id="ORID0100",
+            side="B",
+            quantity=100,
+            symbol="AAPL",
+            price=100.25,
+        )
+        buf = bytearray(40)
+
+        # WHEN
+        next_offset = message.encode_into(buf, 4)
+
+        # THEN
+        assert_that(next_offset, equal_to(30))
+        assert_that(buf[4:30], equal_to(message.get_bytes()))
+        assert_that(buf[:4] + buf[30:], equal_to(bytearray(14)))
+
+    def test_encode_into_missing_fields(self):
+        # GIVEN
+        message = AddOrderShort()
+        message.symbol("AAPL")
+        buf = bytearray(40)
+
+        # WHEN
+        next_offset = message.encode_into(buf, 2)
+
+        # THEN
+        assert_that(next_offset, equal_to(2 + len(message.get_bytes())))
+        assert_that(buf[2:next_offset], equal_to(message.get_bytes()))
+
+
+class TestPriceTicks(TestCase):
+    def test_price_rounds_to_ticks(self):
+        # GIVEN
+        message = AddOrderShort.from_parms(
+            time_offset=100,
+            order_id="ORID0100",
+            side="B",
+            quantity=100,
+            symbol="AAPL",
+            price=0.29,
+        )
+
+        # WHEN
+        new_msg = AddOrderShort()
+        new_msg.from_bytes(message.get_bytes())
+
+        # THEN
+        assert_that(new_msg.price_ticks(), equal_to(29))
+        assert_that(new_msg.price(), equal_to(0.29))
+
+    def test_price_ticks(self):
+        # GIVEN
+        message = TradeExpanded.from_parms(
+            time_offset=1_000,
+            order_id="ORID0001",
+            side="S",
+            quantity=300,
+            symbol="MSFT",
+            price=1.0,
+            execution_id="EXID0001",
+        )
+
+        # WHEN
+        message.price_ticks(3_310_300)
+
+        # THEN
+        assert_that(message.price(), equal_to(331.03))
+        assert_that(message._schema.price_scale, equal_to(10_000))
+        assert_that(
+            message.get_bytes()[27:35], equal_to((3_310_300).to_bytes(8, "little"))
+        )
+
+
+class TestMessageSchema(TestCase):
+    def test_schema_is_shared(self):
+        # GIVEN
+        message_1 = TradeExpanded()
+        message_2 = TradeExpanded()
+
+        # THEN
+        assert_that(message_1._schema is message_2._schema, equal_to(True))
+        assert_that(hasattr(message_1, "__dict__"), equal_to(False))
+        assert_that(message_1._values is message_2._values, equal_to(False))
+
+    def test_schema_follows_subclass_overrides(self):
+        # WHEN
+        field_specs = AddOrderShort._schema.field_specs
+
+        # THEN
+        assert_that(field_specs[FieldName.Quantity].length(), equal_to(2))
+        assert_that(field_specs[FieldName.Price].offset(), equal_to(23))
+        assert_that(
+            field_specs[FieldName.Price].field_type(),
+            equal_to(FieldType.BinaryShortPrice),
+        )
+        assert_that(AddOrderShort._schema.defaults[0], equal_to(26))
+        assert_that(AddOrderShort._schema.defaults[1], equal_to(0x22))
+
+    def test_values_in_offset_order(self):
+        # GIVEN
+        message = OrderExecutedAtPriceSize.from_parms(
+            time_offset=447_000,
+            order_id="ORID0002",
+            executed_quantity=100,
+            remaining_quantity=200,
+            execution_id="EXID0002",
+            price=52.75,
+        )
+
+        # THEN
+        schema = OrderExecutedAtPriceSize._schema
+        assert_that(schema.index(FieldName.RemainingQuantity), equal_to(5))
+        assert_that(schema.index(FieldName.ExecutionId), equal_to(6))
+        assert_that(message._values[5], equal_to(200))
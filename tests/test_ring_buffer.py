@@ -0,0 +1,119 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+
+from hamcrest import assert_that, equal_to, instance_of
+
+from cboe_pitch.ring_buffer import RingBuffer
+from cboe_pitch.seq_unit_header import SequencedUnitHeader
+from cboe_pitch.time import Time
+from cboe_pitch.unit_encoder import UnitEncoder
+
+# Writes 200 units of one Time message each from a separate interpreter
+PRODUCER = """
+import sys
+from cboe_pitch.ring_buffer import RingBuffer
+from cboe_pitch.seq_unit_header import SequencedUnitHeader
+from cboe_pitch.time import Time
+
+ring_buffer = RingBuffer.attach(sys.argv[1])
+for idx in range(200):
+    seq_unit_hdr = SequencedUnitHeader(hdr_sequence=idx + 1)
+    seq_unit_hdr.addMessage(Time.from_parms(time=34_200 + idx))
+    ring_buffer.write_unit(seq_unit_hdr, timeout=10)
+ring_buffer.close_writer()
+ring_buffer.close()
+"""
+
+
+class TestRingBuffer(TestCase):
+    def test_write_peek_release(self):
+        # GIVEN
+        with RingBuffer(capacity=64) as ring_buffer:
+            # WHEN
+            written = ring_buffer.write(b"\x01\x02\x03")
+            record = ring_buffer.peek()
+
+            # THEN
+            assert_that(written, equal_to(3))
+            assert_that(bytes(record), equal_to(b"\x01\x02\x03"))
+            assert_that(len(ring_buffer), equal_to(8))
+            record.release()
+            ring_buffer.release()
+            assert_that(ring_buffer.peek(), equal_to(None))
+            assert_that(len(ring_buffer), equal_to(0))
+
+    def test_full_and_wrap(self):
+        # GIVEN
+        with RingBuffer(capacity=64) as ring_buffer:
+            # WHEN
+            for idx in range(3):
+                ring_buffer.write(bytes([idx]) * 12)
+
+            # THEN
+            assert_that(ring_buffer.try_reserve(20), equal_to(None))
+            assert_that(ring_buffer.read(), equal_to(b"\x00" * 12))
+            assert_that(ring_buffer.read(), equal_to(b"\x01" * 12))
+
+            # Does not fit in the 16 bytes left at the end, so starts over at 0
+            ring_buffer.write(b"\x03" * 20)
+            assert_that(
+                [ring_buffer.read(timeout=0) for _ in range(3)],
+                equal_to([b"\x02" * 12, b"\x03" * 20, None]),
+            )
+            assert_that(len(ring_buffer), equal_to(0))
+
+    def test_record_too_large(self):
+        # GIVEN
+        with RingBuffer(capacity=64) as ring_buffer:
+            # WHEN
+            with self.assertRaises(Exception) as ex:
+                ring_buffer.write(bytes(61))
+
+            # THEN
+            assert_that(
+                str(ex.exception),
+                equal_to("Record of 61 bytes does not fit in 64 bytes"),
+            )
+
+    def test_unit_encoder_write_to(self):
+        # GIVEN
+        unit_encoder = UnitEncoder(hdr_sequence=7, max_hdr_length=20)
+        unit_encoder.add_all(Time.from_parms(time=x) for x in range(3))
+
+        with RingBuffer(capacity=1024) as ring_buffer:
+            # WHEN
+            unit_encoder.write_to(ring_buffer)
+            ring_buffer.close_writer()
+            seq_unit_hdrs = list(ring_buffer.iter_units())
+
+            # THEN
+            assert_that(ring_buffer.closed(), equal_to(True))
+            assert_that([x.hdr_sequence() for x in seq_unit_hdrs], equal_to([7, 9]))
+            assert_that([x.hdr_count() for x in seq_unit_hdrs], equal_to([2, 1]))
+
+    def test_separate_producer(self):
+        # GIVEN
+        # Small enough for the producer to wait on the reader
+        with RingBuffer(capacity=256) as ring_buffer:
+            project_dir = Path(__file__).parent.parent
+
+            # WHEN
+            producer = subprocess.Popen(
+                [sys.executable, "-c", PRODUCER, ring_buffer.name], cwd=project_dir
+            )
+            seq_unit_hdrs = list(ring_buffer.iter_units(timeout=10))
+            producer.wait(timeout=10)
+
+            # THEN
+            assert_that(producer.returncode, equal_to(0))
+            assert_that(len(seq_unit_hdrs), equal_to(200))
+            assert_that(
+                [x.hdr_sequence() for x in seq_unit_hdrs], equal_to(list(range(1, 201)))
+            )
+            assert_that(
+                [x.getMessages()[0].time() for x in seq_unit_hdrs],
+                equal_to(list(range(34_200, 34_400))),
+            )
+            assert_that(seq_unit_hdrs[0], instance_of(SequencedUnitHeader))
@@ -96,6 +96,52 @@ class TestSequencedUnitHeader(TestCase):
             0x6,  0x20, 0x98, 0x85, 0, 0 # Time
             ]))
 
+    def test_from_message_array_fast_path(self):
+        # GIVEN
+        msgs_array = list(Time.from_parms(time=34_200).get_bytes()) + list(
+            AddOrderShort.from_parms(
+                time_offset=100,
+                order_id="ORID0100",
+                side="B",
+                quantity=100,
+                symbol="AAPL",
+                price=100.25,
+            ).get_bytes()
+        )
+
+        # WHEN
+        fast_arr = SequencedUnitHeader.from_message_array(
+            msgs_array=msgs_array, hdr_sequence=7
+        )
+        validated_arr = SequencedUnitHeader.from_message_array(
+            msgs_array=msgs_array, hdr_sequence=7, validate=True
+        )
+
+        # THEN
+        assert_that(fast_arr, equal_to(validated_arr))
+        assert_that(list(fast_arr[:8]), equal_to([0x28, 0x0, 0x2, 0x1, 0x7, 0x0, 0x0, 0x0]))
+        assert_that(list(fast_arr[8:]), equal_to(msgs_array))
+
+    def test_from_message_array_bad_length(self):
+        # GIVEN
+        msgs_array = list(Time.from_parms(time=34_200).get_bytes())[:-1]
+
+        # WHEN
+        with self.assertRaises(Exception):
+            SequencedUnitHeader.from_message_array(msgs_array=msgs_array)
+
+    def test_from_message_array_validate_unknown_type(self):
+        # GIVEN
+        msgs_array = [0x6, 0x99, 0x0, 0x0, 0x0, 0x0]
+
+        # WHEN
+        fast_arr = SequencedUnitHeader.from_message_array(msgs_array=msgs_array)
+        with self.assertRaises(Exception):
+            SequencedUnitHeader.from_message_array(msgs_array=msgs_array, validate=True)
+
+        # THEN
+        assert_that(list(fast_arr[8:]), equal_to(msgs_array))
+
     def test_add_message_AddOrder(self):
         # WHEN
         seq_unit_hdr = SequencedUnitHeader(hdr_sequence=15)
@@ -199,6 +245,68 @@ class TestSequencedUnitHeader(TestCase):
         assert_that(new_msgs[0], instance_of(AddOrderLong))
         assert_that(new_msgs[0], instance_of(AddOrderLong))
 
+    def test_from_buffer_walks_units(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+        in_bytes = Path(full_path).read_bytes()
+
+        # WHEN
+        seq_unit_hdrs = []
+        offset = 0
+        while offset < len(in_bytes):
+            [seq_unit_hdr, offset] = SequencedUnitHeader.from_buffer(
+                msg_bytes=in_bytes, offset=offset
+            )
+            seq_unit_hdrs.append(seq_unit_hdr)
+
+        # THEN
+        assert_that(offset, equal_to(len(in_bytes)))
+        assert_that(seq_unit_hdrs, has_length(4))
+        assert_that(
+            [x.hdr_sequence() for x in seq_unit_hdrs], equal_to([1, 4, 6, 9])
+        )
+        assert_that(
+            b"".join([bytes(x.get_bytes()) for x in seq_unit_hdrs]),
+            equal_to(in_bytes),
+        )
+
+    def test_encode_into(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+        in_bytes = Path(full_path).read_bytes()
+        seq_unit_hdrs = []
+        offset = 0
+        while offset < len(in_bytes):
+            [seq_unit_hdr, offset] = SequencedUnitHeader.from_buffer(
+                msg_bytes=in_bytes, offset=offset
+            )
+            seq_unit_hdrs.append(seq_unit_hdr)
+
+        # WHEN
+        out_bytes = bytearray(len(in_bytes))
+        offset = 0
+        for seq_unit_hdr in seq_unit_hdrs:
+            offset = seq_unit_hdr.encode_into(out_bytes, offset)
+
+        # THEN
+        assert_that(offset, equal_to(len(in_bytes)))
+        assert_that(bytes(out_bytes), equal_to(in_bytes))
+
+    def test_from_buffer_heartbeat(self):
+        # GIVEN
+        in_bytes = bytes([0x8, 0x0, 0x0, 0x1, 0x2A, 0x0, 0x0, 0x0])
+
+        # WHEN
+        [seq_unit_hdr, offset] = SequencedUnitHeader.from_buffer(msg_bytes=in_bytes)
+
+        # THEN
+        assert_that(offset, equal_to(8))
+        assert_that(seq_unit_hdr.hdr_count(), equal_to(0))
+        assert_that(seq_unit_hdr.hdr_sequence(), equal_to(42))
+        assert_that(seq_unit_hdr.getMessages(), has_length(0))
+
     def test_seq_unit_hdr_w_time_msg(self):
         # GIVEN
         pass
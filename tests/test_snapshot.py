@@ -0,0 +1,143 @@
+import itertools
+from unittest import TestCase
+
+import pkg_resources
+from hamcrest import assert_that, equal_to
+
+from cboe_pitch.add_order import AddOrderLong
+from cboe_pitch.book_builder import BookBuilder
+from cboe_pitch.file_parser import FileParser
+from cboe_pitch.orderbook import OrderBook, Side
+from cboe_pitch.snapshot import BookSnapshot
+from cboe_pitch.unit_encoder import UnitEncoder
+from tests._utils import book_state
+
+
+class TestBookSnapshot(TestCase):
+    def test_round_trip(self):
+        # GIVEN
+        ob = OrderBook(price_scale=10_000)
+        ob.add_ticker(ticker="GE")
+        ob.add_ticker(ticker="MSFT", price_range=(3_000_000, 3_500_000), tick_size=100)
+        for idx in range(30):
+            ob.add_order(
+                ticker="GE" if idx % 3 else "MSFT",
+                side=Side.Buy if idx % 2 else Side.Sell,
+                price=(3_300_000 if idx % 3 == 0 else 500_000) + (idx % 5) * 100,
+                quantity=100 + idx,
+                order_id=f"ORID{idx:04}",
+            )
+        # Keeps its place in the queue
+        ob.reduce_order(order_id="ORID0001", canceled_quantity=50)
+
+        # WHEN
+        snapshot_bytes = BookSnapshot(
+            ob, hdr_sequences={1: 1_234, 2: 77}, time=37_800
+        ).get_bytes()
+        snapshot, end_offset = BookSnapshot.from_buffer(b"\x00" * 3 + snapshot_bytes, 3)
+
+        # THEN
+        restored = snapshot.orderbook()
+        assert_that(end_offset, equal_to(3 + len(snapshot_bytes)))
+        assert_that(len(snapshot_bytes), equal_to(32 + 2 * 12 + 2 * 40 + 30 * 20))
+        assert_that(snapshot.hdr_sequences(), equal_to({1: 1_234, 2: 77}))
+        assert_that(snapshot.time(), equal_to(37_800))
+        assert_that(restored.price_scale(), equal_to(10_000))
+        assert_that(book_state(restored), equal_to(book_state(ob)))
+        assert_that(restored.ladder("GE"), equal_to(None))
+        assert_that(restored.ladder("MSFT"), equal_to(((3_000_000, 3_500_000), 100)))
+        for ticker in ("GE", "MSFT"):
+            assert_that(restored.bbo(ticker), equal_to(ob.bbo(ticker)))
+        assert_that(restored.get_order("ORID0001").quantity, equal_to(51))
+
+    def test_float_prices(self):
+        # GIVEN
+        ob = OrderBook()
+        ob.add_ticker(ticker="NATI")
+        ob.add_order(
+            ticker="NATI", side=Side.Sell, price=52.25, quantity=100, order_id="ORID0001"
+        )
+
+        # WHEN
+        snapshot = BookSnapshot.from_bytes(BookSnapshot(ob).get_bytes())
+
+        # THEN
+        assert_that(snapshot.orderbook().price_scale(), equal_to(None))
+        assert_that(snapshot.hdr_sequences(), equal_to({}))
+        assert_that(snapshot.time(), equal_to(None))
+        assert_that(book_state(snapshot.orderbook()), equal_to(book_state(ob)))
+
+    def test_not_a_snapshot(self):
+        # WHEN
+        with self.assertRaises(Exception) as ex:
+            BookSnapshot.from_bytes(bytes(64))
+
+        # THEN
+        assert_that(str(ex.exception), equal_to("No book snapshot at offset 0"))
+
+    def test_restart_from_snapshot(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+        full = BookBuilder.from_file(file_path=full_path)
+
+        # Crashed after the first two units, Hdr Sequence 1 to 5
+        partial = BookBuilder()
+        for seq_unit_hdr in itertools.islice(FileParser.iter_units(full_path), 2):
+            partial.apply_unit(seq_unit_hdr)
+        snapshot_bytes = partial.snapshot().get_bytes()
+
+        # WHEN
+        snapshot = BookSnapshot.from_bytes(snapshot_bytes)
+        resumed = BookBuilder.from_file(file_path=full_path, snapshot=snapshot)
+
+        # THEN
+        assert_that(snapshot.hdr_sequence(), equal_to(5))
+        assert_that(snapshot.time(), equal_to(68_254))
+        assert_that(resumed.hdr_sequence(), equal_to(10))
+        assert_that(resumed.time(), equal_to(full.time()))
+        assert_that(full.hdr_sequence(), equal_to(10))
+        # Only the last two units are replayed
+        assert_that(resumed.messages(), equal_to(4))
+        assert_that(
+            book_state(resumed.orderbook()), equal_to(book_state(full.orderbook()))
+        )
+
+    def test_restart_with_interleaved_units(self):
+        # GIVEN
+        # Each Hdr Unit counts its own sequence from 1
+        unit_bytes = []
+        for idx, (hdr_unit, hdr_sequence) in enumerate(
+            [(1, 1), (2, 1), (1, 2), (2, 2), (1, 3), (2, 3)]
+        ):
+            unit_encoder = UnitEncoder(hdr_sequence=hdr_sequence, hdr_unit=hdr_unit)
+            unit_encoder.add(
+                AddOrderLong.from_parms(
+                    time_offset=0,
+                    order_id=f"ORID{idx:04}",
+                    side="B",
+                    quantity=100 + idx,
+                    symbol="MSFT",
+                    price=331.25,
+                )
+            )
+            unit_bytes.append(bytes(unit_encoder.get_bytes()))
+        full = BookBuilder()
+        full.apply_buffer(b"".join(unit_bytes))
+
+        partial = BookBuilder()
+        partial.apply_buffer(b"".join(unit_bytes[:3]))
+        snapshot = BookSnapshot.from_bytes(partial.snapshot().get_bytes())
+
+        # WHEN
+        resumed = BookBuilder.from_snapshot(snapshot)
+        resumed.apply_buffer(b"".join(unit_bytes))
+
+        # THEN
+        assert_that(snapshot.hdr_sequences(), equal_to({1: 2, 2: 1}))
+        assert_that(full.messages(), equal_to(6))
+        assert_that(resumed.messages(), equal_to(3))
+        assert_that(resumed.hdr_sequences(), equal_to({1: 3, 2: 3}))
+        assert_that(
+            book_state(resumed.orderbook()), equal_to(book_state(full.orderbook()))
+        )
@@ -0,0 +1,146 @@
+from unittest import TestCase
+
+import numpy as np
+from hamcrest import assert_that, equal_to
+
+from cboe_pitch.add_order import AddOrderLong, AddOrderShort
+from cboe_pitch.columnar import ColumnarDecoder
+from cboe_pitch.delete_order import DeleteOrder
+from cboe_pitch.pitch24 import FieldName
+from cboe_pitch.seq_unit_header import SequencedUnitHeader
+from cboe_pitch.template import MessageTemplate
+from cboe_pitch.unit_encoder import UnitEncoder
+
+
+def add_order_template() -> MessageTemplate:
+    return MessageTemplate.from_parms(
+        AddOrderLong,
+        time_offset=44_000,
+        order_id="ORID0001",
+        side="B",
+        quantity=100,
+        symbol="AAPL",
+        price=10.5,
+    )
+
+
+class TestMessageTemplate(TestCase):
+    def test_patch(self):
+        # GIVEN
+        template = add_order_template()
+
+        # WHEN
+        template.patch(FieldName.OrderId, "ORID0002")
+        template.patch(FieldName.Quantity, 250)
+        template.patch(FieldName.TimeOffset, 45_000)
+        template.patch(FieldName.Symbol, "MSFT")
+        template.patch_price(11.25)
+
+        # THEN
+        expected = AddOrderLong.from_parms(
+            time_offset=45_000,
+            order_id="ORID0002",
+            side="B",
+            quantity=250,
+            symbol="MSFT",
+            price=11.25,
+        )
+        assert_that(template.get_bytes(), equal_to(bytes(expected.get_bytes())))
+        assert_that(template.to_message().price_ticks(), equal_to(112_500))
+
+    def test_length_cannot_be_patched(self):
+        # GIVEN
+        template = add_order_template()
+
+        # WHEN
+        with self.assertRaises(Exception) as ex:
+            template.patch(FieldName.Length, 10)
+
+        # THEN
+        assert_that(
+            str(ex.exception), equal_to("Length of a template cannot be changed")
+        )
+
+    def test_no_price_field(self):
+        # GIVEN
+        template = MessageTemplate.from_parms(
+            DeleteOrder, time_offset=44_000, order_id="ORID0001"
+        )
+
+        # WHEN
+        with self.assertRaises(Exception) as price_ex:
+            template.patch_price(11.25)
+        with self.assertRaises(Exception) as patch_ex:
+            template.patch(FieldName.Quantity, 100)
+
+        # THEN
+        assert_that(
+            str(price_ex.exception), equal_to("DeleteOrder has no Price field")
+        )
+        assert_that(
+            str(patch_ex.exception), equal_to("DeleteOrder has no Quantity field")
+        )
+
+    def test_unit_encoder(self):
+        # GIVEN
+        template = add_order_template()
+        unit_encoder = UnitEncoder(hdr_sequence=1)
+
+        # WHEN
+        for quantity in (100, 200, 300):
+            unit_encoder.add(template.patch(FieldName.Quantity, quantity))
+        [seq_unit_hdr, _] = SequencedUnitHeader.from_bytestream(unit_encoder.get_bytes())
+
+        # THEN
+        assert_that(
+            [x.quantity() for x in seq_unit_hdr.getMessages()], equal_to([100, 200, 300])
+        )
+
+    def test_patch_array(self):
+        # GIVEN
+        template = MessageTemplate.from_parms(
+            AddOrderShort,
+            time_offset=44_000,
+            order_id="ORID0001",
+            side="S",
+            quantity=100,
+            symbol="AAPL",
+            price=10.5,
+        )
+
+        # WHEN
+        messages = template.array(4)
+        MessageTemplate.patch_array(
+            messages, FieldName.OrderId, [f"ORID{x:04}" for x in range(4)]
+        )
+        MessageTemplate.patch_array(messages, FieldName.Quantity, np.arange(1, 5) * 10)
+        MessageTemplate.patch_array(messages, FieldName.Price, 1_075)
+        msg_bytes = messages.tobytes()
+
+        # THEN
+        assert_that(len(msg_bytes), equal_to(4 * 26))
+        decoded = []
+        for offset in range(0, len(msg_bytes), 26):
+            message = AddOrderShort()
+            message.from_bytes(msg_bytes[offset : offset + 26])
+            decoded.append(
+                (message.order_id(), message.side(), message.quantity(), message.price())
+            )
+        assert_that(
+            decoded,
+            equal_to([(f"ORID{x:04}", "S", (x + 1) * 10, 10.75) for x in range(4)]),
+        )
+
+    def test_array_view(self):
+        # GIVEN
+        msg_bytes = bytearray(add_order_template().array(3).tobytes())
+
+        # WHEN
+        messages = MessageTemplate.array_view(msg_bytes, AddOrderLong)
+        MessageTemplate.patch_array(messages, FieldName.Symbol, ["A", "BB", "CCC"])
+
+        # THEN
+        assert_that(messages.dtype, equal_to(ColumnarDecoder.wire_dtype(AddOrderLong)))
+        message = AddOrderLong()
+        message.from_bytes(msg_bytes[34 * 2 : 34 * 3])
+        assert_that(message.symbol(), equal_to("CCC"))
@@ -0,0 +1,83 @@
+import io
+from pathlib import Path
+from unittest import TestCase
+
+import pkg_resources
+from hamcrest import assert_that, equal_to
+
+from cboe_pitch.add_order import AddOrderLong
+from cboe_pitch.file_parser import FileParser
+from cboe_pitch.seq_unit_header import SequencedUnitHeader
+from cboe_pitch.time import Time
+from cboe_pitch.unit_encoder import UnitEncoder
+
+
+def add_order(idx: int) -> AddOrderLong:
+    return AddOrderLong.from_parms(
+        time_offset=idx,
+        order_id=f"ORID{idx:04}",
+        side="B",
+        quantity=100,
+        symbol="MSFT",
+        price=331.25,
+    )
+
+
+class TestUnitEncoder(TestCase):
+    def test_matches_multi_dat(self):
+        # GIVEN
+        data_path = "data/multi.dat"
+        full_path = pkg_resources.resource_filename(__name__, data_path)
+        in_bytes = Path(full_path).read_bytes()
+        seq_unit_hdrs = FileParser.parse_file(file_path=full_path)
+
+        # WHEN
+        unit_encoder = UnitEncoder(hdr_sequence=1, max_hdr_length=90)
+        unit_encoder.add_all(FileParser.iter_messages(file_path=full_path))
+
+        # THEN
+        assert_that(unit_encoder.units(), equal_to(len(seq_unit_hdrs)))
+        assert_that(bytes(unit_encoder.get_bytes()), equal_to(in_bytes))
+        assert_that(unit_encoder.next_sequence(), equal_to(11))
+
+    def test_hdr_count_limit(self):
+        # GIVEN
+        messages = [Time.from_parms(time=x) for x in range(300)]
+
+        # WHEN
+        msg_bytes = UnitEncoder.encode(messages, hdr_sequence=5, max_hdr_length=65_535)
+
+        # THEN
+        [seq_unit_hdr_1, offset] = SequencedUnitHeader.from_buffer(msg_bytes)
+        [seq_unit_hdr_2, offset] = SequencedUnitHeader.from_buffer(msg_bytes, offset)
+        assert_that(offset, equal_to(len(msg_bytes)))
+        assert_that(seq_unit_hdr_1.hdr_count(), equal_to(255))
+        assert_that(seq_unit_hdr_2.hdr_count(), equal_to(45))
+        assert_that(seq_unit_hdr_2.hdr_sequence(), equal_to(260))
+
+    def test_write_to_grows_and_clears(self):
+        # GIVEN
+        unit_encoder = UnitEncoder(max_hdr_length=1_400, capacity=64)
+        f_out = io.BytesIO()
+
+        # WHEN
+        unit_encoder.add_all(add_order(x) for x in range(100))
+        written = unit_encoder.write_to(f_out)
+        unit_encoder.add(add_order(100))
+        last_bytes = unit_encoder.get_bytes()
+
+        # THEN
+        assert_that(written, equal_to(len(f_out.getvalue())))
+        messages = []
+        offset = 0
+        while offset < len(f_out.getvalue()):
+            [seq_unit_hdr, offset] = SequencedUnitHeader.from_buffer(
+                f_out.getvalue(), offset
+            )
+            assert_that(seq_unit_hdr.hdr_length() <= 1_400, equal_to(True))
+            messages.extend(seq_unit_hdr.getMessages())
+        assert_that([x.time_offset() for x in messages], equal_to(list(range(100))))
+
+        [seq_unit_hdr, _] = SequencedUnitHeader.from_buffer(last_bytes)
+        assert_that(seq_unit_hdr.hdr_sequence(), equal_to(101))
+        assert_that(len(last_bytes), equal_to(8 + 34))